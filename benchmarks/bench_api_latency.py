@@ -0,0 +1,114 @@
+"""
+Latency of /health and small /query requests while large /transform jobs run.
+
+Starts the API with uvicorn in a separate process on a free port, measures p50/p99 latency of cheap
+requests on an idle server, then again while `--jobs` large transforms (moving
+average over a generated CSV of `--rows` rows) are in flight.
+
+    python benchmarks/bench_api_latency.py --rows 2000000 --jobs 4
+"""
+from __future__ import annotations
+
+import argparse
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+import numpy as np
+import pandas as pd
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _percentiles(samples: list[float]) -> str:
+    qs = statistics.quantiles(samples, n=100)
+    return f"p50={qs[49] * 1000:7.2f}ms  p99={qs[98] * 1000:7.2f}ms  n={len(samples)}"
+
+
+def _measure(client: httpx.Client, small_query: dict, seconds: float) -> dict[str, list[float]]:
+    out: dict[str, list[float]] = {"health": [], "small query": []}
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        t0 = time.perf_counter()
+        client.get("/health").raise_for_status()
+        out["health"].append(time.perf_counter() - t0)
+        t0 = time.perf_counter()
+        client.post("/query", json=small_query).raise_for_status()
+        out["small query"].append(time.perf_counter() - t0)
+    return out
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=1_000_000)
+    ap.add_argument("--jobs", type=int, default=4)
+    ap.add_argument("--seconds", type=float, default=5.0)
+    args = ap.parse_args()
+
+    tmp = Path(tempfile.mkdtemp())
+    big = tmp / "big.csv"
+    pd.DataFrame(
+        {"series": np.repeat(["GDP"], args.rows), "value": np.random.rand(args.rows)}
+    ).to_csv(big, index=False)
+    small = tmp / "small.csv"
+    small.write_text("date,series,value\n2023-01,GDP,100\n2023-02,GDP,110\n")
+
+    port = _free_port()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "ctl_api.main:app", "--port", str(port),
+         "--log-level", "warning"]
+    )
+    base = f"http://127.0.0.1:{port}"
+    while True:
+        try:
+            httpx.get(f"{base}/health").raise_for_status()
+            break
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    small_query = {"connector": "local", "connector_config": {"path": str(small)}, "query": {}}
+    big_transform = {
+        "input": {"connector": "local", "connector_config": {"path": str(big)}, "query": {}},
+        "pipeline": [
+            {"name": "moving_average", "params": {"column": "value", "window": 50}},
+            {"name": "normalize", "params": {"columns": ["value"]}},
+        ],
+    }
+
+    with httpx.Client(base_url=base, timeout=600) as client:
+        idle = _measure(client, small_query, args.seconds)
+
+        stop = threading.Event()
+
+        def hammer():
+            with httpx.Client(base_url=base, timeout=600) as c:
+                while not stop.is_set():
+                    with c.stream("POST", "/transform", json=big_transform) as r:
+                        for _ in r.iter_bytes():
+                            pass
+
+        workers = [threading.Thread(target=hammer, daemon=True) for _ in range(args.jobs)]
+        for w in workers:
+            w.start()
+        time.sleep(1.0)
+        loaded = _measure(client, small_query, args.seconds)
+        stop.set()
+
+    for name in idle:
+        print(f"{name:12s} idle    {_percentiles(idle[name])}")
+        print(f"{name:12s} loaded  {_percentiles(loaded[name])}")
+    server.terminate()
+    server.wait()
+
+
+if __name__ == "__main__":
+    main()
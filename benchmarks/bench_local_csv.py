@@ -0,0 +1,81 @@
+"""
+Full-file vs chunked CSV scans in LocalConnector: wall time and peak RSS.
+
+Generates a long-format `date,series,value,...` CSV (skipped if `--path` exists),
+then runs each scan mode in a fresh subprocess so peak RSS is measured in isolation.
+
+    python benchmarks/bench_local_csv.py --rows 50000000 --path /tmp/big.csv   # ~2.5 GB
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pandas as pd
+
+CHILD = """
+import json, resource, sys, time
+from ctl_core.connectors.base import QuerySpec
+from ctl_core.connectors.local import LocalConnector
+
+path, chunk_rows, spec = sys.argv[1], json.loads(sys.argv[2]), json.loads(sys.argv[3])
+t0 = time.perf_counter()
+df = LocalConnector(path=path, chunk_rows=chunk_rows).query(QuerySpec(**spec))
+elapsed = time.perf_counter() - t0
+peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print(json.dumps({"seconds": elapsed, "peak_mb": peak_kb / 1024, "rows": len(df)}))
+"""
+
+
+def _generate(path: str, rows: int, block: int = 1_000_000) -> None:
+    series = np.array(["GDP", "CPI", "UNEMP", "M2", "IP", "PPI", "RS", "HS"])
+    header = True
+    for start in range(0, rows, block):
+        n = min(block, rows - start)
+        idx = np.arange(start, start + n)
+        pd.DataFrame(
+            {
+                "date": pd.Timestamp("1900-01-01") + pd.to_timedelta(idx // len(series), "D"),
+                "series": series[idx % len(series)],
+                "value": np.random.rand(n) * 100,
+                "revision": idx % 3,
+                "source": "bench",
+            }
+        ).to_csv(path, mode="w" if header else "a", header=header, index=False)
+        header = False
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=5_000_000)
+    ap.add_argument("--path", default="/tmp/ctl_bench.csv")
+    ap.add_argument("--chunk-rows", type=int, default=100_000)
+    args = ap.parse_args()
+
+    if not os.path.exists(args.path):
+        _generate(args.path, args.rows)
+    print(f"{args.path}: {os.path.getsize(args.path) / 1e9:.2f} GB")
+
+    specs = {
+        "one series, 3 cols": {"select": ["date", "series", "value"], "where": {"series": "GDP"}},
+        "limit 1000": {"select": ["date", "value"], "where": {"series": "CPI"}, "limit": 1000},
+    }
+    for label, spec in specs.items():
+        for mode, chunk_rows in (("full", None), ("chunked", args.chunk_rows)):
+            out = subprocess.run(
+                [sys.executable, "-c", CHILD, args.path, json.dumps(chunk_rows), json.dumps(spec)],
+                check=True, capture_output=True, text=True,
+            )
+            r = json.loads(out.stdout)
+            print(
+                f"{label:20s} {mode:8s} {r['seconds']:8.2f}s  peak {r['peak_mb']:8.1f} MB"
+                f"  rows={r['rows']}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+MCP query_and_transform: chaining the row-based tools vs. the columnar path.
+
+The chained path is what the tool used to do: query_data turns the frame into records,
+transform_data rebuilds a frame from them and converts the result back, and each result
+model validates every row. The columnar path keeps one DataFrame from the connector to
+the response.
+
+    python benchmarks/bench_mcp_query_transform.py --rows 100000
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+from ctl_mcp.server import (
+    QueryResult,
+    TransformResult,
+    query_and_transform,
+    query_data,
+    transform_data,
+)
+
+
+def _chained(config: dict, steps: list) -> TransformResult:
+    queried = asyncio.run(query_data("local", config))
+    # Validated like the models used to be built, once per result
+    queried = QueryResult(**queried.model_dump())
+    result = asyncio.run(transform_data(queried.data, steps))
+    return TransformResult(**result.model_dump())
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rows", type=int, default=100_000)
+    ap.add_argument("--series", type=int, default=100)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    n_obs = args.rows // args.series
+    df = pd.DataFrame(
+        {
+            "date": np.tile(
+                pd.date_range("2000-01-01", periods=n_obs, freq="D").strftime("%Y-%m-%d"),
+                args.series,
+            ),
+            "series": np.repeat([f"S{i}" for i in range(args.series)], n_obs),
+            "value": np.random.rand(args.series * n_obs) * 100,
+        }
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "series.csv")
+        df.to_csv(path, index=False)
+        config = {"path": path}
+        steps = [
+            {
+                "name": "moving_average",
+                "params": {"column": "value", "window": 5, "group_by": ["series"]},
+            },
+            {"name": "normalize", "params": {"columns": ["value"], "group_by": ["series"]}},
+        ]
+        fused = asyncio.run(query_and_transform("local", config, steps))
+        assert fused.data == _chained(config, steps).data
+
+        chained = _best(lambda: _chained(config, steps), args.repeat)
+        columnar = _best(
+            lambda: asyncio.run(query_and_transform("local", config, steps)), args.repeat
+        )
+    print(f"rows: {len(df)}")
+    print(f"chained tools (records in/out): {chained * 1000:8.1f} ms")
+    print(f"columnar query_and_transform:   {columnar * 1000:8.1f} ms  (x{chained / columnar:.2f})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Scaling of batch STL seasonal adjustment with the number of worker processes.
+
+    python benchmarks/bench_seasonal_parallel.py --series 2000 --obs 240
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from ctl_core.transforms.seasonal_batch import adjust_many
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--series", type=int, default=1000)
+    ap.add_argument("--obs", type=int, default=240)
+    ap.add_argument("--period", type=int, default=12)
+    ap.add_argument("--max-workers", type=int, default=os.cpu_count() or 1)
+    args = ap.parse_args()
+
+    t = np.arange(args.obs)
+    seasonal = 5 * np.sin(2 * np.pi * t / args.period)
+    values = np.concatenate(
+        [seasonal + np.random.rand(args.obs) * 10 + i for i in range(args.series)]
+    )
+    offsets = np.arange(args.series + 1) * args.obs
+
+    workers = 1
+    baseline = None
+    while workers <= args.max_workers:
+        t0 = time.perf_counter()
+        result = adjust_many(values, offsets, args.period, workers=workers)
+        elapsed = time.perf_counter() - t0
+        baseline = baseline or elapsed
+        print(
+            f"workers={workers:3d}  {elapsed:8.2f}s  speedup {baseline / elapsed:5.2f}x"
+            f"  failures={len(result.failures)}"
+        )
+        workers *= 2
+
+
+if __name__ == "__main__":
+    main()
@@ -23,4 +23,10 @@ t = {
     ]
 }
 resp = requests.post(f"{BASE}/transform", json=t)
-print("Transform result:", resp.json())
\ No newline at end of file
+print("Transform result:", resp.json())
+
+# Columnar results: Arrow IPC stream straight into pandas (needs pyarrow)
+import pyarrow as pa
+
+resp = requests.post(f"{BASE}/query", json={**q, "format": "arrow"})
+print("Arrow result:", pa.ipc.open_stream(resp.content).read_pandas())
@@ -3,6 +3,23 @@ from fastapi import Header, HTTPException
 from ctl_core.config import settings
 from ctl_core.auth.azure_ad import AzureADConfig, AzureADVerifier
 
+# One verifier per process so its JWKS and token caches survive between requests
+_verifier: AzureADVerifier | None = None
+
+
+def get_verifier() -> AzureADVerifier:
+    global _verifier
+    if _verifier is None:
+        _verifier = AzureADVerifier(
+            AzureADConfig(
+                tenant_id=settings.azure_tenant_id,
+                audience=settings.azure_audience,
+                jwks_ttl=settings.azure_jwks_ttl,
+                token_cache_size=settings.token_cache_size,
+            )
+        )
+    return _verifier
+
 
 async def get_auth_user(authorization: str | None = Header(default=None)) -> dict | None:
     if settings.auth_mode == "disabled":
@@ -13,12 +30,10 @@ async def get_auth_user(authorization: str | None = Header(default=None)) -> dic
         token = authorization.split(" ", 1)[1]
         if not (settings.azure_tenant_id and settings.azure_audience):
             raise HTTPException(status_code=500, detail="Azure AD not configured")
-        verifier = AzureADVerifier(
-            AzureADConfig(tenant_id=settings.azure_tenant_id, audience=settings.azure_audience)
-        )
+        verifier = get_verifier()
         try:
             claims = await verifier.validate(token)
             return claims
         except Exception as e:  # pragma: no cover
             raise HTTPException(status_code=401, detail=str(e))
-    raise HTTPException(status_code=500, detail=f"Unknown auth mode {settings.auth_mode}")
\ No newline at end of file
+    raise HTTPException(status_code=500, detail=f"Unknown auth mode {settings.auth_mode}")
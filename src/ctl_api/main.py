@@ -1,20 +1,57 @@
 from __future__ import annotations
-from fastapi import FastAPI, Depends
-from fastapi.responses import JSONResponse
+import itertools
+import json
+from contextlib import asynccontextmanager
+from dataclasses import asdict, replace
+from typing import AsyncIterator, Iterator
+from fastapi import FastAPI, Depends, Header, HTTPException, Request
+from fastapi.responses import JSONResponse, StreamingResponse
 import pandas as pd
 
 from ctl_core.registry import (
     list_connectors,
     list_transforms,
     build_connector,
-    build_transform,
 )
-from ctl_core.connectors.base import QuerySpec
+from ctl_core.cache import result_cache
+from ctl_core.config import settings
+from ctl_core.connectors.base import Partition, QuerySpec
+from ctl_core.connectors.engines import dispose_async_engines, dispose_engines, pool_stats
+from ctl_core.connectors.sql_pushdown import DIALECTS, compile_pushdown
+from ctl_core.executor import Overloaded, work_pool
 from ctl_core.fame_syntax import parse_fame_like, to_query_spec
-from .models import QueryRequest, TransformRequest, FameRequest
+from ctl_core.pipeline import stage_cache
+from ctl_core.planner import Plan, compile_plan, run_plan
+from ctl_core.formats import MEDIA_TYPES, aencode, encode, iter_batches, negotiate
+from ctl_core.streams import streams
+from .models import (
+    QueryModel,
+    QueryRequest,
+    TransformRequest,
+    FameRequest,
+    CacheInvalidateRequest,
+    StreamCreateRequest,
+    StreamAppendRequest,
+)
 from .deps import get_auth_user
 
-app = FastAPI(title="CTL API", version="0.1.0")
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    yield
+    work_pool.shutdown()
+    await dispose_async_engines()
+    dispose_engines()
+
+
+app = FastAPI(title="CTL API", version="0.1.0", lifespan=lifespan)
+
+
+@app.exception_handler(Overloaded)
+async def overloaded(request: Request, exc: Overloaded):
+    # A full endpoint queue is the caller's back-pressure (429); a full pool is ours (503)
+    status = 429 if exc.scope == "lane" else 503
+    return JSONResponse({"error": str(exc)}, status_code=status, headers={"Retry-After": "1"})
 
 
 @app.get("/health")
@@ -32,43 +69,247 @@ async def transforms(user=Depends(get_auth_user)):
     return {"transforms": list_transforms()}
 
 
-@app.post("/query")
-async def query(req: QueryRequest, user=Depends(get_auth_user)):
-    connector = build_connector(req.connector, req.connector_config)
-    df = connector.query(
-        QuerySpec(select=req.query.select, where=req.query.where, limit=req.query.limit)
+@app.get("/pools")
+async def pools(user=Depends(get_auth_user)):
+    return {"pools": pool_stats(), "workers": work_pool.stats()}
+
+
+@app.get("/cache/stats")
+async def cache_stats(user=Depends(get_auth_user)):
+    return {"results": result_cache.stats(), "stages": stage_cache.stats()}
+
+
+@app.post("/cache/invalidate")
+async def cache_invalidate(req: CacheInvalidateRequest, user=Depends(get_auth_user)):
+    return {"invalidated": result_cache.invalidate(req.connector)}
+
+
+def _output_format(fmt: str | None, accept: str | None) -> str:
+    try:
+        return negotiate(fmt, accept)
+    except ValueError as e:
+        raise HTTPException(status_code=406, detail=str(e))
+
+
+def _respond(df: pd.DataFrame, fmt: str) -> StreamingResponse:
+    # Rows are encoded batch by batch while the response is being sent
+    chunks = iter_batches(df, settings.stream_batch_rows)
+    return StreamingResponse(encode(chunks, fmt), media_type=MEDIA_TYPES[fmt])
+
+
+def _query_spec(q: QueryModel, where: dict | None = None) -> QuerySpec:
+    return QuerySpec(
+        select=q.select,
+        where=where or q.where,
+        limit=q.limit,
+        partition=Partition(**q.partition.model_dump()) if q.partition else None,
     )
-    return JSONResponse(df.to_dict(orient="records"))
+
+
+def _tenant(user: dict | None) -> str | None:
+    return user.get("tid") if user else None
+
+
+def _run_query(name: str, cfg: dict, spec: QuerySpec, tenant: str | None) -> pd.DataFrame:
+    return result_cache.get_or_query(
+        name, cfg, spec, lambda: build_connector(name, cfg).query(spec), tenant=tenant
+    )
+
+
+def _plan(req: TransformRequest) -> Plan:
+    # Filters may only join the connector query when no row limit applies before them
+    query = req.input.query if req.input.data is None else None
+    where = (query.where or {}) if query is not None and query.limit is None else None
+    return compile_plan(
+        [(step.name, step.params) for step in req.pipeline], outputs=req.outputs, where=where
+    )
+
+
+def _encode_stream(name: str, cfg: dict, spec: QuerySpec, fmt: str) -> Iterator[bytes]:
+    chunks = build_connector(name, cfg).query_iter(spec, settings.stream_batch_rows)
+    try:
+        # The first chunk is read before any bytes are produced, so query errors
+        # surface before the response starts
+        first = next(chunks)
+        yield from encode(itertools.chain([first], chunks), fmt)
+    finally:
+        close = getattr(chunks, "close", None)
+        if close is not None:
+            close()
+
+
+def _native_async(name: str, cfg: dict, spec: QuerySpec):
+    """
+    The connector for an uncached, unpartitioned query with a native async driver, if any.
+    Such queries await the database on the event loop instead of taking a worker thread.
+    """
+    if result_cache.ttl_for(name) > 0 or spec.partition is not None:
+        return None
+    conn = build_connector(name, cfg)
+    return conn if getattr(conn, "native_async", False) else None
+
+
+async def _fetch(name: str, cfg: dict, spec: QuerySpec, tenant: str | None) -> pd.DataFrame:
+    conn = _native_async(name, cfg, spec)
+    if conn is not None:
+        return await conn.aquery(spec)
+    return await work_pool.run("query", _run_query, name, cfg, spec, tenant)
+
+
+async def _aprepend(first: pd.DataFrame, rest: AsyncIterator[pd.DataFrame]):
+    yield first
+    async for chunk in rest:
+        yield chunk
+
+
+async def _query_response(
+    name: str, cfg: dict, spec: QuerySpec, tenant: str | None, fmt: str
+) -> StreamingResponse:
+    if result_cache.ttl_for(name) > 0:
+        df = await work_pool.run("query", _run_query, name, cfg, spec, tenant)
+        return _respond(df, fmt)
+    # Uncached results stream from the source chunk by chunk, so memory stays flat
+    conn = _native_async(name, cfg, spec)
+    if conn is not None:
+        chunks = conn.aquery_iter(spec, settings.stream_batch_rows)
+        first = await anext(chunks)
+        return StreamingResponse(
+            aencode(_aprepend(first, chunks), fmt), media_type=MEDIA_TYPES[fmt]
+        )
+    # Reading and encoding stay on the query lane until the stream ends or is dropped
+    body = work_pool.iterate("query", _encode_stream(name, cfg, spec, fmt))
+    first = await anext(body)
+    return StreamingResponse(_aprepend(first, body), media_type=MEDIA_TYPES[fmt])
+
+
+def _query_pushdown(
+    name: str, cfg: dict, spec: QuerySpec, plan: Plan, tenant: str | None
+) -> tuple[pd.DataFrame, Plan, bool]:
+    # Pushed-down results depend on the steps too, so they bypass the result cache
+    conn = build_connector(name, cfg)
+    if not hasattr(conn, "query_pushdown"):
+        return _run_query(name, cfg, spec, tenant), plan, False
+    df, pushed = conn.query_pushdown(spec, plan.steps)
+    return df, replace(plan, nodes=plan.nodes[pushed:]), True
+
+
+@app.post("/query")
+async def query(
+    req: QueryRequest,
+    accept: str | None = Header(default=None),
+    user=Depends(get_auth_user),
+):
+    fmt = _output_format(req.format, accept)
+    spec = _query_spec(req.query)
+    return await _query_response(req.connector, req.connector_config, spec, _tenant(user), fmt)
 
 
 @app.post("/transform")
-async def transform(req: TransformRequest, user=Depends(get_auth_user)):
-    # Load input
-    if req.input.data is not None:
+async def transform(
+    req: TransformRequest,
+    accept: str | None = Header(default=None),
+    user=Depends(get_auth_user),
+):
+    fmt = _output_format(req.format, accept)
+    plan = _plan(req)
+    # Load input; a frame built from the request body is ours to modify in place
+    owned = req.input.data is not None
+    if owned:
         df = pd.DataFrame(req.input.data)
     else:
         if not req.input.connector or not req.input.query:
             return JSONResponse({"error": "Provide input data or connector+query"}, status_code=400)
-        connector = build_connector(req.input.connector, req.input.connector_config)
-        q = QuerySpec(
-            select=req.input.query.select,
-            where=req.input.query.where,
-            limit=req.input.query.limit,
-        )
-        df = connector.query(q)
+        q = _query_spec(req.input.query, where=plan.where)
+        if req.pushdown:
+            df, plan, owned = await work_pool.run(
+                "query", _query_pushdown, req.input.connector, req.input.connector_config, q,
+                plan, _tenant(user),
+            )
+        else:
+            df = await _fetch(req.input.connector, req.input.connector_config, q, _tenant(user))
+
+    # Apply the compiled pipeline
+    report = [] if req.report else None
+    try:
+        df = await work_pool.run("transform", run_plan, plan, df, owned=owned, report=report)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    response = _respond(df, fmt)
+    if report is not None:
+        response.headers["X-CTL-Step-Report"] = json.dumps([asdict(r) for r in report])
+    return response
 
-    # Apply pipeline
-    for step in req.pipeline:
-        t = build_transform(step.name, step.params)
-        df = t.apply(df)
 
-    return JSONResponse(df.to_dict(orient="records"))
+@app.post("/transform/explain")
+async def transform_explain(req: TransformRequest, user=Depends(get_auth_user)):
+    plan = _plan(req)
+    result = {
+        "logical": [{"name": step.name, "params": step.params} for step in req.pipeline],
+        "physical": plan.explain(),
+    }
+    if req.pushdown and req.input.data is None and req.input.connector and req.input.query:
+        conn = build_connector(req.input.connector, req.input.connector_config)
+        dialect = getattr(conn, "dialect", None)
+        if dialect in DIALECTS:
+            spec = _query_spec(req.input.query, where=plan.where)
+            sql, params, pushed = compile_pushdown(dialect, conn.table, spec, plan.steps)
+            result["pushdown"] = {"dialect": dialect, "sql": sql, "steps_pushed": pushed}
+    return result
 
 
 @app.post("/fame/query")
-async def fame(req: FameRequest, user=Depends(get_auth_user)):
+async def fame(
+    req: FameRequest,
+    accept: str | None = Header(default=None),
+    user=Depends(get_auth_user),
+):
+    fmt = _output_format(req.format, accept)
     spec_dict = parse_fame_like(req.fame)
     q = to_query_spec(spec_dict)
-    connector = build_connector(req.connector, req.connector_config)
-    df = connector.query(q)
-    return JSONResponse(df.to_dict(orient="records"))
\ No newline at end of file
+    return await _query_response(req.connector, req.connector_config, q, _tenant(user), fmt)
+
+
+@app.get("/streams")
+async def list_streams(user=Depends(get_auth_user)):
+    return {"streams": streams.list(_tenant(user))}
+
+
+@app.post("/streams/{name}")
+async def create_stream(name: str, req: StreamCreateRequest, user=Depends(get_auth_user)):
+    try:
+        stream = streams.create(
+            name,
+            [(step.name, step.params) for step in req.pipeline],
+            replace=req.replace,
+            tenant=_tenant(user),
+        )
+    except (TypeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return stream.describe()
+
+
+@app.post("/streams/{name}/append")
+async def append_stream(
+    name: str,
+    req: StreamAppendRequest,
+    accept: str | None = Header(default=None),
+    user=Depends(get_auth_user),
+):
+    fmt = _output_format(req.format, accept)
+    try:
+        stream = streams.get(name, _tenant(user))
+    except KeyError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    # Only the appended rows are computed and returned
+    try:
+        df = await work_pool.run("stream", stream.append, pd.DataFrame(req.data))
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _respond(df, fmt)
+
+
+@app.delete("/streams/{name}")
+async def drop_stream(name: str, user=Depends(get_auth_user)):
+    if not streams.drop(name, _tenant(user)):
+        raise HTTPException(status_code=404, detail=f"Unknown stream: {name}")
+    return {"dropped": name}
@@ -3,16 +3,27 @@ from typing import Any, Optional, List, Dict
 from pydantic import BaseModel, Field
 
 
+class PartitionModel(BaseModel):
+    # Concurrent range reads on one column (SQL connectors); bounds default to MIN/MAX
+    column: str
+    num_partitions: int = 4
+    lower: Optional[Any] = None
+    upper: Optional[Any] = None
+
+
 class QueryModel(BaseModel):
     select: Optional[List[str]] = None
     where: Optional[Dict[str, Any]] = None
     limit: Optional[int] = None
+    partition: Optional[PartitionModel] = None
 
 
 class QueryRequest(BaseModel):
     connector: str
     connector_config: Dict[str, Any] = Field(default_factory=dict)
     query: QueryModel
+    # json (default), ndjson, csv, arrow or parquet; overrides the Accept header
+    format: Optional[str] = None
 
 
 class TransformStep(BaseModel):
@@ -31,9 +42,33 @@ class InputSource(BaseModel):
 class TransformRequest(BaseModel):
     input: InputSource
     pipeline: List[TransformStep]
+    format: Optional[str] = None
+    # Per-step timings and allocated bytes, returned in the X-CTL-Step-Report header
+    report: bool = False
+    # Columns to return; steps that only feed other columns are skipped
+    outputs: Optional[List[str]] = None
+    # Compute leading moving_average/normalize/filter steps in the database (SQL connectors)
+    pushdown: bool = False
 
 
 class FameRequest(BaseModel):
     connector: str
     connector_config: Dict[str, Any] = Field(default_factory=dict)
-    fame: str
\ No newline at end of file
+    fame: str
+    format: Optional[str] = None
+
+
+class CacheInvalidateRequest(BaseModel):
+    # Connector whose cached results are dropped; all connectors when omitted
+    connector: Optional[str] = None
+
+
+class StreamCreateRequest(BaseModel):
+    # Only incrementally computable steps (moving_average, normalize)
+    pipeline: List[TransformStep]
+    replace: bool = False
+
+
+class StreamAppendRequest(BaseModel):
+    data: list[dict[str, Any]]
+    format: Optional[str] = None
@@ -5,8 +5,12 @@ from typing import Optional
 import pandas as pd
 import typer
 
-from ctl_core.registry import build_connector, build_transform
-from ctl_core.connectors.base import QuerySpec
+from ctl_core.registry import build_connector
+from ctl_core.config import settings
+from ctl_core.connectors.base import Partition, QuerySpec
+from ctl_core.connectors.engines import pool_stats
+from ctl_core.pipeline import StageCache, run_pipeline
+from ctl_core.streams import transform_chunks
 
 app = typer.Typer(help="CTL Command Line Interface")
 
@@ -20,6 +24,14 @@ def query(
     where: list[str] = typer.Option(None, help="Filters like key=value"),
     select: list[str] = typer.Option(None, help="Columns to select"),
     limit: Optional[int] = typer.Option(None, help="Row limit"),
+    stats: bool = typer.Option(False, help="Print SQL connection pool statistics to stderr"),
+    chunk_rows: int = typer.Option(
+        settings.stream_batch_rows, help="Rows fetched and written per chunk"
+    ),
+    partition_column: Optional[str] = typer.Option(
+        None, help="For SQL connectors, read concurrent ranges of this column"
+    ),
+    partitions: int = typer.Option(4, help="Number of ranges for --partition-column"),
 ):
     cfg = {}
     if connector == "local" and path:
@@ -37,8 +49,18 @@ def query(
             spec_where[k] = v
 
     conn = build_connector(connector, cfg)
-    df = conn.query(QuerySpec(select=select or None, where=spec_where or None, limit=limit))
-    typer.echo(df.to_csv(index=False))
+    spec = QuerySpec(
+        select=select or None,
+        where=spec_where or None,
+        limit=limit,
+        partition=Partition(partition_column, partitions) if partition_column else None,
+    )
+    # Write chunk by chunk so memory does not grow with the result size
+    for i, chunk in enumerate(conn.query_iter(spec, chunk_rows)):
+        typer.echo(chunk.to_csv(index=False, header=i == 0), nl=False)
+    if stats:
+        for entry in pool_stats():
+            typer.echo(f"# pool {entry}", err=True)
 
 
 @app.command()
@@ -49,8 +71,14 @@ def transform(
         None,
         help="Pipeline steps like normalize:columns=value moving_average:column=value,window=3",
     ),
+    report: bool = typer.Option(False, help="Print per-step time and allocated bytes to stderr"),
+    chunk_rows: Optional[int] = typer.Option(
+        None,
+        help="Stream the input this many rows at a time, so memory is bounded by the chunk "
+        "size (filter, moving_average and normalize; normalize re-reads the input once)",
+    ),
 ):
-    df = pd.read_csv(in_)
+    steps = []
     for step in pipeline or []:
         name, _, args = step.partition(":")
         params = {}
@@ -74,8 +102,28 @@ def transform(
                 if "|" in str(v_parsed):
                     v_parsed = v_parsed.split("|")
                 params[k] = v_parsed
-        t = build_transform(name, params)
-        df = t.apply(df)
+        steps.append((name, params))
+
+    if chunk_rows:
+        if report:
+            raise typer.BadParameter("--report is not available with --chunk-rows")
+        try:
+            chunks = transform_chunks(
+                lambda: pd.read_csv(in_, chunksize=chunk_rows),
+                steps,
+                columns=list(pd.read_csv(in_, nrows=0).columns),
+            )
+        except ValueError as e:
+            raise typer.BadParameter(str(e))
+        _write_chunks(chunks, out)
+        return
+
+    df = pd.read_csv(in_)
+    # One-shot run: the frame is ours and there is nothing to reuse stages for
+    step_report = [] if report else None
+    df = run_pipeline(df, steps, cache=StageCache(max_bytes=0), owned=True, report=step_report)
+    for r in step_report or []:
+        typer.echo(f"# step {r.name}: {r.seconds:.3f}s, {r.bytes_allocated} bytes", err=True)
 
     if out:
         Path(out).parent.mkdir(parents=True, exist_ok=True)
@@ -84,5 +132,16 @@ def transform(
         typer.echo(df.to_csv(index=False))
 
 
+def _write_chunks(chunks, out: Optional[str]) -> None:
+    if not out:
+        for i, chunk in enumerate(chunks):
+            typer.echo(chunk.to_csv(index=False, header=i == 0), nl=False)
+        return
+    Path(out).parent.mkdir(parents=True, exist_ok=True)
+    with open(out, "w", newline="") as f:
+        for i, chunk in enumerate(chunks):
+            chunk.to_csv(f, index=False, header=i == 0)
+
+
 if __name__ == "__main__":
     app()
\ No newline at end of file
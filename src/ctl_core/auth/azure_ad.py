@@ -1,44 +1,133 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import logging
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Any
 from jose import jwk, jwt
 from jose.utils import base64url_decode
 import httpx
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class AzureADConfig:
     tenant_id: str
     audience: str
+    # Hard TTL of the cached JWKS; a background refresh starts once
+    # `jwks_refresh_ahead` seconds remain.
+    jwks_ttl: float = 3600.0
+    jwks_refresh_ahead: float = 300.0
+    # Minimum spacing between refetches triggered by an unknown `kid`
+    jwks_min_refetch_interval: float = 30.0
+    token_cache_size: int = 1024
+    jwks_uri: str | None = None
 
 
 class AzureADVerifier:
-    def __init__(self, cfg: AzureADConfig):
+    def __init__(self, cfg: AzureADConfig, transport: httpx.AsyncBaseTransport | None = None):
         self.cfg = cfg
-        self._jwks_uri = f"https://login.microsoftonline.com/{cfg.tenant_id}/discovery/v2.0/keys"
+        self._jwks_uri = (
+            cfg.jwks_uri
+            or f"https://login.microsoftonline.com/{cfg.tenant_id}/discovery/v2.0/keys"
+        )
+        self._transport = transport
         self._jwks: dict[str, Any] | None = None
+        self._jwks_fetched_at = 0.0
+        self._kid_refetched_at = float("-inf")
+        self._refresh_task: asyncio.Task | None = None
+        self._lock: asyncio.Lock | None = None
+        # sha256(token) -> (expires_at, claims), least recently used first
+        self._tokens: OrderedDict[str, tuple[float, dict[str, Any]]] = OrderedDict()
+        self.fetch_count = 0
+
+    async def _fetch_keys(self) -> dict[str, Any]:
+        async with httpx.AsyncClient(timeout=10, transport=self._transport) as client:
+            resp = await client.get(self._jwks_uri)
+            resp.raise_for_status()
+            jwks = resp.json()
+        self.fetch_count += 1
+        self._jwks = jwks
+        self._jwks_fetched_at = time.monotonic()
+        return jwks
+
+    async def _refresh(self, min_age: float = 0.0) -> dict[str, Any]:
+        # The lock is created lazily so it binds to the loop that first uses it
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            # Another coroutine may have refreshed while we waited
+            if self._jwks is not None and time.monotonic() - self._jwks_fetched_at < min_age:
+                return self._jwks
+            return await self._fetch_keys()
+
+    async def _background_refresh(self) -> None:
+        try:
+            await self._refresh(min_age=self.cfg.jwks_ttl - self.cfg.jwks_refresh_ahead)
+        except Exception:  # pragma: no cover - keep serving the cached keys
+            logger.debug("Background JWKS refresh failed", exc_info=True)
 
     async def load_keys(self) -> dict[str, Any]:
-        if self._jwks is None:
-            async with httpx.AsyncClient(timeout=10) as client:
-                resp = await client.get(self._jwks_uri)
-                resp.raise_for_status()
-                self._jwks = resp.json()
+        age = time.monotonic() - self._jwks_fetched_at
+        if self._jwks is None or age >= self.cfg.jwks_ttl:
+            return await self._refresh(min_age=self.cfg.jwks_ttl)
+        if age >= self.cfg.jwks_ttl - self.cfg.jwks_refresh_ahead and (
+            self._refresh_task is None or self._refresh_task.done()
+        ):
+            self._refresh_task = asyncio.create_task(self._background_refresh())
         return self._jwks
 
-    async def validate(self, token: str) -> dict[str, Any]:
+    async def _find_key(self, kid: str | None) -> dict[str, Any] | None:
         jwks = await self.load_keys()
+        key = next((k for k in jwks["keys"] if k["kid"] == kid), None)
+        now = time.monotonic()
+        if key is None and now - self._kid_refetched_at >= self.cfg.jwks_min_refetch_interval:
+            # Keys may have rotated: refetch once, but not more often than allowed
+            self._kid_refetched_at = now
+            jwks = await self._refresh()
+            key = next((k for k in jwks["keys"] if k["kid"] == kid), None)
+        return key
+
+    def _cached_claims(self, digest: str) -> dict[str, Any] | None:
+        hit = self._tokens.get(digest)
+        if hit is None:
+            return None
+        expires_at, claims = hit
+        if expires_at <= time.time():
+            del self._tokens[digest]
+            return None
+        self._tokens.move_to_end(digest)
+        return claims
+
+    def _remember(self, digest: str, claims: dict[str, Any]) -> None:
+        exp = claims.get("exp")
+        if exp is None or self.cfg.token_cache_size <= 0:
+            return
+        self._tokens[digest] = (float(exp), claims)
+        self._tokens.move_to_end(digest)
+        while len(self._tokens) > self.cfg.token_cache_size:
+            self._tokens.popitem(last=False)
+
+    async def validate(self, token: str) -> dict[str, Any]:
+        digest = hashlib.sha256(token.encode("utf-8")).hexdigest()
+        claims = self._cached_claims(digest)
+        if claims is not None:
+            return claims
+
         headers = jwt.get_unverified_header(token)
         kid = headers.get("kid")
-        key = next((k for k in jwks["keys"] if k["kid"] == kid), None)
+        key = await self._find_key(kid)
         if not key:
             raise ValueError("Key not found for token")
 
         message, encoded_sig = token.rsplit(".", 1)
         decoded_sig = base64url_decode(encoded_sig.encode("utf-8"))
 
-        public_key = jwk.construct(key)
+        public_key = jwk.construct(key, algorithm=key.get("alg", headers.get("alg", "RS256")))
         if not public_key.verify(message.encode("utf-8"), decoded_sig):
             raise ValueError("Invalid token signature")
 
@@ -46,6 +135,9 @@ class AzureADVerifier:
         aud = claims.get("aud")
         if aud != self.cfg.audience:
             raise ValueError("Invalid audience")
+        exp = claims.get("exp")
+        if exp is not None and float(exp) <= time.time():
+            raise ValueError("Token expired")
 
-        # Expiry and nbf are validated in jose verify; inlined verification kept simple here
-        return claims
\ No newline at end of file
+        self._remember(digest, claims)
+        return claims
@@ -0,0 +1,274 @@
+from __future__ import annotations
+import hashlib
+import hmac
+import json
+import os
+import re
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore
+
+from .config import settings
+from .connectors.base import QuerySpec
+from .frames import detach, frame_nbytes
+
+# Connector config keys whose values never enter a cache key in plain text
+_SECRET_MARKERS = ("password", "passwd", "secret", "token", "api_key", "credential")
+_URL_PASSWORD = re.compile(r"(://[^:/@]+):([^@]*)@")
+_META_KEY = b"ctl_result_cache"
+# Without a configured salt, credential fingerprints (and so cache keys) are per process
+_KEY_SALT = (settings.result_cache_key_salt or secrets.token_hex(32)).encode("utf-8")
+
+
+def _redact(cfg: dict[str, Any]) -> tuple[dict[str, Any], dict[str, Any]]:
+    """
+    Split a connector config into its non-secret part and the secrets taken out of it
+    (secret-named keys and passwords embedded in URLs).
+    """
+    out, hidden = {}, {}
+    for k, v in cfg.items():
+        if any(m in k.lower() for m in _SECRET_MARKERS):
+            hidden[k] = v
+            continue
+        if isinstance(v, str):
+            passwords = [m.group(2) for m in _URL_PASSWORD.finditer(v)]
+            if passwords:
+                hidden[k] = passwords
+                v = _URL_PASSWORD.sub(r"\1@", v)
+        out[k] = v
+    return out, hidden
+
+
+def cache_key(
+    connector: str, cfg: dict[str, Any], spec: QuerySpec, tenant: str | None = None
+) -> str:
+    """
+    Stable key for a connector query. Credentials enter only as a salted HMAC, so
+    callers with different credentials never share entries; `tenant` keeps callers
+    from different tenants apart.
+    """
+    config, creds = _redact(cfg)
+    principal = None
+    if creds:
+        raw = json.dumps(creds, sort_keys=True, default=str).encode("utf-8")
+        principal = hmac.new(_KEY_SALT, raw, hashlib.sha256).hexdigest()
+    payload = {
+        "tenant": tenant,
+        "connector": connector,
+        "config": config,
+        "credentials": principal,
+        "spec": asdict(spec),
+    }
+    raw = json.dumps(payload, sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def parse_ttls(spec: str) -> dict[str, float]:
+    """
+    Parse "mysql=60,local=300" into per-connector TTLs in seconds.
+    """
+    ttls: dict[str, float] = {}
+    for pair in filter(None, (p.strip() for p in spec.split(","))):
+        k, v = pair.split("=", 1)
+        ttls[k.strip()] = float(v)
+    return ttls
+
+
+@dataclass
+class _Entry:
+    connector: str
+    expires_at: float
+    df: pd.DataFrame
+    nbytes: int
+
+
+@dataclass
+class ResultCache:
+    """
+    Two-tier (memory, then optional Parquet-on-disk) cache of connector query results.
+
+    Entries live for the connector's TTL (`ttls`, else `default_ttl`; 0 disables caching
+    for that connector). Both tiers evict least recently used entries past their caps.
+    """
+    default_ttl: float = 0.0
+    ttls: dict[str, float] = field(default_factory=dict)
+    max_entries: int = 256
+    max_bytes: int = 512 * 1024**2
+    disk_dir: str | None = None
+    disk_max_bytes: int = 4 * 1024**3
+    _mem: OrderedDict[str, _Entry] = field(default_factory=OrderedDict, init=False, repr=False)
+    _mem_bytes: int = field(default=0, init=False, repr=False)
+    _counts: dict[str, int] = field(
+        default_factory=lambda: {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0},
+        init=False,
+        repr=False,
+    )
+    _lock: threading.RLock = field(default_factory=threading.RLock, init=False, repr=False)
+
+    def ttl_for(self, connector: str) -> float:
+        return self.ttls.get(connector, self.default_ttl)
+
+    # -- memory tier -------------------------------------------------------
+    def _mem_put(self, key: str, entry: _Entry) -> None:
+        old = self._mem.pop(key, None)
+        if old is not None:
+            self._mem_bytes -= old.nbytes
+        if entry.nbytes > self.max_bytes:
+            return
+        self._mem[key] = entry
+        self._mem_bytes += entry.nbytes
+        while self._mem and (len(self._mem) > self.max_entries or self._mem_bytes > self.max_bytes):
+            _, evicted = self._mem.popitem(last=False)
+            self._mem_bytes -= evicted.nbytes
+
+    def _mem_get(self, key: str) -> _Entry | None:
+        entry = self._mem.get(key)
+        if entry is None:
+            return None
+        if entry.expires_at <= time.time():
+            self._mem.pop(key)
+            self._mem_bytes -= entry.nbytes
+            return None
+        self._mem.move_to_end(key)
+        return entry
+
+    # -- disk tier ---------------------------------------------------------
+    def _disk_enabled(self) -> bool:
+        return self.disk_dir is not None and pa is not None
+
+    def _disk_path(self, key: str) -> Path:
+        return Path(self.disk_dir) / f"{key}.parquet"
+
+    def _disk_put(self, key: str, entry: _Entry) -> None:
+        Path(self.disk_dir).mkdir(parents=True, exist_ok=True)
+        table = pa.Table.from_pandas(entry.df)
+        meta = json.dumps({"connector": entry.connector, "expires_at": entry.expires_at})
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _META_KEY: meta})
+        target = self._disk_path(key)
+        tmp = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        pq.write_table(table, tmp)
+        os.replace(tmp, target)
+        self._disk_evict()
+
+    def _disk_meta(self, path: Path) -> dict[str, Any]:
+        return json.loads(pq.read_schema(path).metadata[_META_KEY])
+
+    def _disk_get(self, key: str) -> _Entry | None:
+        path = self._disk_path(key)
+        try:
+            meta = self._disk_meta(path)
+            if meta["expires_at"] <= time.time():
+                path.unlink(missing_ok=True)
+                return None
+            df = pq.read_table(path).to_pandas()
+            os.utime(path)  # mark as recently used
+        except (FileNotFoundError, KeyError):
+            return None
+        return _Entry(meta["connector"], meta["expires_at"], df, frame_nbytes(df))
+
+    def _disk_evict(self) -> None:
+        entries = []
+        for p in Path(self.disk_dir).glob("*.parquet"):
+            try:
+                st = p.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((st.st_mtime, st.st_size, p))
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in sorted(entries, key=lambda e: e[0]):
+            if total <= self.disk_max_bytes:
+                break
+            p.unlink(missing_ok=True)
+            total -= size
+
+    # -- public API --------------------------------------------------------
+    def get_or_query(
+        self,
+        connector: str,
+        cfg: dict[str, Any],
+        spec: QuerySpec,
+        run: Callable[[], pd.DataFrame],
+        tenant: str | None = None,
+    ) -> pd.DataFrame:
+        """
+        Return the cached result for this query, or call `run()` and cache what it returns.
+        """
+        ttl = self.ttl_for(connector)
+        if ttl <= 0:
+            return run()
+        key = cache_key(connector, cfg, spec, tenant)
+        # The lock covers the memory tier and counters only; Parquet files are read and
+        # written (to a temp path, then renamed into place) outside it
+        with self._lock:
+            entry = self._mem_get(key)
+            if entry is not None:
+                self._counts["memory_hits"] += 1
+                return detach(entry.df)
+        entry = self._disk_get(key) if self._disk_enabled() else None
+        with self._lock:
+            if entry is not None:
+                self._counts["disk_hits"] += 1
+                self._mem_put(key, entry)
+                return detach(entry.df)
+            self._counts["misses"] += 1
+
+        df = run()
+        entry = _Entry(connector, time.time() + ttl, detach(df), frame_nbytes(df))
+        with self._lock:
+            self._mem_put(key, entry)
+            self._counts["stores"] += 1
+        if self._disk_enabled():
+            self._disk_put(key, entry)
+        return df
+
+    def invalidate(self, connector: str | None = None) -> int:
+        """
+        Drop cached results for one connector (or all of them). Returns entries removed.
+        """
+        removed = 0
+        with self._lock:
+            for key in [k for k, e in self._mem.items() if connector in (None, e.connector)]:
+                self._mem_bytes -= self._mem.pop(key).nbytes
+                removed += 1
+        if self._disk_enabled() and Path(self.disk_dir).exists():
+            for p in Path(self.disk_dir).glob("*.parquet"):
+                try:
+                    if connector is None or self._disk_meta(p)["connector"] == connector:
+                        p.unlink(missing_ok=True)
+                        removed += 1
+                except (FileNotFoundError, KeyError):
+                    continue
+        return removed
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counts,
+                "memory_entries": len(self._mem),
+                "memory_bytes": self._mem_bytes,
+                "default_ttl": self.default_ttl,
+                "ttls": dict(self.ttls),
+                "disk_dir": self.disk_dir,
+            }
+
+
+result_cache = ResultCache(
+    default_ttl=settings.result_cache_ttl,
+    ttls=parse_ttls(settings.result_cache_ttls),
+    max_entries=settings.result_cache_max_entries,
+    max_bytes=settings.result_cache_max_bytes,
+    disk_dir=settings.result_cache_dir,
+    disk_max_bytes=settings.result_cache_disk_max_bytes,
+)
@@ -12,11 +12,68 @@ class Settings:
     auth_mode: str = os.getenv("CTL_AUTH_MODE", "disabled")
     azure_tenant_id: str | None = os.getenv("AZURE_AD_TENANT_ID")
     azure_audience: str | None = os.getenv("AZURE_AD_AUDIENCE")
+    azure_jwks_ttl: float = float(os.getenv("CTL_JWKS_TTL", "3600"))
+    token_cache_size: int = int(os.getenv("CTL_TOKEN_CACHE_SIZE", "1024"))
 
     # Example connection strings (for demos; use Key Vault in prod)
     azure_sql_url: str | None = os.getenv("AZURE_SQL_URL")
     mysql_url: str | None = os.getenv("MYSQL_URL")
 
+    # Shared SQLAlchemy connection pools (one engine per URL, per process)
+    sql_pool_size: int = int(os.getenv("CTL_SQL_POOL_SIZE", "5"))
+    sql_max_overflow: int = int(os.getenv("CTL_SQL_MAX_OVERFLOW", "10"))
+    sql_pool_pre_ping: bool = os.getenv("CTL_SQL_POOL_PRE_PING", "true").lower() == "true"
+    sql_pool_recycle: int = int(os.getenv("CTL_SQL_POOL_RECYCLE", "1800"))
+    # Use asyncio drivers (aiomysql/aioodbc/aiosqlite) for async queries when installed
+    sql_async: bool = os.getenv("CTL_SQL_ASYNC", "true").lower() == "true"
+
+    # Columnar (Arrow IPC) cache of local CSV files; disabled when no directory is set
+    csv_cache_dir: str | None = os.getenv("CTL_CSV_CACHE_DIR")
+    csv_cache_max_bytes: int = int(os.getenv("CTL_CSV_CACHE_MAX_BYTES", str(2 * 1024**3)))
+
+    # Connector result cache: default TTL in seconds (0 = off), per-connector
+    # overrides like "mysql=60,local=300", memory caps and an optional disk tier
+    result_cache_ttl: float = float(os.getenv("CTL_RESULT_CACHE_TTL", "0"))
+    result_cache_ttls: str = os.getenv("CTL_RESULT_CACHE_TTLS", "")
+    result_cache_max_entries: int = int(os.getenv("CTL_RESULT_CACHE_MAX_ENTRIES", "256"))
+    result_cache_max_bytes: int = int(os.getenv("CTL_RESULT_CACHE_MAX_BYTES", str(512 * 1024**2)))
+    result_cache_dir: str | None = os.getenv("CTL_RESULT_CACHE_DIR")
+    result_cache_disk_max_bytes: int = int(
+        os.getenv("CTL_RESULT_CACHE_DISK_MAX_BYTES", str(4 * 1024**3))
+    )
+    # HMAC key for the credential fingerprint in cache keys (empty: random per process)
+    result_cache_key_salt: str = os.getenv("CTL_RESULT_CACHE_KEY_SALT", "")
+    # Cache tenant of MCP callers without an access token
+    mcp_tenant: str = os.getenv("CTL_MCP_TENANT", "mcp")
+
+    # Memoized intermediate transform pipeline results (0 disables)
+    stage_cache_max_bytes: int = int(os.getenv("CTL_STAGE_CACHE_MAX_BYTES", str(256 * 1024**2)))
+
+    # Fitted seasonal components kept for incremental seasonal adjustment
+    seasonal_state_max_series: int = int(os.getenv("CTL_SEASONAL_STATE_MAX_SERIES", "10000"))
+    seasonal_state_dir: str | None = os.getenv("CTL_SEASONAL_STATE_DIR")
+
+    # Upper bound on seasonal_adjustment `workers` processes (empty: the CPU count)
+    seasonal_max_workers: int = int(os.getenv("CTL_SEASONAL_MAX_WORKERS") or os.cpu_count() or 1)
+
+    # Named incremental transform streams held in memory (API/MCP append endpoints)
+    stream_max_streams: int = int(os.getenv("CTL_STREAM_MAX_STREAMS", "1000"))
+
+    # MCP dataset handles: results kept server-side, referenced by handle
+    mcp_dataset_max: int = int(os.getenv("CTL_MCP_DATASET_MAX", "100"))
+    mcp_dataset_max_bytes: int = int(os.getenv("CTL_MCP_DATASET_MAX_BYTES", str(1024**3)))
+    mcp_dataset_ttl: float = float(os.getenv("CTL_MCP_DATASET_TTL", "3600"))
+    mcp_dataset_preview_rows: int = int(os.getenv("CTL_MCP_DATASET_PREVIEW_ROWS", "10"))
+
+    # Worker threads for blocking connector/transform work (per lane = endpoint/connector)
+    worker_concurrency: int = int(os.getenv("CTL_WORKER_CONCURRENCY", "4"))
+    worker_queue_depth: int = int(os.getenv("CTL_WORKER_QUEUE_DEPTH", "16"))
+    worker_max_pending: int = int(os.getenv("CTL_WORKER_MAX_PENDING", "64"))
+    worker_limits: str = os.getenv("CTL_WORKER_LIMITS", "")
+
+    # Rows per record batch when streaming API responses
+    stream_batch_rows: int = int(os.getenv("CTL_STREAM_BATCH_ROWS", "65536"))
+
     api_host: str = os.getenv("CTL_API_HOST", "0.0.0.0")
     api_port: int = int(os.getenv("CTL_API_PORT", "8000"))
 
@@ -0,0 +1,37 @@
+from __future__ import annotations
+from typing import Any, AsyncIterator, Sequence
+import pandas as pd
+
+from .engines import AsyncEngine
+
+
+def _frame(rows: Sequence[Any], columns: list[str]) -> pd.DataFrame:
+    # Matches what pandas.read_sql builds from the same rows
+    return pd.DataFrame.from_records(rows, columns=columns, coerce_float=True)
+
+
+async def aread_sql(engine: AsyncEngine, sql: Any, params: dict[str, Any]) -> pd.DataFrame:
+    """
+    Run `sql` on a pooled connection of an asyncio engine and return all rows.
+    """
+    async with engine.connect() as conn:
+        result = await conn.execute(sql, params)
+        return _frame(result.fetchall(), list(result.keys()))
+
+
+async def aiter_sql(
+    engine: AsyncEngine, sql: Any, params: dict[str, Any], chunk_rows: int
+) -> AsyncIterator[pd.DataFrame]:
+    """
+    Stream `sql` through a server-side cursor as DataFrames of at most `chunk_rows` rows,
+    at least one (possibly empty), awaiting the driver between chunks.
+    """
+    async with engine.connect() as conn:
+        result = await conn.stream(sql, params)
+        columns = list(result.keys())
+        empty = True
+        async for rows in result.partitions(chunk_rows):
+            empty = False
+            yield _frame(rows, columns)
+        if empty:
+            yield _frame([], columns)
@@ -1,17 +1,22 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import Any, AsyncIterator, Iterator
 import pandas as pd
 
 try:
-    from sqlalchemy import create_engine, text
+    from sqlalchemy import text
 except Exception:  # pragma: no cover
-    create_engine = None  # type: ignore
+    text = None  # type: ignore
 
-from .base import Connector, QuerySpec
+from .aio import aiter_sql, aread_sql
+from .base import AsyncConnector, Connector, QuerySpec
+from .engines import async_url, get_async_engine, get_engine
+from .partitioned import read_partitioned
+from .sql_pushdown import DIALECTS, engine_fetch, read_pushdown
 
 
 @dataclass
-class AzureSqlConnector(Connector):
+class AzureSqlConnector(Connector, AsyncConnector):
     """
     Template connector using SQLAlchemy. Provide a SQLAlchemy URL.
     Example:
@@ -21,10 +26,7 @@ class AzureSqlConnector(Connector):
     table: str
     name: str = "azure_sql"
 
-    def query(self, spec: QuerySpec) -> pd.DataFrame:
-        if create_engine is None:
-            raise RuntimeError("SQLAlchemy not installed. Install with 'pip install .[sql]'")
-        engine = create_engine(self.url)
+    def _statement(self, spec: QuerySpec) -> tuple[Any, dict[str, Any]]:
         cols = ", ".join(spec.select) if spec.select else "*"
         where_clause = ""
         params = {}
@@ -38,6 +40,58 @@ class AzureSqlConnector(Connector):
 
         limit_clause: str = f" TOP {spec.limit} " if spec.limit else ""
         sql = text(f"SELECT {limit_clause}{cols} FROM {self.table}{where_clause}")
-        with engine.connect() as conn:
+        return sql, params
+
+    def query(self, spec: QuerySpec) -> pd.DataFrame:
+        if spec.partition is not None and self.dialect in DIALECTS:
+            return read_partitioned(self.dialect, self.table, spec, engine_fetch(self.url))
+        sql, params = self._statement(spec)
+        with get_engine(self.url).connect() as conn:
             df = pd.read_sql(sql, conn, params=params)
-        return df
\ No newline at end of file
+        return df
+
+    def query_iter(self, spec: QuerySpec, chunk_rows: int = 65536) -> Iterator[pd.DataFrame]:
+        """
+        Stream the result through a server-side cursor, `chunk_rows` rows at a time.
+        Partitioned reads are materialized first.
+        """
+        if spec.partition is not None:
+            yield from Connector.query_iter(self, spec, chunk_rows)
+            return
+        sql, params = self._statement(spec)
+        with get_engine(self.url).connect() as conn:
+            conn = conn.execution_options(stream_results=True)
+            yield from pd.read_sql(sql, conn, params=params, chunksize=chunk_rows)
+
+    @property
+    def native_async(self) -> bool:
+        return async_url(self.url) is not None
+
+    async def aquery(self, spec: QuerySpec) -> pd.DataFrame:
+        engine = get_async_engine(self.url)
+        if engine is None or spec.partition is not None:
+            return await AsyncConnector.aquery(self, spec)
+        sql, params = self._statement(spec)
+        return await aread_sql(engine, sql, params)
+
+    async def aquery_iter(
+        self, spec: QuerySpec, chunk_rows: int = 65536
+    ) -> AsyncIterator[pd.DataFrame]:
+        engine = get_async_engine(self.url)
+        if engine is None or spec.partition is not None:
+            chunks = AsyncConnector.aquery_iter(self, spec, chunk_rows)
+        else:
+            chunks = aiter_sql(engine, *self._statement(spec), chunk_rows)
+        async for chunk in chunks:
+            yield chunk
+
+    @property
+    def dialect(self) -> str:
+        return get_engine(self.url).dialect.name
+
+    def query_pushdown(self, spec: QuerySpec, steps: list) -> tuple[pd.DataFrame, int]:
+        """
+        Query with the leading pushable transform steps computed by the database.
+        Returns the frame and how many of `steps` it already reflects.
+        """
+        return read_pushdown(self.url, self.table, spec, steps) or (self.query(spec), 0)
\ No newline at end of file
@@ -1,18 +1,85 @@
 from __future__ import annotations
+import asyncio
 from dataclasses import dataclass
-from typing import Any, Protocol
+from typing import Any, AsyncIterator, Iterator, Protocol, TypeVar
 import pandas as pd
 
 
+@dataclass
+class Partition:
+    """
+    Split a SQL read into `num_partitions` range queries on `column` that run concurrently.
+    `lower`/`upper` only set the stride (found with MIN/MAX when omitted): the first and
+    last ranges are open-ended, and NULLs go to the first, so every row is read once.
+    """
+    column: str
+    num_partitions: int = 4
+    lower: Any = None
+    upper: Any = None
+
+
 @dataclass
 class QuerySpec:
     select: list[str] | None = None
     where: dict[str, Any] | None = None
     limit: int | None = None
+    partition: Partition | None = None
 
 
 class Connector(Protocol):
     name: str
 
     def query(self, spec: QuerySpec) -> pd.DataFrame:
-        ...
\ No newline at end of file
+        ...
+
+    def query_iter(self, spec: QuerySpec, chunk_rows: int = 65536) -> Iterator[pd.DataFrame]:
+        """
+        Yield the result of `spec` as DataFrames of at most `chunk_rows` rows, at least
+        one (possibly empty). This default materializes the whole result first;
+        connectors that can stream from the source override it.
+        """
+        df = self.query(spec)
+        for start in range(0, max(len(df), 1), chunk_rows):
+            yield df.iloc[start : start + chunk_rows]
+
+
+T = TypeVar("T")
+
+
+async def aiter_thread(items: Iterator[T]) -> AsyncIterator[T]:
+    """
+    Drive a blocking iterator from async code, advancing it in a worker thread so the
+    event loop stays free while each item is produced.
+    """
+    done = object()
+    try:
+        while (item := await asyncio.to_thread(next, items, done)) is not done:
+            yield item
+    finally:
+        close = getattr(items, "close", None)
+        if close is not None:
+            await asyncio.to_thread(close)
+
+
+class AsyncConnector(Protocol):
+    """
+    Async counterpart of `Connector`. These defaults run the sync methods in worker
+    threads; connectors with a native async driver override them and report
+    `native_async`, so callers can skip their own thread pools.
+    """
+    name: str
+
+    @property
+    def native_async(self) -> bool:
+        return False
+
+    async def aquery(self, spec: QuerySpec) -> pd.DataFrame:
+        return await asyncio.to_thread(self.query, spec)
+
+    def aquery_iter(
+        self, spec: QuerySpec, chunk_rows: int = 65536
+    ) -> AsyncIterator[pd.DataFrame]:
+        """
+        Async `query_iter`: at least one (possibly empty) chunk of at most `chunk_rows` rows.
+        """
+        return aiter_thread(self.query_iter(spec, chunk_rows))
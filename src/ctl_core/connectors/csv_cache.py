@@ -0,0 +1,106 @@
+from __future__ import annotations
+import hashlib
+import os
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pcsv
+    import pyarrow.dataset as ds
+    import pyarrow.fs as pafs
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore
+
+from ..config import settings
+
+
+def _csv_convert_options(path: str) -> pcsv.ConvertOptions:
+    # pandas leaves date-like text as strings; keep cached columns identical to read_csv
+    reader = pcsv.open_csv(path)
+    reader.close()
+    as_text = {f.name: pa.string() for f in reader.schema if pa.types.is_temporal(f.type)}
+    return pcsv.ConvertOptions(column_types=as_text)
+
+
+@dataclass
+class CsvColumnarCache:
+    """
+    On-disk cache of CSV files converted to Arrow IPC, keyed by path, mtime and size.
+
+    Cached files are memory-mapped on read. When the directory grows past
+    `max_bytes`, the least recently used files are evicted.
+    """
+    directory: str
+    max_bytes: int = 2 * 1024**3
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _entry(self, path: str) -> Path:
+        st = os.stat(path)
+        key = f"{os.path.abspath(path)}|{st.st_mtime_ns}|{st.st_size}"
+        return Path(self.directory) / (hashlib.sha256(key.encode()).hexdigest() + ".arrow")
+
+    def _convert(self, path: str, target: Path) -> None:
+        tmp = target.with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        try:
+            try:
+                reader = pcsv.open_csv(path, convert_options=_csv_convert_options(path))
+                with pa.ipc.new_file(str(tmp), reader.schema) as writer:
+                    for batch in reader:
+                        writer.write_batch(batch)
+            except pa.ArrowInvalid:
+                # Types inferred from the first block did not hold for the whole file
+                table = pa.Table.from_pandas(pd.read_csv(path), preserve_index=False)
+                with pa.ipc.new_file(str(tmp), table.schema) as writer:
+                    writer.write_table(table)
+            os.replace(tmp, target)
+        finally:
+            tmp.unlink(missing_ok=True)
+
+    def path_for(self, path: str) -> Path:
+        """
+        Return the cached Arrow file for `path`, converting the CSV on first use.
+        """
+        target = self._entry(path)
+        if target.exists():
+            os.utime(target)  # mark as recently used
+            return target
+        Path(self.directory).mkdir(parents=True, exist_ok=True)
+        self._convert(path, target)
+        self.evict(keep=target)
+        return target
+
+    def dataset(self, path: str) -> ds.Dataset:
+        return ds.dataset(
+            str(self.path_for(path)),
+            format="ipc",
+            filesystem=pafs.LocalFileSystem(use_mmap=True),
+        )
+
+    def evict(self, keep: Path | None = None) -> None:
+        with self._lock:
+            entries = []
+            for p in Path(self.directory).glob("*.arrow"):
+                try:
+                    st = p.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, p))
+            total = sum(size for _, size, _ in entries)
+            for _, size, p in sorted(entries, key=lambda e: e[0]):
+                if total <= self.max_bytes:
+                    break
+                if p == keep:
+                    continue
+                p.unlink(missing_ok=True)
+                total -= size
+
+
+csv_cache: CsvColumnarCache | None = (
+    CsvColumnarCache(settings.csv_cache_dir, settings.csv_cache_max_bytes)
+    if settings.csv_cache_dir and pa is not None
+    else None
+)
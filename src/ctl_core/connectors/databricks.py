@@ -1,5 +1,7 @@
 from __future__ import annotations
+import hashlib
 from dataclasses import dataclass
+from typing import Any, Iterator
 import pandas as pd
 
 try:
@@ -7,43 +9,102 @@ try:
 except Exception:  # pragma: no cover
     dbsql = None  # type: ignore
 
-from .base import Connector, QuerySpec
+try:
+    import pyarrow as pa
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore
+
+from .base import AsyncConnector, Connector, QuerySpec
+from .engines import ConnectionPool, get_pool
+from .partitioned import read_partitioned
+from .sql_pushdown import compile_pushdown
 
 
 @dataclass
-class DatabricksConnector(Connector):
+class DatabricksConnector(Connector, AsyncConnector):
     """
     Stub connector for Databricks SQL Warehouse / Unity Catalog via databricks-sql-connector.
     You must provide hostname, http_path, and access_token (or use AAD passthrough if configured).
+    Connections are pooled per warehouse and token; results are fetched as Arrow record
+    batches of `fetch_rows` rows when pyarrow is available.
     """
     server_hostname: str
     http_path: str
     access_token: str
     table: str
     name: str = "databricks"
+    fetch_rows: int = 100_000
 
-    def query(self, spec: QuerySpec) -> pd.DataFrame:
+    @property
+    def dialect(self) -> str:
+        return "databricks"
+
+    def _pool(self) -> ConnectionPool:
         if dbsql is None:
             raise RuntimeError(
                 "databricks-sql-connector not installed. Install with 'pip install .[databricks]'"
             )
-        cols = ", ".join(spec.select) if spec.select else "*"
-        where_clause = ""
-        params = {}
-        if spec.where:
-            pairs = []
-            for k, v in spec.where.items():
-                pairs.append(f"{k} = '{v}'")
-            where_clause = " WHERE " + " AND ".join(pairs)
-        limit_clause = f" LIMIT {spec.limit}" if spec.limit else ""
-        query = f"SELECT {cols} FROM {self.table}{where_clause}{limit_clause}"
-        with dbsql.connect(
-            server_hostname=self.server_hostname,
-            http_path=self.http_path,
-            access_token=self.access_token,
-        ) as conn:
+        # The token only enters the key as a hash, so pool stats never show it
+        token = hashlib.sha256(self.access_token.encode("utf-8")).hexdigest()[:12]
+        key = f"databricks://{self.server_hostname}{self.http_path}#{token}"
+        return get_pool(
+            key,
+            lambda: dbsql.connect(
+                server_hostname=self.server_hostname,
+                http_path=self.http_path,
+                access_token=self.access_token,
+            ),
+        )
+
+    def iter_arrow(
+        self, sql: str, params: dict[str, Any], rows: int | None = None
+    ) -> Iterator["pa.Table"]:
+        """
+        Run `sql` and yield the result as Arrow tables of up to `rows` (default
+        `fetch_rows`) rows. At least one (possibly empty) table is yielded, so the
+        schema is always known.
+        """
+        rows = rows or self.fetch_rows
+        with self._pool().connection() as conn:
             with conn.cursor() as cursor:
-                cursor.execute(query, params)
-                rows = cursor.fetchall()
-                cols_out = [c[0] for c in cursor.description]
-        return pd.DataFrame(rows, columns=cols_out)
\ No newline at end of file
+                # Native named parameters (:p0) need databricks-sql-connector 3.x
+                cursor.execute(sql, params)
+                batch = cursor.fetchmany_arrow(rows)
+                yield batch
+                while batch.num_rows:
+                    batch = cursor.fetchmany_arrow(rows)
+                    if batch.num_rows:
+                        yield batch
+
+    def _fetch(self, sql: str, params: dict[str, Any]) -> pd.DataFrame:
+        if pa is None:
+            with self._pool().connection() as conn:
+                with conn.cursor() as cursor:
+                    cursor.execute(sql, params)
+                    rows = cursor.fetchall()
+                    cols_out = [c[0] for c in cursor.description]
+            return pd.DataFrame(rows, columns=cols_out)
+        # Batches stay columnar and are converted to pandas once
+        return pa.concat_tables(self.iter_arrow(sql, params)).to_pandas()
+
+    def query(self, spec: QuerySpec) -> pd.DataFrame:
+        if spec.partition is not None:
+            return read_partitioned("databricks", self.table, spec, self._fetch)
+        sql, params, _ = compile_pushdown("databricks", self.table, spec, [])
+        return self._fetch(sql, params)
+
+    def query_iter(self, spec: QuerySpec, chunk_rows: int = 65536) -> Iterator[pd.DataFrame]:
+        if pa is None or spec.partition is not None:
+            yield from Connector.query_iter(self, spec, chunk_rows)
+            return
+        sql, params, _ = compile_pushdown("databricks", self.table, spec, [])
+        for batch in self.iter_arrow(sql, params, chunk_rows):
+            yield batch.to_pandas()
+
+    def query_pushdown(self, spec: QuerySpec, steps: list) -> tuple[pd.DataFrame, int]:
+        """
+        Query with the leading pushable transform steps computed by the warehouse.
+        Returns the frame and how many of `steps` it already reflects.
+        """
+        sql, params, pushed = compile_pushdown("databricks", self.table, spec, steps)
+        return self._fetch(sql, params), pushed
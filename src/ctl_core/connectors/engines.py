@@ -0,0 +1,237 @@
+from __future__ import annotations
+import asyncio
+import importlib.util
+import logging
+import threading
+import weakref
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+try:
+    from sqlalchemy import create_engine
+    from sqlalchemy.engine import Engine, make_url
+except Exception:  # pragma: no cover
+    create_engine = None  # type: ignore
+    Engine = Any  # type: ignore
+
+try:
+    from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+except Exception:  # pragma: no cover
+    create_async_engine = None  # type: ignore
+    AsyncEngine = Any  # type: ignore
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+# Process-wide SQLAlchemy engines keyed by URL. The API, MCP server and CLI all
+# build connectors per call, so the engine (and its connection pool) lives here.
+_engines: dict[str, Engine] = {}
+_lock = threading.Lock()
+
+
+def _pool_kwargs(url: str) -> dict[str, Any]:
+    kwargs: dict[str, Any] = {
+        "pool_pre_ping": settings.sql_pool_pre_ping,
+        "pool_recycle": settings.sql_pool_recycle,
+    }
+    # SQLite in-memory databases use a singleton pool without overflow support
+    u = make_url(url)
+    if u.get_backend_name() == "sqlite" and u.database in (None, "", ":memory:"):
+        return kwargs
+    kwargs["pool_size"] = settings.sql_pool_size
+    kwargs["max_overflow"] = settings.sql_max_overflow
+    return kwargs
+
+
+def get_engine(url: str) -> Engine:
+    """
+    Return the shared engine for `url`, creating it on first use.
+    """
+    if create_engine is None:
+        raise RuntimeError("SQLAlchemy not installed. Install with 'pip install .[sql]'")
+    engine = _engines.get(url)
+    if engine is not None:
+        return engine
+    with _lock:
+        engine = _engines.get(url)
+        if engine is None:
+            engine = create_engine(url, **_pool_kwargs(url))
+            _engines[url] = engine
+    return engine
+
+
+# Native asyncio drivers by backend, and the sync drivers whose URLs they accept as-is
+_ASYNC_DRIVERS = {
+    "mysql": ("aiomysql", {"pymysql", "mysqldb", "aiomysql"}),
+    "mariadb": ("aiomysql", {"pymysql", "mysqldb", "aiomysql"}),
+    "mssql": ("aioodbc", {"pyodbc", "aioodbc"}),
+    "sqlite": ("aiosqlite", {"pysqlite", "aiosqlite"}),
+}
+
+
+def async_url(url: str) -> str | None:
+    """
+    The asyncio-driver equivalent of `url`, or None when the backend has no supported
+    async driver, the driver is not installed or async drivers are disabled.
+    """
+    if create_async_engine is None or not settings.sql_async:
+        return None
+    u = make_url(url)
+    driver, compatible = _ASYNC_DRIVERS.get(u.get_backend_name(), (None, set()))
+    if driver is None or u.get_driver_name() not in compatible:
+        return None
+    if importlib.util.find_spec(driver) is None or importlib.util.find_spec("greenlet") is None:
+        return None
+    return u.set(drivername=f"{u.get_backend_name()}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+# Async engines are bound to the event loop that created them, so they are kept per loop
+_async_engines: weakref.WeakKeyDictionary[
+    asyncio.AbstractEventLoop, dict[str, AsyncEngine]
+] = weakref.WeakKeyDictionary()
+
+
+def get_async_engine(url: str) -> AsyncEngine | None:
+    """
+    Return the shared asyncio engine for `url` on the running event loop, creating it
+    on first use, or None if `url` has no native async driver (see `async_url`).
+    """
+    aurl = async_url(url)
+    if aurl is None:
+        return None
+    engines = _async_engines.setdefault(asyncio.get_running_loop(), {})
+    engine = engines.get(url)
+    if engine is None:
+        engine = create_async_engine(aurl, **_pool_kwargs(aurl))
+        engines[url] = engine
+    return engine
+
+
+@dataclass
+class ConnectionPool:
+    """
+    Minimal pool for DB-API clients without a SQLAlchemy dialect (e.g. databricks-sql).
+    Idle connections are reused; ones that raised during use are closed instead.
+    """
+    connect: Callable[[], Any]
+    size: int = 5
+    _idle: list[Any] = field(default_factory=list, init=False, repr=False)
+    _checked_out: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        conn = None
+        with self._lock:
+            while self._idle and conn is None:
+                candidate = self._idle.pop()
+                if getattr(candidate, "open", True):
+                    conn = candidate
+            self._checked_out += 1
+        try:
+            if conn is None:
+                conn = self.connect()
+            yield conn
+        except BaseException:
+            with self._lock:
+                self._checked_out -= 1
+            if conn is not None:
+                _close(conn)
+            raise
+        with self._lock:
+            self._checked_out -= 1
+            if len(self._idle) < self.size:
+                self._idle.append(conn)
+                return
+        _close(conn)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "size": self.size,
+                "checkedin": len(self._idle),
+                "checkedout": self._checked_out,
+            }
+
+    def dispose(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            _close(conn)
+
+
+def _close(conn: Any) -> None:
+    # Driver errors vary; a connection that fails to close is dropped all the same
+    try:
+        conn.close()
+    except Exception:
+        logger.debug("Closing a pooled connection failed", exc_info=True)
+
+
+_pools: dict[str, ConnectionPool] = {}
+
+
+def get_pool(key: str, connect: Callable[[], Any]) -> ConnectionPool:
+    """
+    Return the shared pool for `key` (which must not contain secrets), creating it
+    with `connect` on first use.
+    """
+    with _lock:
+        pool = _pools.get(key)
+        if pool is None:
+            pool = ConnectionPool(connect, size=settings.sql_pool_size)
+            _pools[key] = pool
+    return pool
+
+
+def _redact(url: str) -> str:
+    return make_url(url).render_as_string(hide_password=True)
+
+
+def pool_stats() -> list[dict[str, Any]]:
+    """
+    Connection pool statistics for every engine created in this process.
+    """
+    stats = []
+    engines = [(url, engine) for url, engine in list(_engines.items())]
+    for loop_engines in list(_async_engines.values()):
+        engines += [(url, engine.sync_engine) for url, engine in list(loop_engines.items())]
+    for url, engine in engines:
+        pool = engine.pool
+        entry: dict[str, Any] = {"url": _redact(url), "pool": type(pool).__name__}
+        for attr in ("size", "checkedin", "checkedout", "overflow"):
+            fn = getattr(pool, attr, None)
+            if callable(fn):
+                entry[attr] = fn()
+        stats.append(entry)
+    for key, cpool in list(_pools.items()):
+        stats.append({"url": key, "pool": type(cpool).__name__, **cpool.stats()})
+    return stats
+
+
+def dispose_engines() -> None:
+    """
+    Close all pooled connections and forget the engines.
+    """
+    with _lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        pools = list(_pools.values())
+        _pools.clear()
+    for pool in pools:
+        pool.dispose()
+
+
+async def dispose_async_engines() -> None:
+    """
+    Close the pooled connections of the async engines on the running event loop.
+    """
+    engines = _async_engines.pop(asyncio.get_running_loop(), {})
+    for engine in engines.values():
+        await engine.dispose()
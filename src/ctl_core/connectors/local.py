@@ -1,18 +1,147 @@
 from __future__ import annotations
 from dataclasses import dataclass
+from typing import Any, Iterator
 import pandas as pd
-from .base import Connector, QuerySpec
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+except Exception:  # pragma: no cover
+    ds = None  # type: ignore
+
+from ..frames import equals_mask
+from .base import AsyncConnector, Connector, QuerySpec
+from .csv_cache import csv_cache
+
+
+def _literal(value: Any, type_: pa.DataType) -> pc.Expression | None:
+    """
+    Coerce a filter value to the column type so the predicate can use Parquet statistics.
+    Values that cannot be coerced match nothing, as an equality test in pandas would.
+    """
+    try:
+        return pc.scalar(pa.scalar(value).cast(type_))
+    except (pa.ArrowInvalid, pa.ArrowNotImplementedError, pa.ArrowTypeError, TypeError):
+        return None
+
+
+def arrow_filter(schema: pa.Schema, where: dict[str, Any] | None) -> pc.Expression | None:
+    """
+    Translate QuerySpec.where equality filters into a pyarrow dataset expression.
+    Keys that are not columns of the file are ignored.
+    """
+    expr = None
+    for k, v in (where or {}).items():
+        if k not in schema.names:
+            continue
+        lit = _literal(v, schema.field(k).type)
+        term = pc.scalar(False) if lit is None else pc.field(k) == lit
+        expr = term if expr is None else expr & term
+    return expr
+
+
+def _scanner(dataset: ds.Dataset, spec: QuerySpec, **kwargs: Any) -> ds.Scanner:
+    names = dataset.schema.names
+    columns = [c for c in spec.select if c in names] if spec.select else names
+    return dataset.scanner(
+        columns=columns, filter=arrow_filter(dataset.schema, spec.where), **kwargs
+    )
+
+
+def scan_dataset(dataset: ds.Dataset, spec: QuerySpec) -> pd.DataFrame:
+    """
+    Scan with projection and predicate pushdown; a limit stops the scan early.
+    """
+    scanner = _scanner(dataset, spec)
+    table = scanner.head(spec.limit) if spec.limit else scanner.to_table()
+    return table.to_pandas()
+
+
+def iter_dataset(dataset: ds.Dataset, spec: QuerySpec, chunk_rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Like `scan_dataset`, yielding record batches of at most `chunk_rows` rows as they are read.
+    """
+    scanner = _scanner(dataset, spec, batch_size=chunk_rows)
+    remaining = spec.limit or None
+    empty = True
+    for batch in scanner.to_batches():
+        if batch.num_rows == 0:
+            continue
+        if remaining is not None:
+            batch = batch.slice(0, remaining)
+            remaining -= batch.num_rows
+        empty = False
+        yield batch.to_pandas()
+        if remaining == 0:
+            break
+    if empty:
+        yield scanner.projected_schema.empty_table().to_pandas()
 
 
 @dataclass
-class LocalConnector(Connector):
+class LocalConnector(Connector, AsyncConnector):
     """
     Reads CSV or Parquet from local filesystem.
+    Parquet reads push `select` and `where` into the scan when pyarrow is available.
+    CSV files are served from the columnar cache when CTL_CSV_CACHE_DIR is set (and
+    `use_cache` is true); otherwise they are scanned `chunk_rows` rows at a time
+    (None reads the whole file). Async reads advance the same scans in worker threads,
+    one chunk at a time.
     """
     path: str
     name: str = "local"
+    chunk_rows: int | None = 100_000
+    use_cache: bool = True
+
+    def _iter_csv(self, spec: QuerySpec, chunk_rows: int) -> Iterator[pd.DataFrame]:
+        header = list(pd.read_csv(self.path, nrows=0).columns)
+        wanted = [c for c in spec.select if c in header] if spec.select else header
+        filters = {k: v for k, v in (spec.where or {}).items() if k in header}
+        usecols = [c for c in header if c in wanted or c in filters]
+
+        empty = pd.DataFrame(columns=wanted)
+        remaining = spec.limit or None
+        with pd.read_csv(self.path, usecols=usecols, chunksize=chunk_rows) as reader:
+            for chunk in reader:
+                for k, v in filters.items():
+                    chunk = chunk[equals_mask(chunk[k], v)]
+                if remaining is not None:
+                    chunk = chunk.head(remaining)
+                    remaining -= len(chunk)
+                if len(chunk):
+                    yield chunk[wanted]
+                    empty = None
+                elif empty is not None:
+                    # Keep a typed empty chunk in case nothing matches
+                    empty = chunk[wanted]
+                if remaining == 0:
+                    break
+        if empty is not None:
+            yield empty
+
+    def _scan_csv(self, spec: QuerySpec) -> pd.DataFrame:
+        return pd.concat(list(self._iter_csv(spec, self.chunk_rows)), ignore_index=True)
+
+    def query_iter(self, spec: QuerySpec, chunk_rows: int = 65536) -> Iterator[pd.DataFrame]:
+        if self.path.endswith(".parquet") and ds is not None:
+            yield from iter_dataset(ds.dataset(self.path, format="parquet"), spec, chunk_rows)
+        elif self.path.endswith(".csv") and self.use_cache and csv_cache is not None:
+            yield from iter_dataset(csv_cache.dataset(self.path), spec, chunk_rows)
+        elif self.path.endswith(".csv"):
+            yield from self._iter_csv(spec, chunk_rows)
+        else:
+            yield from Connector.query_iter(self, spec, chunk_rows)
 
     def query(self, spec: QuerySpec) -> pd.DataFrame:
+        if self.path.endswith(".parquet") and ds is not None:
+            df = scan_dataset(ds.dataset(self.path, format="parquet"), spec)
+            return df.reset_index(drop=True)
+        if self.path.endswith(".csv") and self.use_cache and csv_cache is not None:
+            return scan_dataset(csv_cache.dataset(self.path), spec).reset_index(drop=True)
+        if self.path.endswith(".csv") and self.chunk_rows:
+            return self._scan_csv(spec)
+
         if self.path.endswith(".csv"):
             df = pd.read_csv(self.path)
         elif self.path.endswith(".parquet"):
@@ -20,16 +149,16 @@ class LocalConnector(Connector):
         else:
             raise ValueError("Unsupported file type. Use .csv or .parquet")
 
-        if spec.select:
-            cols = [c for c in spec.select if c in df.columns]
-            df = df[cols]
-
         if spec.where:
             for k, v in spec.where.items():
                 if k not in df.columns:
                     continue
-                df = df[df[k] == v]
+                df = df[equals_mask(df[k], v)]
+
+        if spec.select:
+            cols = [c for c in spec.select if c in df.columns]
+            df = df[cols]
 
         if spec.limit:
             df = df.head(spec.limit)
-        return df.reset_index(drop=True)
\ No newline at end of file
+        return df.reset_index(drop=True)
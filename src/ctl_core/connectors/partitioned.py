@@ -0,0 +1,78 @@
+from __future__ import annotations
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable
+
+import numpy as np
+import pandas as pd
+
+from ..config import settings
+from .base import QuerySpec
+from .sql_pushdown import compile_bounds, compile_partitions
+
+# Runs one SQL statement with bind params and returns the rows
+Fetch = Callable[[str, dict[str, Any]], pd.DataFrame]
+
+# Formats for string date bounds, by length, so boundaries compare like the stored values
+_DATE_FORMATS = {7: "%Y-%m", 10: "%Y-%m-%d", 19: "%Y-%m-%d %H:%M:%S"}
+
+
+def split_range(lower: Any, upper: Any, n: int) -> list[Any]:
+    """
+    The `n - 1` ascending inner boundaries that cut [lower, upper] into `n` equal ranges.
+    Integers, floats, dates/datetimes and ISO date strings are supported.
+    """
+    if n <= 1 or lower is None or upper is None or not lower < upper:
+        return []
+    if isinstance(lower, (int, np.integer)) and not isinstance(lower, bool):
+        cuts = np.linspace(int(lower), int(upper), n + 1)[1:-1]
+        return sorted({int(np.ceil(c)) for c in cuts} - {int(lower)})
+    if isinstance(lower, (float, np.floating)):
+        return [float(c) for c in np.linspace(float(lower), float(upper), n + 1)[1:-1]]
+
+    lo, hi = pd.Timestamp(lower), pd.Timestamp(upper)
+    cuts = pd.to_datetime(np.linspace(lo.value, hi.value, n + 1)[1:-1].astype("int64"))
+    if isinstance(lower, str):
+        fmt = _DATE_FORMATS.get(len(lower), "%Y-%m-%dT%H:%M:%S")
+        out = [c.strftime(fmt) for c in cuts]
+    elif isinstance(lower, dt.datetime):
+        out = [c.to_pydatetime() for c in cuts]
+    elif isinstance(lower, dt.date):
+        out = [c.date() for c in cuts]
+    else:
+        out = list(cuts)
+    # Coarse formats can map several cuts to one value
+    return sorted({c for c in out if lower < c <= upper})
+
+
+def read_partitioned(
+    dialect: str, table: str, spec: QuerySpec, fetch: Fetch, workers: int | None = None
+) -> pd.DataFrame:
+    """
+    Read `spec` as concurrent range queries on `spec.partition.column` and concatenate
+    the parts in range order. A `limit` applies per range and again to the result.
+    """
+    part = spec.partition
+    lower, upper = part.lower, part.upper
+    if lower is None or upper is None:
+        bounds = fetch(*compile_bounds(dialect, table, spec))
+        if len(bounds):
+            lower = bounds.iloc[0, 0] if lower is None else lower
+            upper = bounds.iloc[0, 1] if upper is None else upper
+    # Values from the database may come back as numpy scalars
+    lower, upper = (v.item() if isinstance(v, np.generic) else v for v in (lower, upper))
+    boundaries = split_range(lower, upper, part.num_partitions)
+    queries = compile_partitions(dialect, table, spec, boundaries)
+
+    # One connection per range, up to what the pool holds without overflow
+    workers = min(len(queries), workers or settings.sql_pool_size)
+    if workers <= 1:
+        parts = [fetch(sql, params) for sql, params in queries]
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ctl-partition") as pool:
+            parts = list(pool.map(lambda q: fetch(*q), queries))
+    # Empty ranges carry no dtypes worth keeping
+    df = pd.concat([p for p in parts if len(p)] or parts[:1], ignore_index=True)
+    if spec.limit:
+        df = df.head(spec.limit)
+    return df
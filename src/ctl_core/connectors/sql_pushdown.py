@@ -0,0 +1,240 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Callable
+import pandas as pd
+
+try:
+    from sqlalchemy import text
+except Exception:  # pragma: no cover
+    text = None  # type: ignore
+
+from .base import QuerySpec
+from .engines import get_engine
+
+
+@dataclass(frozen=True)
+class SqlDialect:
+    name: str
+    quote: tuple[str, str]
+    float_type: str
+    top: bool = False
+
+    def ident(self, name: str) -> str:
+        open_, close = self.quote
+        return f"{open_}{name.replace(close, close * 2)}{close}"
+
+
+DIALECTS: dict[str, SqlDialect] = {
+    "mssql": SqlDialect("mssql", ("[", "]"), "FLOAT", top=True),
+    "mysql": SqlDialect("mysql", ("`", "`"), "DOUBLE"),
+    "databricks": SqlDialect("databricks", ("`", "`"), "DOUBLE"),
+    "sqlite": SqlDialect("sqlite", ('"', '"'), "REAL"),
+}
+# SQLAlchemy backend names that share a dialect
+DIALECTS["mariadb"] = DIALECTS["mysql"]
+
+# Transforms that compile to window functions
+PUSHABLE = ("moving_average", "normalize", "filter")
+
+
+def _as_list(value: Any) -> list[str]:
+    if not value:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+
+def _table(dialect: SqlDialect, table: str) -> str:
+    # Tables may be schema/catalog qualified
+    return ".".join(dialect.ident(part) for part in table.split("."))
+
+
+@dataclass
+class _Query:
+    sql: str
+    params: dict[str, Any]
+    # Output columns, or None when the source was SELECT *
+    columns: list[str] | None
+    depth: int = 0
+
+    def bind(self, value: Any) -> str:
+        name = f"p{len(self.params)}"
+        self.params[name] = value
+        return f":{name}"
+
+
+def _base(
+    dialect: SqlDialect, table: str, spec: QuerySpec, rng: tuple[Any, Any] | None = None
+) -> _Query:
+    q = _Query("", {}, list(spec.select) if spec.select else None)
+    cols = ", ".join(dialect.ident(c) for c in spec.select) if spec.select else "*"
+    parts = [f"{dialect.ident(k)} = {q.bind(v)}" for k, v in (spec.where or {}).items()]
+    if rng is not None:
+        parts.append(_range(dialect, q, spec.partition.column, *rng))
+    where = " WHERE " + " AND ".join(parts) if parts else ""
+    top = f"TOP {int(spec.limit)} " if spec.limit and dialect.top else ""
+    limit = f" LIMIT {int(spec.limit)}" if spec.limit and not dialect.top else ""
+    q.sql = f"SELECT {top}{cols} FROM {_table(dialect, table)}{where}{limit}"
+    return q
+
+
+def _range(dialect: SqlDialect, q: _Query, column: str, lo: Any, hi: Any) -> str:
+    # [lo, hi); an open lower end also takes the NULLs
+    col = dialect.ident(column)
+    if lo is None and hi is None:
+        return "1 = 1"
+    if lo is None:
+        return f"({col} < {q.bind(hi)} OR {col} IS NULL)"
+    if hi is None:
+        return f"{col} >= {q.bind(lo)}"
+    return f"{col} >= {q.bind(lo)} AND {col} < {q.bind(hi)}"
+
+
+def _wrap(q: _Query, select: str, where: str = "") -> None:
+    alias = f"t{q.depth}"
+    q.sql = f"SELECT {select} FROM ({q.sql}) AS {alias}{where}"
+    q.depth += 1
+
+
+def _over(dialect: SqlDialect, keys: list[str], order: list[str], frame: str = "") -> str:
+    parts = []
+    if keys:
+        parts.append("PARTITION BY " + ", ".join(dialect.ident(k) for k in keys))
+    if order:
+        parts.append("ORDER BY " + ", ".join(dialect.ident(c) for c in order))
+    if frame:
+        parts.append(frame)
+    return f"OVER ({' '.join(parts)})"
+
+
+def _push_step(dialect: SqlDialect, q: _Query, name: str, params: dict[str, Any]) -> bool:
+    """
+    Wrap `q` in a query computing one step; False when the step cannot be pushed.
+    """
+    if name not in PUSHABLE:
+        return False
+    keys = _as_list(params.get("group_by"))
+    f = dialect.float_type
+
+    if name == "filter":
+        parts = []
+        for k, v in (params.get("where") or {}).items():
+            values = v if isinstance(v, list) else [v]
+            if not values or any(not isinstance(x, (str, int, float, bool)) for x in values):
+                return False
+            parts.append(f"{dialect.ident(k)} IN ({', '.join(q.bind(x) for x in values)})")
+        _wrap(q, "*", " WHERE " + " AND ".join(parts) if parts else "")
+        return True
+
+    if name == "moving_average":
+        # Window frames need a defined row order
+        order = _as_list(params.get("order_by"))
+        window = int(params.get("window", 3))
+        if not order or window < 1:
+            return False
+        frame = f"ROWS BETWEEN {window - 1} PRECEDING AND CURRENT ROW"
+        over = _over(dialect, keys, order, frame)
+        outputs = {
+            f"{c}_ma{window}": f"AVG(CAST({dialect.ident(c)} AS {f})) {over}"
+            for c in _as_list(params.get("column"))
+            if q.columns is None or c in q.columns
+        }
+    else:
+        # Replacing columns in place needs the full column list
+        if q.columns is None:
+            return False
+        over = _over(dialect, keys, [])
+        outputs = {}
+        for c in _as_list(params.get("columns")):
+            if c not in q.columns:
+                continue
+            x = f"CAST({dialect.ident(c)} AS {f})"
+            lo, hi = f"MIN({x}) {over}", f"MAX({x}) {over}"
+            # A constant series maps to 0, as in the pandas transform
+            outputs[c] = (
+                f"CASE WHEN {hi} = {lo} THEN {x} - {lo} ELSE ({x} - {lo}) / ({hi} - {lo}) END"
+            )
+
+    if q.columns is None:
+        # MySQL only accepts a qualified * next to other select items
+        parts = [f"t{q.depth}.*"] + [f"{e} AS {dialect.ident(a)}" for a, e in outputs.items()]
+    else:
+        # Replaced columns keep their position, new ones go last
+        parts = [
+            f"{outputs[c]} AS {dialect.ident(c)}" if c in outputs else dialect.ident(c)
+            for c in q.columns
+        ]
+        parts += [f"{e} AS {dialect.ident(a)}" for a, e in outputs.items() if a not in q.columns]
+        q.columns = q.columns + [a for a in outputs if a not in q.columns]
+    _wrap(q, ", ".join(parts))
+    return True
+
+
+def compile_partitions(
+    dialect: str, table: str, spec: QuerySpec, boundaries: list[Any]
+) -> list[tuple[str, dict[str, Any]]]:
+    """
+    One (sql, params) per range between consecutive `boundaries`, in ascending order.
+    Each keeps `spec`'s select, where and limit.
+    """
+    d = DIALECTS[dialect]
+    edges = [None, *boundaries, None]
+    queries = []
+    for lo, hi in zip(edges[:-1], edges[1:]):
+        q = _base(d, table, spec, (lo, hi))
+        queries.append((q.sql, q.params))
+    return queries
+
+
+def compile_bounds(dialect: str, table: str, spec: QuerySpec) -> tuple[str, dict[str, Any]]:
+    """
+    SQL for the MIN and MAX of the partition column under `spec.where`.
+    """
+    d = DIALECTS[dialect]
+    q = _Query("", {}, None)
+    col = d.ident(spec.partition.column)
+    parts = [f"{d.ident(k)} = {q.bind(v)}" for k, v in (spec.where or {}).items()]
+    where = " WHERE " + " AND ".join(parts) if parts else ""
+    q.sql = f"SELECT MIN({col}) AS lo, MAX({col}) AS hi FROM {_table(d, table)}{where}"
+    return q.sql, q.params
+
+
+def compile_pushdown(
+    dialect: str, table: str, spec: QuerySpec, steps: list[tuple[str, dict[str, Any]]]
+) -> tuple[str, dict[str, Any], int]:
+    """
+    SQL for `spec` plus the longest prefix of `steps` that compiles to window functions,
+    as (sql, bind params, number of steps pushed). Remaining steps run in pandas.
+    """
+    d = DIALECTS[dialect]
+    q = _base(d, table, spec)
+    pushed = 0
+    for name, params in steps:
+        if not _push_step(d, q, name, params):
+            break
+        pushed += 1
+    return q.sql, q.params, pushed
+
+
+def engine_fetch(url: str) -> Callable[[str, dict[str, Any]], pd.DataFrame]:
+    """
+    A function running SQL with bind params on a pooled connection of `url`'s engine.
+    """
+    def fetch(sql: str, params: dict[str, Any]) -> pd.DataFrame:
+        with get_engine(url).connect() as conn:
+            return pd.read_sql(text(sql), conn, params=params)
+
+    return fetch
+
+
+def read_pushdown(
+    url: str, table: str, spec: QuerySpec, steps: list[tuple[str, dict[str, Any]]]
+) -> tuple[pd.DataFrame, int] | None:
+    """
+    Run `spec` with pushable leading `steps` on the pooled engine for `url`. Returns the
+    frame and the number of steps already applied, or None for unsupported dialects.
+    """
+    engine = get_engine(url)
+    if engine.dialect.name not in DIALECTS:
+        return None
+    sql, params, pushed = compile_pushdown(engine.dialect.name, table, spec, steps)
+    return engine_fetch(url)(sql, params), pushed
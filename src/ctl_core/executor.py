@@ -0,0 +1,167 @@
+from __future__ import annotations
+import asyncio
+import functools
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Iterator, TypeVar
+
+from .config import settings
+
+T = TypeVar("T")
+
+
+class Overloaded(RuntimeError):
+    """
+    Raised when a lane's queue (scope="lane") or the whole pool (scope="pool") is full.
+    """
+
+    def __init__(self, lane: str, scope: str):
+        super().__init__(f"Too much pending work for '{lane}' ({scope} queue full)")
+        self.lane = lane
+        self.scope = scope
+
+
+@dataclass
+class _Lane:
+    executor: ThreadPoolExecutor
+    concurrency: int
+    queue_depth: int
+    pending: int = 0
+
+
+def parse_limits(spec: str) -> dict[str, int]:
+    """
+    Parse "query=8,transform=2" into {"query": 8, "transform": 2}.
+    """
+    limits: dict[str, int] = {}
+    for pair in filter(None, (p.strip() for p in spec.split(","))):
+        k, v = pair.split("=", 1)
+        limits[k.strip()] = int(v)
+    return limits
+
+
+def _close(items: Iterator[Any], step: Future | None) -> None:
+    # A step abandoned by a cancelled caller may still be running; let it finish first
+    if step is not None:
+        wait([step])
+    close = getattr(items, "close", None)
+    if close is not None:
+        close()
+
+
+@dataclass
+class WorkPool:
+    """
+    Runs blocking connector/transform work on bounded worker threads.
+
+    Work is grouped into named lanes (an API endpoint, a connector, ...). Each lane
+    runs at most `concurrency` jobs at once and queues up to `queue_depth` more;
+    beyond that, or beyond `max_pending` jobs across all lanes, `run` raises
+    `Overloaded` instead of queueing without bound.
+    """
+    concurrency: int = 4
+    queue_depth: int = 16
+    max_pending: int = 64
+    limits: dict[str, int] = field(default_factory=dict)
+    _lanes: dict[str, _Lane] = field(default_factory=dict, init=False, repr=False)
+    _pending: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _lane(self, name: str) -> _Lane:
+        lane = self._lanes.get(name)
+        if lane is None:
+            n = self.limits.get(name, self.concurrency)
+            lane = _Lane(
+                executor=ThreadPoolExecutor(max_workers=n, thread_name_prefix=f"ctl-{name}"),
+                concurrency=n,
+                queue_depth=self.queue_depth,
+            )
+            self._lanes[name] = lane
+        return lane
+
+    def _release(self, lane: _Lane, _fut: Any = None) -> None:
+        with self._lock:
+            lane.pending -= 1
+            self._pending -= 1
+
+    def _admit(self, lane_name: str) -> _Lane:
+        with self._lock:
+            lane = self._lane(lane_name)
+            if lane.pending >= lane.concurrency + lane.queue_depth:
+                raise Overloaded(lane_name, "lane")
+            if self._pending >= self.max_pending:
+                raise Overloaded(lane_name, "pool")
+            lane.pending += 1
+            self._pending += 1
+        return lane
+
+    def submit(self, lane_name: str, fn: Callable[..., T], *args: Any, **kwargs: Any):
+        lane = self._admit(lane_name)
+        try:
+            fut = lane.executor.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release(lane)
+            raise
+        # Released when the thread finishes, even if the awaiting caller went away
+        fut.add_done_callback(functools.partial(self._release, lane))
+        return fut
+
+    async def run(self, lane_name: str, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await asyncio.wrap_future(self.submit(lane_name, fn, *args, **kwargs))
+
+    async def iterate(self, lane_name: str, items: Iterator[T]) -> AsyncIterator[T]:
+        """
+        Advance a blocking iterator on a lane, one job per item, and close it there.
+        The iterator takes one pending slot from its first item until it is exhausted or
+        closed, so a stream counts against the lane's limits for its whole life and
+        cannot be rejected once started.
+        """
+        lane = self._admit(lane_name)
+        done = object()
+        step = None
+        try:
+            while True:
+                step = lane.executor.submit(next, items, done)
+                item = await asyncio.wrap_future(step)
+                if item is done:
+                    return
+                yield item
+        finally:
+            try:
+                closing = lane.executor.submit(_close, items, step)
+            except BaseException:
+                self._release(lane)
+                raise
+            closing.add_done_callback(functools.partial(self._release, lane))
+            await asyncio.wrap_future(closing)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "pending": self._pending,
+                "max_pending": self.max_pending,
+                "lanes": {
+                    name: {
+                        "pending": lane.pending,
+                        "concurrency": lane.concurrency,
+                        "queue_depth": lane.queue_depth,
+                    }
+                    for name, lane in self._lanes.items()
+                },
+            }
+
+    def shutdown(self) -> None:
+        with self._lock:
+            lanes = list(self._lanes.values())
+            self._lanes.clear()
+        for lane in lanes:
+            lane.executor.shutdown(wait=False, cancel_futures=True)
+
+
+work_pool = WorkPool(
+    concurrency=settings.worker_concurrency,
+    queue_depth=settings.worker_queue_depth,
+    max_pending=settings.worker_max_pending,
+    limits=parse_limits(settings.worker_limits),
+)
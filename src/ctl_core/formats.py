@@ -0,0 +1,283 @@
+from __future__ import annotations
+import datetime as dt
+import decimal
+import json
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+
+# Output format -> media type
+MEDIA_TYPES: dict[str, str] = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+_ACCEPT_ALIASES: dict[str, str] = {
+    **{mt: fmt for fmt, mt in MEDIA_TYPES.items()},
+    "application/jsonl": "ndjson",
+    "application/x-parquet": "parquet",
+}
+
+_ARROW_FORMATS = {"arrow", "parquet"}
+
+
+def negotiate(fmt: str | None, accept: str | None) -> str:
+    """
+    Pick an output format from an explicit `format` value or an HTTP Accept header.
+    An explicit format wins; without either, or for a wildcard Accept, the format is JSON.
+    An Accept header naming only media types we do not serve raises ValueError.
+    """
+    if fmt:
+        chosen = fmt.lower()
+        if chosen not in MEDIA_TYPES:
+            raise ValueError(f"Unknown format '{fmt}'. Use one of: {', '.join(MEDIA_TYPES)}")
+    else:
+        chosen = "json"
+        ranked = []
+        for i, item in enumerate((accept or "").split(",")):
+            media, _, params = item.strip().partition(";")
+            q = 1.0
+            for p in params.split(";"):
+                k, _, v = p.strip().partition("=")
+                if k == "q":
+                    try:
+                        q = float(v)
+                    except ValueError:
+                        q = 0.0
+            ranked.append((-q, i, media.strip().lower()))
+        for neg_q, _, media in sorted(ranked):
+            if neg_q < 0 and media in _ACCEPT_ALIASES:
+                chosen = _ACCEPT_ALIASES[media]
+                break
+            if neg_q < 0 and media in ("", "*/*", "application/*"):
+                break
+        else:
+            if ranked:
+                raise ValueError(
+                    f"Cannot serve '{accept}'. Use one of: {', '.join(MEDIA_TYPES.values())}"
+                )
+    if chosen in _ARROW_FORMATS and pa is None:
+        raise ValueError(f"Format '{chosen}' needs pyarrow. Install with 'pip install .[arrow]'")
+    return chosen
+
+
+def iter_batches(df: pd.DataFrame, rows: int) -> Iterator[pd.DataFrame]:
+    """
+    Slice a DataFrame into views of at most `rows` rows (at least one, possibly empty).
+    """
+    if len(df) == 0:
+        yield df
+        return
+    for start in range(0, len(df), rows):
+        yield df.iloc[start : start + rows]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, (dt.date, dt.time)):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, decimal.Decimal):
+        return float(value)
+    return str(value)
+
+
+def _json_rows(df: pd.DataFrame) -> list[str]:
+    """
+    One JSON object per row. Floats keep their shortest round-trip repr, missing values
+    become null and dates ISO 8601 strings.
+    """
+    names = [str(c) for c in df.columns]
+    columns = []
+    for _, s in df.items():
+        values = s.tolist()
+        missing = s.isna().to_numpy()
+        if missing.any():
+            for i in np.flatnonzero(missing):
+                values[i] = None
+        columns.append(values)
+    dumps = json.JSONEncoder(default=_json_default, allow_nan=False, ensure_ascii=False,
+                             separators=(",", ":")).encode
+    return [dumps(dict(zip(names, row))) for row in zip(*columns)]
+
+
+class _Sink:
+    """
+    Minimal writable file that hands back whatever was written since the last drain.
+    """
+
+    def __init__(self):
+        self._parts: list[bytes] = []
+        self._pos = 0
+        self.closed = False
+
+    def write(self, data: Any) -> int:
+        b = bytes(data)
+        self._parts.append(b)
+        self._pos += len(b)
+        return len(b)
+
+    def tell(self) -> int:
+        return self._pos
+
+    def flush(self) -> None:
+        pass
+
+    def drain(self) -> bytes:
+        out = b"".join(self._parts)
+        self._parts.clear()
+        return out
+
+
+class _Encoder:
+    """
+    Incremental serializer: `begin`, then `write` per chunk, then `end`, each returning
+    the bytes ready to send.
+    """
+
+    def begin(self) -> bytes:
+        return b""
+
+    def write(self, chunk: pd.DataFrame) -> bytes:
+        raise NotImplementedError
+
+    def end(self) -> bytes:
+        return b""
+
+
+class _JsonEncoder(_Encoder):
+    def __init__(self):
+        self.first = True
+
+    def begin(self) -> bytes:
+        return b"["
+
+    def write(self, chunk: pd.DataFrame) -> bytes:
+        if len(chunk) == 0:
+            return b""
+        body = ",".join(_json_rows(chunk))
+        out = (b"" if self.first else b",") + body.encode("utf-8")
+        self.first = False
+        return out
+
+    def end(self) -> bytes:
+        return b"]"
+
+
+class _NdjsonEncoder(_Encoder):
+    def write(self, chunk: pd.DataFrame) -> bytes:
+        if len(chunk) == 0:
+            return b""
+        return "".join(row + "\n" for row in _json_rows(chunk)).encode("utf-8")
+
+
+class _CsvEncoder(_Encoder):
+    def __init__(self):
+        self.header = True
+
+    def write(self, chunk: pd.DataFrame) -> bytes:
+        out = chunk.to_csv(index=False, header=self.header).encode("utf-8")
+        self.header = False
+        return out
+
+
+class _ArrowEncoder(_Encoder):
+    def __init__(self, parquet: bool):
+        self.parquet = parquet
+        self.sink = _Sink()
+        self.writer = None
+        self.schema = None
+
+    def _table(self, chunk: pd.DataFrame) -> pa.Table:
+        try:
+            return pa.Table.from_pandas(chunk, schema=self.schema, preserve_index=False)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            pass
+        # Chunks infer their dtypes separately (e.g. CSV codes read as text, then as ints):
+        # cast what drifted back to the stream's schema
+        table = pa.Table.from_pandas(chunk, preserve_index=False)
+        try:
+            return table.cast(self.schema)
+        except (pa.ArrowInvalid, pa.ArrowTypeError, pa.ArrowNotImplementedError) as e:
+            raise ValueError(f"Chunk does not fit the schema of earlier chunks: {e}") from e
+
+    def write(self, chunk: pd.DataFrame) -> bytes:
+        table = self._table(chunk)
+        if self.writer is None:
+            # Later chunks are coerced to the schema of the first one
+            self.schema = table.schema
+            self.writer = (
+                pq.ParquetWriter(self.sink, self.schema)
+                if self.parquet
+                else pa.ipc.new_stream(self.sink, self.schema)
+            )
+        self.writer.write_table(table)
+        return self.sink.drain()
+
+    def end(self) -> bytes:
+        if self.writer is None:
+            return b""
+        self.writer.close()
+        return self.sink.drain()
+
+
+def _encoder(fmt: str) -> _Encoder:
+    if fmt == "json":
+        return _JsonEncoder()
+    if fmt == "ndjson":
+        return _NdjsonEncoder()
+    if fmt == "csv":
+        return _CsvEncoder()
+    if fmt in _ARROW_FORMATS:
+        if pa is None:
+            raise RuntimeError("pyarrow not installed. Install with 'pip install .[arrow]'")
+        return _ArrowEncoder(parquet=fmt == "parquet")
+    raise ValueError(f"Unknown format '{fmt}'")
+
+
+def _drive(encoder: _Encoder, chunks: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+    out = encoder.begin()
+    if out:
+        yield out
+    for chunk in chunks:
+        out = encoder.write(chunk)
+        if out:
+            yield out
+    out = encoder.end()
+    if out:
+        yield out
+
+
+def encode(chunks: Iterable[pd.DataFrame], fmt: str) -> Iterator[bytes]:
+    """
+    Serialize DataFrame chunks incrementally, yielding bytes as each chunk is encoded.
+    """
+    return _drive(_encoder(fmt), chunks)
+
+
+async def aencode(chunks: AsyncIterable[pd.DataFrame], fmt: str) -> AsyncIterator[bytes]:
+    """
+    `encode` for chunks produced by an async iterator.
+    """
+    encoder = _encoder(fmt)
+    out = encoder.begin()
+    if out:
+        yield out
+    async for chunk in chunks:
+        out = encoder.write(chunk)
+        if out:
+            yield out
+    out = encoder.end()
+    if out:
+        yield out
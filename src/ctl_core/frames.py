@@ -0,0 +1,48 @@
+from __future__ import annotations
+from typing import Any, Hashable, Iterable
+import numpy as np
+import pandas as pd
+
+
+def copy_on_write() -> bool:
+    """
+    True when pandas Copy-on-Write is active (always on from pandas 3.0).
+    """
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    return pd.get_option("mode.copy_on_write") is True
+
+
+def detach(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    A copy of `df` that callers may modify without affecting the original.
+    Under Copy-on-Write this is a cheap shallow copy.
+    """
+    return df.copy(deep=not copy_on_write())
+
+
+def frame_nbytes(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+def equals_mask(series: pd.Series, value: Any) -> pd.Series:
+    """
+    Row mask for `series == value`, coercing string values to numeric columns
+    the way the Parquet/Arrow filters do.
+    """
+    if isinstance(value, str) and pd.api.types.is_numeric_dtype(series.dtype):
+        try:
+            value = series.dtype.type(value)
+        except (TypeError, ValueError):
+            return pd.Series(False, index=series.index)
+    return series == value
+
+
+def group_positions(df: pd.DataFrame, keys: list[str]) -> Iterable[tuple[Hashable, np.ndarray]]:
+    """
+    (group label, row positions) in order of first appearance; one group when ungrouped.
+    """
+    if not keys:
+        return [(None, np.arange(len(df)))]
+    by = [df[k].reset_index(drop=True) for k in keys]
+    return df.reset_index(drop=True).groupby(by, sort=False, dropna=False).indices.items()
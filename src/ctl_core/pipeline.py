@@ -0,0 +1,214 @@
+from __future__ import annotations
+import hashlib
+import json
+import threading
+import time
+import tracemalloc
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable
+
+import pandas as pd
+
+from .config import settings
+from .frames import copy_on_write, detach, frame_nbytes
+from .registry import build_transform
+
+# A pipeline step as (transform name, params)
+Step = tuple[str, dict[str, Any]]
+
+# Steps whose output is worth a full copy to cache when pandas lacks Copy-on-Write
+expensive_steps: set[str] = {"seasonal_adjustment"}
+
+
+def fingerprint(df: pd.DataFrame) -> str | None:
+    """
+    Content hash of a DataFrame (values, index, column names and dtypes).
+    Returns None for frames pandas cannot hash, e.g. with list-valued cells.
+    """
+    h = hashlib.sha256()
+    h.update(json.dumps([[str(c), str(t)] for c, t in df.dtypes.items()]).encode("utf-8"))
+    try:
+        h.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    except TypeError:
+        return None
+    return h.hexdigest()
+
+
+def step_key(parent: str, name: str, params: dict[str, Any]) -> str:
+    raw = json.dumps([parent, name, params], sort_keys=True, default=str)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class StageCache:
+    """
+    Content-addressed LRU cache of intermediate pipeline results.
+
+    A stage is keyed by its input's fingerprint plus every (name, params) step applied
+    so far, so a repeated pipeline prefix is served from cache and only the changed
+    tail is recomputed.
+    """
+    max_bytes: int = 256 * 1024**2
+    _entries: OrderedDict[str, tuple[pd.DataFrame, int]] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _bytes: int = field(default=0, init=False, repr=False)
+    _counts: dict[str, int] = field(
+        default_factory=lambda: {"hits": 0, "misses": 0, "steps_skipped": 0},
+        init=False,
+        repr=False,
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def get(self, key: str) -> pd.DataFrame | None:
+        with self._lock:
+            hit = self._entries.get(key)
+            if hit is None:
+                return None
+            self._entries.move_to_end(key)
+            return hit[0]
+
+    def put(self, key: str, df: pd.DataFrame) -> None:
+        nbytes = frame_nbytes(df)
+        if nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[key] = (df, nbytes)
+            self._bytes += nbytes
+            while self._bytes > self.max_bytes:
+                _, (_, evicted) = self._entries.popitem(last=False)
+                self._bytes -= evicted
+
+    def record(self, skipped: int) -> None:
+        with self._lock:
+            self._counts["hits" if skipped else "misses"] += 1
+            self._counts["steps_skipped"] += skipped
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                **self._counts,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+
+@dataclass
+class StepReport:
+    """
+    Cost of one executed pipeline step; `bytes_allocated` is the peak traced
+    allocation while the step ran. Reported steps run one at a time per process, but
+    unreported work on other threads is traced too.
+    """
+    name: str
+    seconds: float
+    bytes_allocated: int
+    inplace: bool
+
+
+_trace_lock = threading.Lock()
+
+
+def _apply(
+    name: str, params: dict[str, Any], df: pd.DataFrame, owned: bool, report: list | None
+) -> pd.DataFrame:
+    transform = build_transform(name, params)
+    if report is None:
+        return transform.apply(df, inplace=owned)
+    # tracemalloc is process-wide: one reported step at a time, so concurrent reports
+    # cannot reset or stop each other's trace
+    with _trace_lock:
+        started = not tracemalloc.is_tracing()
+        if started:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        t0 = time.perf_counter()
+        try:
+            df = transform.apply(df, inplace=owned)
+        finally:
+            seconds = time.perf_counter() - t0
+            peak = tracemalloc.get_traced_memory()[1]
+            if started:
+                tracemalloc.stop()
+    report.append(StepReport(name, seconds, max(0, peak - base), owned))
+    return df
+
+
+def run_pipeline(
+    df: pd.DataFrame,
+    steps: Iterable[Step],
+    cache: StageCache | None = None,
+    owned: bool = False,
+    report: list[StepReport] | None = None,
+    on_step: Callable[[int, int, str], None] | None = None,
+) -> pd.DataFrame:
+    """
+    Apply `steps` in order, reusing the longest cached prefix of this pipeline.
+
+    Intermediate frames belong to the executor, so steps after the first modify them
+    in place instead of copying; with `owned`, the caller hands over `df` too. Under
+    Copy-on-Write every stage is cached as a shallow copy and execution continues in
+    place. Without it a cached stage can only be shared by copying, so the final stage
+    and stages after `expensive_steps` are cached (the latter as a deep copy) while the
+    other steps keep running in place. Pass a list as
+    `report` to collect a StepReport per executed step. `on_step(index, total, name)` is
+    called before each executed step; it may raise to stop the pipeline between steps.
+    """
+    steps = list(steps)
+    cache = stage_cache if cache is None else cache
+    root = fingerprint(df) if steps and cache.max_bytes > 0 else None
+    if root is None:
+        for i, (name, params) in enumerate(steps):
+            if on_step is not None:
+                on_step(i, len(steps), name)
+            df = _apply(name, params, df, owned, report)
+            owned = True
+        return df
+
+    keys = []
+    parent = root
+    for name, params in steps:
+        parent = step_key(parent, name, params)
+        keys.append(parent)
+
+    start = 0
+    for i in range(len(keys), 0, -1):
+        cached = cache.get(keys[i - 1])
+        if cached is not None:
+            df, start, owned = cached, i, False
+            break
+    cache.record(start)
+
+    cow = copy_on_write()
+    for i, ((name, params), key) in enumerate(zip(steps[start:], keys[start:]), start):
+        if on_step is not None:
+            on_step(i, len(steps), name)
+        df = _apply(name, params, df, owned, report)
+        if cow:
+            cache.put(key, detach(df))
+            owned = True
+        elif i == len(steps) - 1:
+            cache.put(key, df)
+            owned = False
+        elif name in expensive_steps:
+            # Worth a copy: pipelines that change only later steps resume from here
+            cache.put(key, df.copy())
+            owned = True
+        else:
+            owned = True
+    # Cached frames are never handed out; give the caller its own
+    return df if owned else detach(df)
+
+
+stage_cache = StageCache(max_bytes=settings.stage_cache_max_bytes)
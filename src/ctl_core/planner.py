@@ -0,0 +1,235 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Any, Iterable
+
+import pandas as pd
+
+from .pipeline import Step, run_pipeline
+
+# Steps whose output columns can be merged into a single pass
+FUSIBLE = ("normalize", "moving_average")
+
+
+def _as_list(value: Any) -> list[str]:
+    if not value:
+        return []
+    return [value] if isinstance(value, str) else list(value)
+
+
+@dataclass
+class PlanNode:
+    """
+    One physical step: a transform run once, standing for one or more logical steps.
+    `reads`/`writes` are None when the step's columns are unknown.
+    """
+    name: str
+    params: dict[str, Any]
+    sources: list[int]
+    reads: set[str] | None = None
+    writes: set[str] | None = None
+    keys: list[str] = field(default_factory=list)
+
+    @property
+    def is_filter(self) -> bool:
+        return self.name == "filter"
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "op": self.name,
+            "params": self.params,
+            "steps": self.sources,
+            "reads": sorted(self.reads) if self.reads is not None else None,
+            "writes": sorted(self.writes) if self.writes is not None else None,
+        }
+
+
+def node(index: int, name: str, params: dict[str, Any]) -> PlanNode:
+    """
+    Column footprint of a logical step, from its `column`/`columns` params.
+    """
+    keys = _as_list(params.get("group_by"))
+    n = PlanNode(name, dict(params), [index], keys=keys)
+    if name == "normalize":
+        cols = _as_list(params.get("columns"))
+        n.reads, n.writes = set(cols) | set(keys), set(cols)
+    elif name == "moving_average":
+        cols = _as_list(params.get("column"))
+        window = params.get("window", 3)
+        order = set(_as_list(params.get("order_by")))
+        n.reads, n.writes = set(cols) | set(keys) | order, {f"{c}_ma{window}" for c in cols}
+    elif name == "seasonal_adjustment":
+        cols = _as_list(params.get("column"))
+        n.reads, n.writes = set(cols) | set(keys), {f"{c}_sa" for c in cols}
+    elif name == "filter":
+        n.reads, n.writes = set(params.get("where") or {}), set()
+    return n
+
+
+def commutes(a: PlanNode, b: PlanNode) -> bool:
+    """
+    True when running `a` and `b` in either order gives the same frame.
+    """
+    if a.reads is None or b.reads is None:
+        return False
+    if a.is_filter and b.is_filter:
+        return True
+    if a.is_filter or b.is_filter:
+        f, s = (a, b) if a.is_filter else (b, a)
+        # Dropping whole series before a per-series step leaves the kept series unchanged
+        return f.reads <= set(s.keys) and not (f.reads & s.writes)
+    return not (a.writes & (b.reads | b.writes)) and not (b.writes & a.reads)
+
+
+def _fusible(a: PlanNode, b: PlanNode) -> bool:
+    if a.name != b.name or a.name not in FUSIBLE or a.keys != b.keys:
+        return False
+    if a.name == "moving_average":
+        return a.params.get("window", 3) == b.params.get("window", 3) and _as_list(
+            a.params.get("order_by")
+        ) == _as_list(b.params.get("order_by"))
+    return True
+
+
+def _fuse(into: PlanNode, other: PlanNode) -> None:
+    if into.name == "normalize":
+        into.params["columns"] = _as_list(into.params.get("columns")) + _as_list(
+            other.params.get("columns")
+        )
+    else:
+        into.params["column"] = _as_list(into.params.get("column")) + _as_list(
+            other.params.get("column")
+        )
+    into.sources += other.sources
+    into.reads |= other.reads
+    into.writes |= other.writes
+
+
+@dataclass
+class Plan:
+    """
+    Physical plan for a transform pipeline.
+    """
+    nodes: list[PlanNode]
+    where: dict[str, Any] = field(default_factory=dict)
+    eliminated: list[dict[str, Any]] = field(default_factory=list)
+    outputs: list[str] | None = None
+
+    @property
+    def steps(self) -> list[Step]:
+        return [(n.name, n.params) for n in self.nodes]
+
+    def explain(self) -> dict[str, Any]:
+        return {
+            "nodes": [n.describe() for n in self.nodes],
+            "pushed_where": self.where,
+            "eliminated": self.eliminated,
+            "outputs": self.outputs,
+        }
+
+
+def _push_filters(nodes: list[PlanNode]) -> list[PlanNode]:
+    nodes = list(nodes)
+    for i in range(len(nodes)):
+        if not nodes[i].is_filter:
+            continue
+        j = i
+        while j > 0 and not nodes[j - 1].is_filter and commutes(nodes[j - 1], nodes[j]):
+            nodes[j - 1], nodes[j] = nodes[j], nodes[j - 1]
+            j -= 1
+    return nodes
+
+
+def _fuse_steps(nodes: list[PlanNode]) -> list[PlanNode]:
+    fused: list[PlanNode] = []
+    for n in nodes:
+        for j in range(len(fused)):
+            target = fused[j]
+            # Moving `n` back to `target` must not cross a step it depends on
+            if _fusible(target, n) and all(commutes(m, n) for m in fused[j:]):
+                _fuse(target, n)
+                break
+        else:
+            fused.append(n)
+    return fused
+
+
+def _eliminate(nodes: list[PlanNode], outputs: list[str] | None) -> tuple[list, list]:
+    # Backward liveness: with no `outputs`, every column is live until overwritten
+    live = set(outputs) if outputs is not None else None
+    dead_cols: set[str] = set()
+    kept, eliminated = [], []
+    for n in reversed(nodes):
+        if n.reads is None:
+            live, dead_cols = None, set()
+            kept.append(n)
+            continue
+        needed = [
+            w for w in n.writes
+            if (w in live if live is not None else w not in dead_cols)
+        ]
+        if n.writes and not needed:
+            eliminated.append({"steps": n.sources, "op": n.name, "reason": "output unused"})
+            continue
+        kept.append(n)
+        for w in n.writes:
+            if live is not None:
+                live.discard(w)
+            else:
+                dead_cols.add(w)
+        for r in n.reads:
+            if live is not None:
+                live.add(r)
+            else:
+                dead_cols.discard(r)
+    return kept[::-1], eliminated[::-1]
+
+
+def _pushable(value: Any) -> bool:
+    return isinstance(value, (str, int, float, bool))
+
+
+def compile_plan(
+    steps: Iterable[Step],
+    outputs: list[str] | None = None,
+    where: dict[str, Any] | None = None,
+) -> Plan:
+    """
+    Compile `steps` into a physical plan.
+
+    Filters move ahead of per-series steps whose `group_by` covers the filter columns,
+    and when `where` is given (the input comes from a connector query) leading scalar
+    filters are merged into it. Independent normalize steps, and moving averages with
+    the same window and grouping, run as one pass. Steps whose outputs are overwritten
+    before use, or are not among `outputs`, are dropped first.
+    """
+    nodes = [node(i, name, params) for i, (name, params) in enumerate(steps)]
+    # Dead steps go first so they cannot hold filters back
+    nodes, eliminated = _eliminate(nodes, outputs)
+    nodes = _push_filters(nodes)
+
+    pushed: dict[str, Any] = {}
+    if where is not None:
+        pushed = dict(where)
+        while nodes and nodes[0].is_filter:
+            f = nodes[0].params.get("where") or {}
+            conflict = any(k in pushed and pushed[k] != v for k, v in f.items())
+            if conflict or not all(_pushable(v) for v in f.values()):
+                break
+            pushed.update(f)
+            nodes.pop(0)
+
+    nodes = _fuse_steps(nodes)
+    return Plan(nodes, pushed if where is not None else {}, eliminated, outputs)
+
+
+def run_plan(plan: Plan, df: pd.DataFrame, **kwargs: Any) -> pd.DataFrame:
+    """
+    Execute `plan` on `df` (keyword args go to `run_pipeline`), keeping only `outputs`.
+    """
+    df = run_pipeline(df, plan.steps, **kwargs)
+    if plan.outputs is not None:
+        missing = [c for c in plan.outputs if c not in df.columns]
+        if missing:
+            raise ValueError(f"outputs not produced by the pipeline: {missing}")
+        df = df[plan.outputs]
+    return df
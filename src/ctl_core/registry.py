@@ -8,6 +8,7 @@ from .connectors.mysql import MySqlConnector
 from .connectors.databricks import DatabricksConnector
 
 from .transforms.base import Transform
+from .transforms.filter import Filter
 from .transforms.normalize import Normalize
 from .transforms.moving_average import MovingAverage
 from .transforms.seasonal_adjustment import SeasonalAdjustment
@@ -28,6 +29,7 @@ transforms: Dict[str, TransformFactory] = {
     "normalize": lambda cfg: Normalize(**cfg),
     "moving_average": lambda cfg: MovingAverage(**cfg),
     "seasonal_adjustment": lambda cfg: SeasonalAdjustment(**cfg),
+    "filter": lambda cfg: Filter(**cfg),
 }
 
 
@@ -0,0 +1,313 @@
+from __future__ import annotations
+import copy
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Iterable, Iterator
+
+import numpy as np
+import pandas as pd
+
+from .config import settings
+from .frames import detach, group_positions
+from .pipeline import Step
+from .registry import build_transform
+from .transforms.base import group_keys
+
+
+@dataclass
+class MovingAverageState:
+    """
+    Incremental `moving_average`: keeps the trailing `window - 1` values of each column
+    and series, so appended rows get the same rolling mean a full recompute would give them.
+    """
+    column: str | list[str]
+    window: int = 3
+    group_by: str | list[str] | None = None
+    _tails: dict[tuple[str, Hashable], np.ndarray] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def fork(self) -> MovingAverageState:
+        other = copy.copy(self)
+        other._tails = dict(self._tails)
+        return other
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        out = detach(df)
+        columns = [self.column] if isinstance(self.column, str) else list(self.column)
+        columns = [c for c in columns if c in out.columns]
+        if not columns:
+            return out
+        groups = list(group_positions(out, group_keys(out, self.group_by)))
+        for c in columns:
+            values = out[c].astype(float).to_numpy()
+            result = np.empty(len(out))
+            for label, pos in groups:
+                tail = self._tails.get((c, label), np.empty(0))
+                joined = np.concatenate([tail, values[pos]])
+                rolled = pd.Series(joined).rolling(self.window, min_periods=1).mean().to_numpy()
+                result[pos] = rolled[len(tail):]
+                self._tails[(c, label)] = (
+                    joined[-(self.window - 1):] if self.window > 1 else tail[:0]
+                )
+            out[f"{c}_ma{self.window}"] = result
+        return out
+
+
+@dataclass
+class NormalizeState:
+    """
+    Incremental `normalize`: keeps the running min and max of each column and series.
+    Each appended row is scaled by the extremes seen up to and including that row;
+    rows already returned are not revised when later rows widen the range.
+    """
+    columns: list[str]
+    group_by: str | list[str] | None = None
+    _bounds: dict[tuple[str, Hashable], tuple[float, float]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def fork(self) -> NormalizeState:
+        other = copy.copy(self)
+        other._bounds = dict(self._bounds)
+        return other
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        out = detach(df)
+        groups = list(group_positions(out, group_keys(out, self.group_by)))
+        for c in self.columns:
+            if c not in out.columns:
+                continue
+            values = out[c].astype(float).to_numpy()
+            result = np.empty(len(out))
+            for label, pos in groups:
+                lo0, hi0 = self._bounds.get((c, label), (np.inf, -np.inf))
+                x = values[pos]
+                lo = np.fmin(lo0, np.fmin.accumulate(x)) if len(x) else x
+                hi = np.fmax(hi0, np.fmax.accumulate(x)) if len(x) else x
+                denom = np.where(hi - lo == 0, 1.0, hi - lo)
+                result[pos] = (x - lo) / denom
+                if len(x):
+                    self._bounds[(c, label)] = (float(lo[-1]), float(hi[-1]))
+            out[c] = result
+        return out
+
+
+@dataclass
+class NormalizeScan:
+    """
+    `normalize` over data read in chunks: `observe` every chunk first to collect the min
+    and max of each column and series, then `update` scales each chunk exactly as one
+    `normalize` over all the rows would.
+    """
+    columns: list[str]
+    group_by: str | list[str] | None = None
+    _bounds: dict[tuple[str, Hashable], tuple[float, float]] = field(
+        default_factory=dict, init=False, repr=False
+    )
+
+    def observe(self, df: pd.DataFrame) -> None:
+        groups = list(group_positions(df, group_keys(df, self.group_by)))
+        for c in self.columns:
+            if c not in df.columns:
+                continue
+            values = df[c].to_numpy(dtype=float)
+            for label, pos in groups:
+                if len(pos):
+                    lo, hi = self._bounds.get((c, label), (np.nan, np.nan))
+                    x = values[pos]
+                    self._bounds[(c, label)] = (
+                        float(np.fmin(lo, np.fmin.reduce(x))),
+                        float(np.fmax(hi, np.fmax.reduce(x))),
+                    )
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        out = detach(df)
+        groups = list(group_positions(out, group_keys(out, self.group_by)))
+        for c in self.columns:
+            if c not in out.columns:
+                continue
+            values = out[c].to_numpy(dtype=float)
+            lo, hi = np.empty(len(out)), np.empty(len(out))
+            for label, pos in groups:
+                lo[pos], hi[pos] = self._bounds.get((c, label), (np.nan, np.nan))
+            span = hi - lo
+            out[c] = (values - lo) / np.where(span == 0, 1.0, span)
+        return out
+
+
+@dataclass
+class _RowLocal:
+    """A transform whose output rows depend only on the input row: any chunk works."""
+    step: Any
+
+    def update(self, df: pd.DataFrame) -> pd.DataFrame:
+        return self.step.apply(df)
+
+
+def _chunk_step(name: str, params: dict) -> Any:
+    if name == "moving_average":
+        if params.get("order_by"):
+            raise ValueError(
+                "moving_average with order_by cannot run in chunks; sort the input instead"
+            )
+        return MovingAverageState(**{k: v for k, v in params.items() if k != "order_by"})
+    if name == "normalize":
+        return NormalizeScan(**params)
+    if name == "filter":
+        return _RowLocal(build_transform(name, params))
+    raise ValueError(
+        f"Transform '{name}' cannot run in chunks. Chunkable: filter, moving_average, normalize"
+    )
+
+
+def transform_chunks(
+    open_chunks: Callable[[], Iterable[pd.DataFrame]],
+    steps: list[Step],
+    columns: list[str] | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Run `steps` over the chunks from `open_chunks()` holding one chunk (plus per-series
+    state) at a time, yielding the rows `run_pipeline` would give for all the data at once.
+    `filter` runs per chunk and `moving_average` carries each series' tail across chunks.
+    Each `normalize` first needs the whole data's min/max, so it costs one extra pass
+    (through the steps before it): `open_chunks` is called once per `normalize`, plus once.
+    At least one (possibly empty) frame is yielded; when the source yields no chunks at
+    all, it is shaped from the source `columns`.
+    Raises ValueError upfront for steps that cannot run in chunks (seasonal_adjustment).
+    """
+    steps = list(steps)
+    for name, params in steps:
+        _chunk_step(name, params)
+    return _run_chunks(open_chunks, steps, columns)
+
+
+def _run_chunks(
+    open_chunks: Callable[[], Iterable[pd.DataFrame]],
+    steps: list[Step],
+    columns: list[str] | None,
+) -> Iterator[pd.DataFrame]:
+    scans: dict[int, NormalizeScan] = {}
+
+    def stages(upto: int) -> list[Any]:
+        # Fresh state for each pass; normalize steps keep the bounds already collected
+        return [
+            scans[i] if i in scans else _chunk_step(n, p) for i, (n, p) in enumerate(steps[:upto])
+        ]
+
+    for i, (name, params) in enumerate(steps):
+        if name == "normalize":
+            prefix, scan = stages(i), NormalizeScan(**params)
+            for chunk in open_chunks():
+                for stage in prefix:
+                    chunk = stage.update(chunk)
+                scan.observe(chunk)
+            scans[i] = scan
+
+    final = stages(len(steps))
+    empty = True
+    for chunk in open_chunks():
+        for stage in final:
+            chunk = stage.update(chunk)
+        yield chunk
+        empty = False
+    if empty:
+        # Writers still get the output columns, e.g. for a CSV header
+        chunk = pd.DataFrame(columns=columns)
+        if columns is not None:
+            for stage in final:
+                chunk = stage.update(chunk)
+        yield chunk
+
+
+# Transforms that have an incremental counterpart
+stream_steps: dict[str, Callable[[dict], Any]] = {
+    "moving_average": lambda cfg: MovingAverageState(**cfg),
+    "normalize": lambda cfg: NormalizeState(**cfg),
+}
+
+
+def build_stream_step(name: str, cfg: dict) -> Any:
+    if name not in stream_steps:
+        raise ValueError(
+            f"Transform '{name}' cannot be streamed. Streamable: {', '.join(sorted(stream_steps))}"
+        )
+    return stream_steps[name](cfg)
+
+
+@dataclass
+class Stream:
+    """
+    A named pipeline of incremental steps; `append` returns outputs for the new rows only.
+    """
+    name: str
+    steps: list[Step]
+    _states: list[Any] = field(default_factory=list, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+    rows_seen: int = field(default=0, init=False)
+
+    def __post_init__(self):
+        self._states = [build_stream_step(n, p) for n, p in self.steps]
+
+    def append(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        All or nothing: the batch runs on forks of the step states, which replace them
+        only once every step has succeeded, so a rejected batch leaves no trace.
+        """
+        with self._lock:
+            states = [state.fork() for state in self._states]
+            for state in states:
+                df = state.update(df)
+            self._states = states
+            self.rows_seen += len(df)
+            return df
+
+    def describe(self) -> dict[str, Any]:
+        return {
+            "stream": self.name,
+            "steps": [{"name": n, "params": p} for n, p in self.steps],
+            "rows_seen": self.rows_seen,
+        }
+
+
+@dataclass
+class StreamRegistry:
+    """
+    Named streams held in this process, up to `max_streams`. Names are scoped by tenant:
+    each tenant sees only the streams it created.
+    """
+    max_streams: int = 1000
+    _streams: dict[tuple[str | None, str], Stream] = field(
+        default_factory=dict, init=False, repr=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def create(
+        self, name: str, steps: list[Step], replace: bool = False, tenant: str | None = None
+    ) -> Stream:
+        stream = Stream(name, steps)
+        key = (tenant, name)
+        with self._lock:
+            if key in self._streams and not replace:
+                raise ValueError(f"Stream '{name}' already exists")
+            if key not in self._streams and len(self._streams) >= self.max_streams:
+                raise ValueError(f"Too many streams (max {self.max_streams})")
+            self._streams[key] = stream
+        return stream
+
+    def get(self, name: str, tenant: str | None = None) -> Stream:
+        with self._lock:
+            if (tenant, name) not in self._streams:
+                raise KeyError(f"Unknown stream: {name}")
+            return self._streams[(tenant, name)]
+
+    def drop(self, name: str, tenant: str | None = None) -> bool:
+        with self._lock:
+            return self._streams.pop((tenant, name), None) is not None
+
+    def list(self, tenant: str | None = None) -> list[dict[str, Any]]:
+        with self._lock:
+            return [s.describe() for (t, _), s in self._streams.items() if t == tenant]
+
+
+streams = StreamRegistry(max_streams=settings.stream_max_streams)
@@ -0,0 +1,208 @@
+from __future__ import annotations
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .frames import group_positions
+
+# Output modes of the MCP tools: the rows themselves, or what is computed from them
+OUTPUT_MODES = ("rows", "summary", "series_summary", "downsample")
+
+
+def _scalar(value: Any) -> Any:
+    """
+    JSON-friendly Python scalar: NaN/NaT become None, numpy and pandas scalars unwrap.
+    """
+    if value is None or (not isinstance(value, (list, dict)) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.isoformat()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def _value_column(df: pd.DataFrame, value: str | None) -> str:
+    if value is not None:
+        return value
+    if "value" in df.columns:
+        return "value"
+    numeric = df.select_dtypes("number").columns
+    if len(numeric) == 0:
+        raise ValueError("No numeric column to summarize; pass 'value'")
+    return str(numeric[0])
+
+
+def _x_column(df: pd.DataFrame, x: str | None) -> str | None:
+    if x is not None:
+        return x
+    return "date" if "date" in df.columns else None
+
+
+def describe(df: pd.DataFrame, columns: list[str] | None = None) -> dict[str, Any]:
+    """
+    Per-column statistics: count and nulls everywhere, plus mean/std/quantiles for
+    numeric columns and distinct count, most frequent value and range otherwise.
+    """
+    out: dict[str, Any] = {}
+    for col in columns or list(df.columns):
+        s = df[col]
+        stats: dict[str, Any] = {
+            "dtype": str(s.dtype),
+            "count": int(s.count()),
+            "nulls": int(s.isna().sum()),
+        }
+        if pd.api.types.is_numeric_dtype(s) and not pd.api.types.is_bool_dtype(s):
+            q = s.quantile([0.25, 0.5, 0.75]).to_numpy()
+            stats.update(
+                mean=_scalar(s.mean()), std=_scalar(s.std()), min=_scalar(s.min()),
+                p25=_scalar(q[0]), p50=_scalar(q[1]), p75=_scalar(q[2]), max=_scalar(s.max()),
+            )
+        else:
+            counts = s.value_counts()
+            stats.update(
+                unique=int(len(counts)),
+                top=_scalar(counts.index[0]) if len(counts) else None,
+                top_count=int(counts.iloc[0]) if len(counts) else 0,
+            )
+            if len(counts):
+                values = counts.index.sort_values()
+                stats.update(min=_scalar(values[0]), max=_scalar(values[-1]))
+        out[str(col)] = stats
+    return {"row_count": len(df), "columns": out}
+
+
+def series_summary(
+    df: pd.DataFrame,
+    value: str | None = None,
+    group_by: list[str] | None = None,
+    order_by: str | None = None,
+) -> list[dict[str, Any]]:
+    """
+    One aggregate row per series (group): count, mean, std, min, max and the first and
+    last values in `order_by` order (default: `date` when present, else row order) with
+    the change between them.
+    """
+    value = _value_column(df, value)
+    order_by = _x_column(df, order_by)
+    keys = list(group_by or [])
+    if order_by is not None:
+        df = df.sort_values(order_by, kind="stable")
+    aggs: dict[str, Any] = {
+        "count": (value, "count"), "mean": (value, "mean"), "std": (value, "std"),
+        "min": (value, "min"), "max": (value, "max"),
+        "first": (value, "first"), "last": (value, "last"),
+    }
+    if order_by is not None:
+        aggs.update(start=(order_by, "first"), end=(order_by, "last"))
+    if keys:
+        table = df.groupby(keys, sort=True, dropna=False).agg(**aggs).reset_index()
+    else:
+        table = df.groupby(np.zeros(len(df), dtype=int)).agg(**aggs)
+    table["change"] = table["last"] - table["first"]
+    first = table["first"].where(table["first"] != 0)
+    table["pct_change"] = table["change"] / first.abs() * 100
+    return [{k: _scalar(v) for k, v in row.items()} for row in table.to_dict(orient="records")]
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """
+    Positions of the `points` samples Largest-Triangle-Three-Buckets keeps from the series
+    (x ascending): the first and last, and per bucket the one spanning the largest
+    triangle with the previous pick and the next bucket's mean.
+    """
+    n = len(x)
+    if points >= n:
+        return np.arange(n)
+    edges = np.linspace(1, n - 1, points - 1).astype(np.int64)
+    out = np.empty(points, dtype=np.int64)
+    out[0], out[-1] = 0, n - 1
+    a = 0
+    for i in range(points - 2):
+        lo, hi = edges[i], edges[i + 1]
+        nlo, nhi = hi, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x, avg_y = x[nlo:nhi].mean(), y[nlo:nhi].mean()
+        area = np.abs((x[a] - avg_x) * (y[lo:hi] - y[a]) - (x[a] - x[lo:hi]) * (avg_y - y[a]))
+        a = lo + int(np.argmax(area))
+        out[i + 1] = a
+    return out
+
+
+def _numeric_x(s: pd.Series | None, n: int) -> np.ndarray:
+    # Dates (or date strings) are measured in nanoseconds; anything else by position
+    if s is None:
+        return np.arange(n, dtype=float)
+    if pd.api.types.is_numeric_dtype(s):
+        return s.to_numpy(dtype=float)
+    try:
+        return pd.to_datetime(s).to_numpy(dtype="datetime64[ns]").astype(np.int64).astype(float)
+    except (TypeError, ValueError):
+        return np.arange(n, dtype=float)
+
+
+def downsample(
+    df: pd.DataFrame,
+    points: int = 200,
+    x: str | None = None,
+    value: str | None = None,
+    group_by: list[str] | None = None,
+    method: str = "lttb",
+) -> pd.DataFrame:
+    """
+    Reduce each series to at most `points` points along `x` (default: `date` when present,
+    else row order). "lttb" keeps the visually significant rows unchanged; "bucket" splits
+    each series into `points` equal-count buckets and returns the first `x` and the mean
+    `value` of each.
+    """
+    if points < 3:
+        raise ValueError("downsample needs at least 3 points")
+    if method not in ("lttb", "bucket"):
+        raise ValueError(f"Unknown downsample method '{method}'; use 'lttb' or 'bucket'")
+    value = _value_column(df, value)
+    x = _x_column(df, x)
+    keys = list(group_by or [])
+    df = df[df[value].notna()]
+    if x is not None:
+        df = df.sort_values(x, kind="stable")
+    df = df.reset_index(drop=True)
+
+    if method == "bucket":
+        bucket = np.empty(len(df), dtype=np.int64)
+        for _, pos in group_positions(df, keys):
+            bucket[pos] = np.arange(len(pos)) * min(points, len(pos)) // max(len(pos), 1)
+        aggs: dict[str, Any] = {value: (value, "mean"), "count": (value, "count")}
+        if x is not None:
+            aggs = {x: (x, "first"), **aggs}
+        by = [df[k] for k in keys] + [pd.Series(bucket, name="_bucket")]
+        out = df.groupby(by, sort=False, dropna=False).agg(**aggs).reset_index()
+        out = out.sort_values(keys, kind="stable") if keys else out
+        return out.drop(columns="_bucket").reset_index(drop=True)
+
+    ys = df[value].to_numpy(dtype=float)
+    xs = _numeric_x(df[x] if x is not None else None, len(df))
+    keep = [pos[lttb_indices(xs[pos], ys[pos], points)] for _, pos in group_positions(df, keys)]
+    return df.iloc[np.concatenate(keep) if keep else []].reset_index(drop=True)
+
+
+def summarize(
+    df: pd.DataFrame, mode: str = "rows", options: dict[str, Any] | None = None
+) -> tuple[pd.DataFrame | None, dict[str, Any] | None]:
+    """
+    Apply an output mode to a result: returns the rows to send (if any) and the summary.
+    `options` are passed to the mode's function, e.g. {"group_by": ["series"],
+    "points": 100} for "downsample".
+    """
+    options = dict(options or {})
+    if mode == "rows":
+        return df, None
+    if mode == "summary":
+        return None, describe(df, **options)
+    if mode == "series_summary":
+        series = series_summary(df, **options)
+        return None, {"row_count": len(df), "series": series}
+    if mode == "downsample":
+        out = downsample(df, **options)
+        return out, {"row_count": len(df), "points": len(out),
+                     "method": options.get("method", "lttb")}
+    raise ValueError(f"Unknown output mode '{mode}'; use one of {', '.join(OUTPUT_MODES)}")
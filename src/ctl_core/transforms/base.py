@@ -12,5 +12,22 @@ class TransformConfig:
 class Transform(Protocol):
     name: str
 
-    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
-        ...
\ No newline at end of file
+    def apply(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        """
+        Return the transformed frame. With `inplace`, the caller owns `df` and lets the
+        transform add or replace its columns instead of working on a copy.
+        """
+        ...
+
+
+def group_keys(df: pd.DataFrame, group_by: str | list[str] | None) -> list[str]:
+    """
+    Normalize a `group_by` param to a list of columns, checking they exist.
+    """
+    if not group_by:
+        return []
+    keys = [group_by] if isinstance(group_by, str) else list(group_by)
+    missing = [k for k in keys if k not in df.columns]
+    if missing:
+        raise ValueError(f"group_by columns not found: {missing}")
+    return keys
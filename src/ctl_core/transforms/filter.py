@@ -0,0 +1,30 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any
+import numpy as np
+import pandas as pd
+from ..frames import equals_mask
+from .base import Transform
+
+
+@dataclass
+class Filter(Transform):
+    """
+    Keep rows where every `where` column equals its value (a list matches any of its
+    values), with the same coercion rules as connector `where` filters.
+    """
+    where: dict[str, Any]
+    name: str = "filter"
+
+    def apply(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        missing = [k for k in self.where if k not in df.columns]
+        if missing:
+            raise ValueError(f"filter columns not found: {missing}")
+        mask = np.ones(len(df), dtype=bool)
+        for k, v in self.where.items():
+            values = v if isinstance(v, list) else [v]
+            hit = np.zeros(len(df), dtype=bool)
+            for value in values:
+                hit |= equals_mask(df[k], value).to_numpy(dtype=bool, na_value=False)
+            mask &= hit
+        return df[mask]
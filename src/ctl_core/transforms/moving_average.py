@@ -1,19 +1,55 @@
 from __future__ import annotations
 from dataclasses import dataclass
+import numpy as np
 import pandas as pd
-from .base import Transform
+from ..frames import detach
+from .base import Transform, group_keys
 
 
 @dataclass
 class MovingAverage(Transform):
-    column: str
+    """
+    Trailing rolling mean; with `group_by`, computed per series in one groupby pass.
+    `column` may list several columns, which share that pass. With `order_by`, rows are
+    taken in that order (stable) rather than as given; the output keeps the input order.
+    """
+    column: str | list[str]
     window: int = 3
+    group_by: str | list[str] | None = None
+    order_by: str | list[str] | None = None
     name: str = "moving_average"
 
-    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
-        out = df.copy()
-        if self.column in out.columns:
-            out[f"{self.column}_ma{self.window}"] = (
-                out[self.column].astype(float).rolling(self.window, min_periods=1).mean()
-            )
-        return out
\ No newline at end of file
+    def apply(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        out = df if inplace else detach(df)
+        columns = [self.column] if isinstance(self.column, str) else list(self.column)
+        columns = [c for c in columns if c in out.columns]
+        if not columns:
+            return out
+        keys = group_keys(out, self.group_by)
+        order = [self.order_by] if isinstance(self.order_by, str) else list(self.order_by or [])
+        missing = [c for c in order if c not in out.columns]
+        if missing:
+            raise ValueError(f"order_by columns not found: {missing}")
+
+        values = out[columns].astype(float).reset_index(drop=True)
+        by = [out[k].reset_index(drop=True) for k in keys]
+        perm = None
+        if order:
+            perm = out[order].reset_index(drop=True).sort_values(order, kind="stable").index
+            values = values.iloc[perm].reset_index(drop=True)
+            by = [b.iloc[perm].reset_index(drop=True) for b in by]
+        if keys:
+            rolled = values.groupby(by, sort=False, dropna=False).rolling(
+                self.window, min_periods=1
+            ).mean()
+            # Drop the group levels and restore the original row order
+            result = rolled.droplevel(list(range(len(keys)))).sort_index().to_numpy()
+        else:
+            result = values.rolling(self.window, min_periods=1).mean().to_numpy()
+        if perm is not None:
+            unsorted = np.empty_like(result)
+            unsorted[perm.to_numpy()] = result
+            result = unsorted
+        for i, c in enumerate(columns):
+            out[f"{c}_ma{self.window}"] = result[:, i]
+        return out
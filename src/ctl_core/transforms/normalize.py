@@ -1,23 +1,39 @@
 from __future__ import annotations
 from dataclasses import dataclass
+import numpy as np
 import pandas as pd
-from .base import Transform
+from ..frames import detach
+from .base import Transform, group_keys
 
 
 @dataclass
 class Normalize(Transform):
     """
     Min-max normalization for selected numeric columns.
+    With `group_by`, each series is scaled by its own min and max.
     """
     columns: list[str]
+    group_by: str | list[str] | None = None
     name: str = "normalize"
 
-    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
-        out = df.copy()
+    def apply(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
+        out = df if inplace else detach(df)
+        keys = group_keys(out, self.group_by)
+        if len(out) == 0:
+            return out
+        # Group codes are shared by every column
+        codes = out.groupby(keys, sort=False, dropna=False).ngroup().to_numpy() if keys else None
         for c in self.columns:
             if c not in out.columns:
                 continue
-            series = out[c].astype(float)
-            denom = (series.max() - series.min()) or 1.0
-            out[c] = (series - series.min()) / denom
-        return out
\ No newline at end of file
+            values = out[c].to_numpy(dtype=float)
+            if codes is not None:
+                stats = pd.Series(values).groupby(codes, sort=True).agg(["min", "max"]).to_numpy()
+                lo, hi = stats[codes, 0], stats[codes, 1]
+                span = hi - lo
+                denom = np.where(span == 0, 1.0, span)
+            else:
+                lo, hi = np.nanmin(values), np.nanmax(values)
+                denom = (hi - lo) or 1.0
+            out[c] = (values - lo) / denom
+        return out
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+import numpy as np
 import pandas as pd
 
 try:
@@ -7,25 +8,87 @@ try:
 except Exception:  # pragma: no cover
     sm = None  # type: ignore
 
-from .base import Transform
+from ..frames import detach
+from .base import Transform, group_keys
+from .seasonal_batch import BatchResult, adjust_many
+from .seasonal_state import incremental_seasonal, seasonal_state
 
 
 @dataclass
 class SeasonalAdjustment(Transform):
     """
     Very simple seasonal adjustment using STL decomposition, requires statsmodels.
+    With `group_by`, each series gets its own STL fit; `workers` > 1 spreads the fits
+    over a process pool. Series that fail raise ValueError, or are left as NaN and
+    listed in `failures` when `on_error` is "nan".
+
+    `engine` is "stl_robust" (default), the cheaper "stl" or "classical" decomposition.
+    With `incremental`, fitted components are kept per series (under `state_key`) and
+    reused when later calls only append observations; see `incremental_seasonal`.
     """
     column: str
     period: int
+    group_by: str | list[str] | None = None
+    workers: int = 1
+    on_error: str = "raise"
+    engine: str = "stl_robust"
+    incremental: bool = False
+    revision_window: int = 0
+    state_key: str | None = None
     name: str = "seasonal_adjustment"
+    failures: dict[str, str] = field(default_factory=dict, init=False, repr=False)
+
+    def _incremental(self, values: np.ndarray, offsets: np.ndarray, labels: list) -> BatchResult:
+        out = np.empty_like(values)
+        failures = {}
+        prefix = self.state_key or self.column
+        for i, label in enumerate(labels):
+            seg = values[offsets[i] : offsets[i + 1]]
+            try:
+                seasonal = incremental_seasonal(
+                    seasonal_state, f"{prefix}|{label}", seg, self.period, self.engine,
+                    self.revision_window,
+                )
+                out[offsets[i] : offsets[i + 1]] = seg - seasonal
+            except Exception as e:
+                out[offsets[i] : offsets[i + 1]] = np.nan
+                failures[i] = f"{type(e).__name__}: {e}"
+        return BatchResult(out, failures)
 
-    def apply(self, df: pd.DataFrame) -> pd.DataFrame:
+    def apply(self, df: pd.DataFrame, inplace: bool = False) -> pd.DataFrame:
         if sm is None:
             raise RuntimeError("statsmodels not installed. Install with 'pip install .[stats]'")
-        out = df.copy()
+        out = df if inplace else detach(df)
         if self.column not in out.columns:
             return out
-        series = pd.to_numeric(out[self.column], errors="coerce").fillna(method="ffill")
-        stl = sm.tsa.STL(series, period=self.period, robust=True).fit()
-        out[f"{self.column}_sa"] = series - stl.seasonal
-        return out
\ No newline at end of file
+        keys = group_keys(out, self.group_by)
+        values = pd.to_numeric(out[self.column], errors="coerce").reset_index(drop=True)
+        if keys:
+            by = [out[k].reset_index(drop=True) for k in keys]
+            groups = values.groupby(by, sort=False, dropna=False).indices
+            labels, positions = list(groups), list(groups.values())
+            values = values.groupby(by, sort=False, dropna=False).ffill()
+        else:
+            labels, positions = [self.column], [np.arange(len(values))]
+            values = values.ffill()
+
+        # Pack series end to end so they can be fitted as one batch
+        order = np.concatenate(positions) if positions else np.arange(0)
+        offsets = np.concatenate([[0], np.cumsum([len(p) for p in positions])])
+        packed = values.to_numpy(dtype=float)[order]
+        if self.incremental:
+            batch = self._incremental(packed, offsets, labels)
+        else:
+            batch = adjust_many(packed, offsets, self.period, self.workers, self.engine)
+
+        self.failures = {str(labels[i]): msg for i, msg in batch.failures.items()}
+        if self.failures and self.on_error == "raise":
+            first = next(iter(self.failures.items()))
+            raise ValueError(
+                f"Seasonal adjustment failed for {len(self.failures)} series "
+                f"(first: {first[0]}: {first[1]})"
+            )
+        result = np.empty(len(values))
+        result[order] = batch.adjusted
+        out[f"{self.column}_sa"] = result
+        return out
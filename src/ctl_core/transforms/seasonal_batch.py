@@ -0,0 +1,131 @@
+from __future__ import annotations
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+from ..config import settings
+
+try:
+    import statsmodels.api as sm
+except Exception:  # pragma: no cover
+    sm = None  # type: ignore
+
+
+@dataclass
+class BatchResult:
+    """
+    Seasonally adjusted values laid out like the input, plus per-series errors.
+    Failed series are left as NaN.
+    """
+    adjusted: np.ndarray
+    failures: dict[int, str] = field(default_factory=dict)
+
+
+# Decomposition engines, from most robust (and slowest) to cheapest
+ENGINES = ("stl_robust", "stl", "classical")
+
+
+def seasonal_component(values: np.ndarray, period: int, engine: str = "stl_robust") -> np.ndarray:
+    """
+    Estimate the additive seasonal component of one series.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine '{engine}'. Use one of: {', '.join(ENGINES)}")
+    if len(values) < 2 * period:
+        raise ValueError(f"need at least {2 * period} observations, got {len(values)}")
+    if np.isnan(values).any():
+        raise ValueError("series has missing values that cannot be forward-filled")
+    if engine == "classical":
+        fit = sm.tsa.seasonal_decompose(values, period=period, model="additive")
+    else:
+        fit = sm.tsa.STL(values, period=period, robust=engine == "stl_robust").fit()
+    return np.asarray(fit.seasonal)
+
+
+def _adjust_range(
+    values: np.ndarray, out: np.ndarray, offsets: np.ndarray, ids: range, period: int, engine: str
+) -> dict[int, str]:
+    failures = {}
+    for i in ids:
+        lo, hi = offsets[i], offsets[i + 1]
+        try:
+            out[lo:hi] = values[lo:hi] - seasonal_component(values[lo:hi], period, engine)
+        except Exception as e:
+            out[lo:hi] = np.nan
+            failures[i] = f"{type(e).__name__}: {e}"
+    return failures
+
+
+# Per-worker views onto the shared input/output buffers, set by _attach
+_worker: dict = {}
+
+
+def _attach(in_name: str, out_name: str, n: int, offsets: np.ndarray) -> None:
+    # Spawned workers share the parent's resource tracker, so attaching does not
+    # hand ownership of the segments to the worker
+    shm_in, shm_out = SharedMemory(name=in_name), SharedMemory(name=out_name)
+    _worker.update(
+        shm=(shm_in, shm_out),
+        values=np.ndarray((n,), dtype=np.float64, buffer=shm_in.buf),
+        out=np.ndarray((n,), dtype=np.float64, buffer=shm_out.buf),
+        offsets=offsets,
+    )
+
+
+def _work(ids: range, period: int, engine: str) -> dict[int, str]:
+    return _adjust_range(
+        _worker["values"], _worker["out"], _worker["offsets"], ids, period, engine
+    )
+
+
+def adjust_many(
+    values: np.ndarray,
+    offsets: np.ndarray,
+    period: int,
+    workers: int = 1,
+    engine: str = "stl_robust",
+) -> BatchResult:
+    """
+    Seasonally adjust many series packed end to end in `values`; series i spans
+    values[offsets[i]:offsets[i + 1]].
+
+    With workers > 1 the fits fan out to a process pool of at most
+    `CTL_SEASONAL_MAX_WORKERS` processes. Input and output live in shared memory, so
+    workers receive only index ranges, never pickled data.
+    """
+    if sm is None:
+        raise RuntimeError("statsmodels not installed. Install with 'pip install .[stats]'")
+    values = np.ascontiguousarray(values, dtype=np.float64)
+    n_series = len(offsets) - 1
+    workers = min(workers, settings.seasonal_max_workers, n_series)
+    if workers <= 1 or n_series < 2:
+        out = np.empty_like(values)
+        failures = _adjust_range(values, out, offsets, range(n_series), period, engine)
+        return BatchResult(out, failures)
+
+    size = max(values.nbytes, 1)
+    shm_in = SharedMemory(create=True, size=size)
+    shm_out = SharedMemory(create=True, size=size)
+    try:
+        np.ndarray(values.shape, dtype=np.float64, buffer=shm_in.buf)[:] = values
+        # Several chunks per worker keeps the pool busy when series lengths differ
+        n_chunks = min(n_series, workers * 4)
+        bounds = np.linspace(0, n_series, n_chunks + 1).astype(int)
+        chunks = [range(a, b) for a, b in zip(bounds[:-1], bounds[1:]) if b > a]
+        failures: dict[int, str] = {}
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=mp.get_context("spawn"),
+            initializer=_attach,
+            initargs=(shm_in.name, shm_out.name, len(values), np.asarray(offsets)),
+        ) as pool:
+            for part in pool.map(_work, chunks, [period] * len(chunks), [engine] * len(chunks)):
+                failures.update(part)
+        out = np.ndarray(values.shape, dtype=np.float64, buffer=shm_out.buf).copy()
+    finally:
+        for shm in (shm_in, shm_out):
+            shm.close()
+            shm.unlink()
+    return BatchResult(out, failures)
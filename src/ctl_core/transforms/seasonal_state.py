@@ -0,0 +1,140 @@
+from __future__ import annotations
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from pathlib import Path
+import numpy as np
+
+from ..config import settings
+from .seasonal_batch import seasonal_component
+
+
+@dataclass
+class SeasonalState:
+    """
+    Seasonal component estimated for the first `n` observations of a series.
+    """
+    n: int
+    digest: str
+    period: int
+    engine: str
+    seasonal: np.ndarray
+
+
+def history_digest(values: np.ndarray) -> str:
+    return hashlib.sha256(np.ascontiguousarray(values, dtype=np.float64).tobytes()).hexdigest()
+
+
+@dataclass
+class SeasonalStateStore:
+    """
+    Previously fitted seasonal components per series key, LRU-bounded in memory
+    and optionally persisted as .npz files so they survive restarts.
+    """
+    max_series: int = 10_000
+    directory: str | None = None
+    _states: OrderedDict[str, SeasonalState] = field(
+        default_factory=OrderedDict, init=False, repr=False
+    )
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _file(self, key: str) -> Path:
+        return Path(self.directory) / (hashlib.sha256(key.encode()).hexdigest() + ".npz")
+
+    def get(self, key: str) -> SeasonalState | None:
+        with self._lock:
+            state = self._states.get(key)
+            if state is not None:
+                self._states.move_to_end(key)
+                return state
+        if self.directory and self._file(key).exists():
+            with np.load(self._file(key)) as z:
+                state = SeasonalState(
+                    n=int(z["n"]),
+                    digest=str(z["digest"]),
+                    period=int(z["period"]),
+                    engine=str(z["engine"]),
+                    seasonal=z["seasonal"],
+                )
+            self._remember(key, state)
+        return state
+
+    def _remember(self, key: str, state: SeasonalState) -> None:
+        with self._lock:
+            self._states[key] = state
+            self._states.move_to_end(key)
+            while len(self._states) > self.max_series:
+                self._states.popitem(last=False)
+
+    def put(self, key: str, state: SeasonalState) -> None:
+        self._remember(key, state)
+        if self.directory:
+            Path(self.directory).mkdir(parents=True, exist_ok=True)
+            np.savez(
+                self._file(key),
+                n=state.n,
+                digest=state.digest,
+                period=state.period,
+                engine=state.engine,
+                seasonal=state.seasonal,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._states.clear()
+
+
+def incremental_seasonal(
+    store: SeasonalStateStore,
+    key: str,
+    values: np.ndarray,
+    period: int,
+    engine: str,
+    revision_window: int = 0,
+) -> np.ndarray:
+    """
+    Seasonal component for `values`, reusing the stored fit when `values` only appends
+    observations to the history it was estimated on.
+
+    New observations take the seasonal factor of the same position in the last stored
+    cycle. With `revision_window` > 0, the last `revision_window` stored observations
+    plus the new ones are re-estimated from a fit on just the recent tail, so the cost
+    follows the size of the update rather than the full history. Anything else (a new
+    series, a revised history, another period or engine) gets a full fit.
+    """
+    state = store.get(key)
+    n = len(values)
+    reusable = (
+        state is not None
+        and state.period == period
+        and state.engine == engine
+        and state.n <= n
+        and history_digest(values[: state.n]) == state.digest
+    )
+    if not reusable:
+        seasonal = seasonal_component(values, period, engine)
+    elif state.n == n:
+        return state.seasonal
+    else:
+        k = n - state.n
+        if revision_window > 0:
+            seasonal = np.empty(n)
+            keep = max(0, state.n - revision_window)
+            seasonal[:keep] = state.seasonal[:keep]
+            # Fit on enough recent context for a stable estimate of the tail
+            fit_from = max(0, min(keep, n - max(revision_window + k, 4 * period)))
+            tail = seasonal_component(values[fit_from:], period, engine)
+            seasonal[keep:] = tail[keep - fit_from :]
+        else:
+            last_cycle = state.seasonal[state.n - period : state.n]
+            extension = last_cycle[np.arange(k) % period]
+            seasonal = np.concatenate([state.seasonal, extension])
+    store.put(key, SeasonalState(n, history_digest(values), period, engine, seasonal))
+    return seasonal
+
+
+seasonal_state = SeasonalStateStore(
+    max_series=settings.seasonal_state_max_series,
+    directory=settings.seasonal_state_dir,
+)
@@ -0,0 +1,137 @@
+"""
+Server-side dataset handles for the MCP tools.
+
+Results stored here are referred to by handle, so agents page through rows or chain
+transforms without sending the data back and forth.
+"""
+
+from __future__ import annotations
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+import pandas as pd
+
+from ctl_core.config import settings
+from ctl_core.frames import frame_nbytes
+
+
+@dataclass
+class Dataset:
+    handle: str
+    df: pd.DataFrame
+    source: str
+    nbytes: int
+    expires_at: float
+    tenant: str | None = None
+
+    def schema(self) -> list[dict[str, str]]:
+        return [{"name": str(c), "dtype": str(t)} for c, t in self.df.dtypes.items()]
+
+    def rows(self, offset: int = 0, limit: int | None = None,
+             columns: list[str] | None = None) -> list[dict[str, Any]]:
+        df = self.df[columns] if columns else self.df
+        stop = None if limit is None else offset + limit
+        return df.iloc[offset:stop].to_dict(orient="records")
+
+
+@dataclass
+class DatasetStore:
+    """
+    DataFrames kept in this process under random handles for `ttl` seconds, up to
+    `max_datasets` and `max_bytes` (least recently used evicted first). Each dataset
+    belongs to the tenant that stored it; other tenants can neither see nor read it.
+    Stored frames are shared by every reader and must not be modified.
+    """
+    max_datasets: int = 100
+    max_bytes: int = 1024**3
+    ttl: float = 3600.0
+    clock: Callable[[], float] = time.monotonic
+    _data: OrderedDict[str, Dataset] = field(default_factory=OrderedDict, init=False, repr=False)
+    _bytes: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def _remove(self, handle: str) -> Dataset | None:
+        ds = self._data.pop(handle, None)
+        if ds is not None:
+            self._bytes -= ds.nbytes
+        return ds
+
+    def _expire(self) -> None:
+        now = self.clock()
+        for handle in [h for h, ds in self._data.items() if ds.expires_at <= now]:
+            self._remove(handle)
+
+    def put(self, df: pd.DataFrame, source: str = "", tenant: str | None = None) -> Dataset:
+        nbytes = frame_nbytes(df)
+        if nbytes > self.max_bytes:
+            raise ValueError(
+                f"Dataset of {nbytes} bytes exceeds the store limit of {self.max_bytes} bytes"
+            )
+        ds = Dataset(
+            f"ds_{secrets.token_hex(8)}", df, source, nbytes, self.clock() + self.ttl, tenant
+        )
+        with self._lock:
+            self._expire()
+            while self._data and (
+                len(self._data) >= self.max_datasets or self._bytes + nbytes > self.max_bytes
+            ):
+                self._remove(next(iter(self._data)))
+            self._data[ds.handle] = ds
+            self._bytes += nbytes
+        return ds
+
+    def get(self, handle: str, tenant: str | None = None) -> Dataset:
+        with self._lock:
+            self._expire()
+            ds = self._data.get(handle)
+            # Another tenant's handle looks exactly like an unknown one
+            if ds is None or ds.tenant != tenant:
+                raise KeyError(f"Unknown or expired dataset: {handle}")
+            self._data.move_to_end(handle)
+            return ds
+
+    def drop(self, handle: str, tenant: str | None = None) -> bool:
+        with self._lock:
+            ds = self._data.get(handle)
+            if ds is None or ds.tenant != tenant:
+                return False
+            return self._remove(handle) is not None
+
+    def describe(self, ds: Dataset, preview_rows: int | None = None) -> dict[str, Any]:
+        n = settings.mcp_dataset_preview_rows if preview_rows is None else preview_rows
+        return {
+            "handle": ds.handle,
+            "source": ds.source,
+            "columns": ds.schema(),
+            "row_count": len(ds.df),
+            "preview": ds.rows(0, n),
+            "expires_in": max(0.0, round(ds.expires_at - self.clock(), 1)),
+        }
+
+    def list(self, tenant: str | None = None) -> list[dict[str, Any]]:
+        with self._lock:
+            self._expire()
+            return [
+                self.describe(ds, preview_rows=0)
+                for ds in self._data.values()
+                if ds.tenant == tenant
+            ]
+
+    def stats(self, tenant: str | None = None) -> dict[str, Any]:
+        # Usage of this tenant against the store-wide limits
+        with self._lock:
+            self._expire()
+            mine = [ds for ds in self._data.values() if ds.tenant == tenant]
+            return {"datasets": len(mine), "bytes": sum(ds.nbytes for ds in mine),
+                    "max_datasets": self.max_datasets, "max_bytes": self.max_bytes}
+
+
+dataset_store = DatasetStore(
+    max_datasets=settings.mcp_dataset_max,
+    max_bytes=settings.mcp_dataset_max_bytes,
+    ttl=settings.mcp_dataset_ttl,
+)
@@ -5,28 +5,54 @@ This module provides a Model Context Protocol (MCP) server that exposes CTL's
 data connectors and transformations as tools for AI assistants.
 """
 
-from typing import Any, Dict, List, Optional
+import asyncio
+import threading
+from typing import Any, Callable, Dict, List, Optional
 import pandas as pd
 from mcp.server.fastmcp import FastMCP
 from mcp.server.fastmcp import Context
 from pydantic import BaseModel, Field
 
+try:
+    from mcp.server.auth.middleware.auth_context import get_access_token
+except Exception:  # pragma: no cover
+    get_access_token = None  # type: ignore
+
 from ctl_core.registry import (
     list_connectors,
     list_transforms,
     build_connector,
-    build_transform,
 )
-from ctl_core.connectors.base import QuerySpec
+from ctl_core.cache import result_cache
+from ctl_core.config import settings
+from ctl_core.connectors.base import Partition, QuerySpec
+from ctl_core.connectors.engines import pool_stats
+from ctl_core.executor import work_pool
+from ctl_core.pipeline import run_pipeline
+from ctl_core.streams import streams
+from ctl_core.summarize import summarize
+from ctl_mcp.datasets import dataset_store
 
 
 # Pydantic models for structured output
+class DatasetInfo(BaseModel):
+    """Handle to a result kept on the server, with its schema and first rows."""
+    handle: str
+    source: str = ""
+    columns: List[Dict[str, str]] = Field(default_factory=list)
+    row_count: int = 0
+    preview: List[Dict[str, Any]] = Field(default_factory=list)
+    expires_in: float = 0.0
+
+
 class QueryResult(BaseModel):
     """Query result structure."""
     success: bool = True
     data: List[Dict[str, Any]] = Field(default_factory=list)
     row_count: int = 0
     message: str = ""
+    dataset: Optional[DatasetInfo] = None
+    summary: Optional[Dict[str, Any]] = None
 
 
 class TransformResult(BaseModel):
@@ -36,6 +62,19 @@ class TransformResult(BaseModel):
     row_count: int = 0
     steps_applied: List[str] = Field(default_factory=list)
     message: str = ""
+    dataset: Optional[DatasetInfo] = None
+    summary: Optional[Dict[str, Any]] = None
+
+
+class DatasetPage(BaseModel):
+    """A slice of rows from a stored dataset."""
+    success: bool = True
+    handle: str = ""
+    offset: int = 0
+    data: List[Dict[str, Any]] = Field(default_factory=list)
+    row_count: int = 0
+    total_rows: int = 0
+    message: str = ""
 
 
 # Create the MCP server
@@ -48,13 +87,154 @@ mcp = FastMCP(
     2. Data Transformations: Apply statistical and data processing transformations
     
     Available connectors: local (CSV/Parquet), azure_sql, mysql, databricks
-    Available transforms: normalize, moving_average, seasonal_adjustment
+    Available transforms: normalize, moving_average, seasonal_adjustment, filter
+    
+    For large results pass store=true: you get a dataset handle with the schema, row count
+    and a preview; transform it with transform_data(handle=...) and read rows on demand
+    with get_dataset_rows. When you need shape, statistics or trends rather than rows, pass
+    output="summary", "series_summary" or "downsample".
     
     Use me to fetch, transform, and analyze data for economics, statistics, and business analytics.
     """,
 )
 
 
+def _tenant() -> str:
+    # Cache tenant of the caller: the access token's tenant or subject when the server
+    # runs with auth, else the configured one. Read it in the tool, not a worker thread
+    token = get_access_token() if get_access_token is not None else None
+    if token is not None:
+        return (token.claims or {}).get("tid") or token.subject or token.client_id
+    return settings.mcp_tenant
+
+
+def _query_frame(
+    connector: str, connector_config: Dict[str, Any], spec: QuerySpec, tenant: str
+) -> pd.DataFrame:
+    # Served from the result cache when enabled for this connector
+    return result_cache.get_or_query(
+        connector,
+        connector_config,
+        spec,
+        lambda: build_connector(connector, connector_config).query(spec),
+        tenant=tenant,
+    )
+
+
+def _steps(transformations: Optional[List[Dict[str, Any]]]) -> List[tuple[str, Dict[str, Any]]]:
+    return [
+        (step["name"], step.get("params", {}))
+        for step in transformations or []
+        if step.get("name")
+    ]
+
+
+def _transform_frame(
+    df: pd.DataFrame,
+    transformations: Optional[List[Dict[str, Any]]],
+    owned: bool,
+    on_step: Optional[Callable[[int, int, str], None]] = None,
+) -> tuple[pd.DataFrame, List[str]]:
+    steps = _steps(transformations)
+    # Reuses cached stages from earlier calls
+    df = run_pipeline(df, steps, owned=owned, on_step=on_step)
+    return df, [f"{name}({params})" for name, params in steps]
+
+
+class _Cancelled(RuntimeError):
+    """Stops a pipeline whose tool call was cancelled by the client."""
+
+
+class _ToolRun:
+    """
+    Progress and cancellation for one tool call. Blocking work runs on the shared worker
+    pool: connector queries in a lane per connector (capped with CTL_WORKER_LIMITS,
+    e.g. "mysql=2"), pipelines and serialization in the "transform" lane. A cancelled
+    call stops its pipeline before the next step.
+    """
+
+    def __init__(self, ctx: Optional[Context], total: int):
+        self.ctx = ctx
+        self.total = total
+        self.loop = asyncio.get_running_loop()
+        self.cancelled = threading.Event()
+
+    async def progress(self, done: int, message: str) -> None:
+        if self.ctx is None:
+            return
+        try:
+            await self.ctx.report_progress(done, self.total, message)
+        except ValueError:
+            # Called outside an MCP request (e.g. directly from Python)
+            pass
+
+    def on_step(self, offset: int) -> Callable[[int, int, str], None]:
+        # Runs on the worker thread before each pipeline step
+        def hook(index: int, total: int, name: str) -> None:
+            if self.cancelled.is_set():
+                raise _Cancelled(f"Cancelled before step {index + 1} of {total} ({name})")
+            asyncio.run_coroutine_threadsafe(
+                self.progress(offset + index, f"Applying {name} ({index + 1}/{total})"),
+                self.loop,
+            )
+        return hook
+
+    async def run(self, lane: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        try:
+            return await work_pool.run(lane, fn, *args, **kwargs)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+
+    async def query(
+        self, connector: str, connector_config: Dict[str, Any], spec: QuerySpec
+    ) -> pd.DataFrame:
+        # Lanes are created on first use, so only registered connectors may name one
+        if connector not in list_connectors():
+            raise KeyError(f"Unknown connector: {connector}")
+        return await self.run(
+            connector, _query_frame, connector, connector_config, spec, _tenant()
+        )
+
+
+def _store(df: pd.DataFrame, source: str, tenant: str) -> DatasetInfo:
+    return DatasetInfo(**dataset_store.describe(dataset_store.put(df, source, tenant)))
+
+
+def _output(
+    df: pd.DataFrame,
+    source: str,
+    store: bool,
+    output: str,
+    output_options: Optional[Dict[str, Any]],
+    tenant: str,
+) -> tuple[Dict[str, Any], str]:
+    """
+    Result fields for a tool's final frame (rows, summary and/or dataset handle) and a
+    note for its message. Summaries are computed here, so only they cross the wire.
+    """
+    rows, summary = summarize(df, output, output_options)
+    fields: Dict[str, Any] = {"row_count": len(df), "summary": summary}
+    notes = []
+    if store:
+        fields["dataset"] = _store(df, source, tenant)
+        notes.append(f"stored as {fields['dataset'].handle}")
+    if rows is not None and not (store and output == "rows"):
+        fields["data"] = _records(rows)
+        fields["row_count"] = len(fields["data"])
+    if output == "downsample":
+        notes.append(f"downsampled to {fields['row_count']} rows")
+    elif output != "rows":
+        notes.append(f"returned {output}")
+    return fields, "".join(f", {n}" for n in notes)
+
+
+def _records(df: pd.DataFrame) -> List[Dict[str, Any]]:
+    # The single DataFrame -> rows conversion of a tool call. Results are built with
+    # model_construct: the rows come from pandas, so validating each one again is redundant.
+    return df.to_dict(orient="records")
+
+
 @mcp.tool()
 def list_available_connectors() -> Dict[str, List[str]]:
     """List all available data connectors."""
@@ -76,12 +256,43 @@ def list_available_transforms() -> Dict[str, List[str]]:
 
 
 @mcp.tool()
-def query_data(
+def get_pool_stats() -> Dict[str, Any]:
+    """Report connection pool statistics for the SQL connectors."""
+    return {
+        "pools": pool_stats(),
+        "description": "Shared SQL connection pools, one per connection URL"
+    }
+
+
+@mcp.tool()
+def get_cache_stats() -> Dict[str, Any]:
+    """Report connector result cache hit/miss counters and size."""
+    return result_cache.stats()
+
+
+@mcp.tool()
+def invalidate_cache(connector: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Drop cached query results.
+    
+    Args:
+        connector: Only drop results from this connector (optional, default: all)
+    """
+    return {"invalidated": result_cache.invalidate(connector)}
+
+
+@mcp.tool()
+async def query_data(
     connector: str,
     connector_config: Dict[str, Any],
     select_columns: Optional[List[str]] = None,
     where_conditions: Optional[Dict[str, Any]] = None,
     limit: Optional[int] = None,
+    partition: Optional[Dict[str, Any]] = None,
+    store: bool = False,
+    output: str = "rows",
+    output_options: Optional[Dict[str, Any]] = None,
+    ctx: Optional[Context] = None,
 ) -> QueryResult:
     """
     Query data from a specified connector.
@@ -92,29 +303,37 @@ def query_data(
         select_columns: List of column names to select (optional)
         where_conditions: Conditions for filtering data (optional)
         limit: Maximum number of rows to return (optional)
+        partition: Parallel range reads for SQL connectors (optional),
+                  e.g. {"column": "date", "num_partitions": 8}
+        store: Keep the result on the server and return a dataset handle with the
+               schema, row count and a preview instead of the rows (optional)
+        output: What to return (optional, default 'rows'): 'summary' (per-column
+                statistics), 'series_summary' (aggregates per series) or 'downsample'
+                (each series reduced to N points)
+        output_options: Options for the output mode (optional), e.g.
+                {"group_by": ["series"], "points": 200, "method": "lttb"}
     """
     try:
-        # Build the connector
-        conn = build_connector(connector, connector_config)
-        
-        # Create query specification
         query_spec = QuerySpec(
             select=select_columns,
             where=where_conditions,
-            limit=limit
+            limit=limit,
+            partition=Partition(**partition) if partition else None,
         )
+        run = _ToolRun(ctx, total=2)
+        await run.progress(0, f"Querying {connector}")
+        df = await run.query(connector, connector_config, query_spec)
+        await run.progress(1, f"Preparing {output} output")
+        fields, note = await run.run(
+            "transform", _output, df, f"query_data({connector})", store, output, output_options,
+            _tenant(),
+        )
+        await run.progress(2, "Done")
         
-        # Execute query
-        df = conn.query(query_spec)
-        
-        # Convert to list of dictionaries
-        data = df.to_dict(orient="records")
-        
-        return QueryResult(
+        return QueryResult.model_construct(
             success=True,
-            data=data,
-            row_count=len(data),
-            message=f"Successfully queried {len(data)} rows from {connector}"
+            message=f"Successfully queried {len(df)} rows from {connector}{note}",
+            **fields
         )
         
     except Exception as e:
@@ -127,51 +346,59 @@ def query_data(
 
 
 @mcp.tool()
-def transform_data(
-    data: List[Dict[str, Any]],
-    transformations: List[Dict[str, Any]],
+async def transform_data(
+    data: Optional[List[Dict[str, Any]]] = None,
+    transformations: Optional[List[Dict[str, Any]]] = None,
+    handle: Optional[str] = None,
+    store: bool = False,
+    output: str = "rows",
+    output_options: Optional[Dict[str, Any]] = None,
+    ctx: Optional[Context] = None,
 ) -> TransformResult:
     """
     Apply transformations to data.
     
     Args:
-        data: List of data records to transform
+        data: List of data records to transform (or use `handle`)
         transformations: List of transformation steps, each with 'name' and 'params'
                         Example: [{"name": "normalize", "params": {"columns": ["value"]}}]
+        handle: Transform a dataset stored by an earlier call instead of `data` (optional)
+        store: Keep the result on the server and return a new dataset handle (optional)
+        output: What to return (optional, default 'rows'): 'summary' (per-column
+                statistics), 'series_summary' (aggregates per series) or 'downsample'
+                (each series reduced to N points)
+        output_options: Options for the output mode (optional), e.g.
+                {"group_by": ["series"], "points": 200, "method": "lttb"}
     """
     try:
-        # Convert input data to DataFrame
-        df = pd.DataFrame(data)
+        n_steps = len(_steps(transformations))
+        run = _ToolRun(ctx, total=n_steps + 1)
+        if handle is not None:
+            # Stored frames are shared, so the pipeline works on a copy
+            df, owned = dataset_store.get(handle, _tenant()).df, False
+        else:
+            df, owned = await run.run("transform", pd.DataFrame, data or []), True
         if df.empty:
             return TransformResult(
                 success=False,
                 message="No data provided for transformation"
             )
         
-        applied_steps = []
-        
-        # Apply each transformation
-        for step in transformations:
-            transform_name = step.get("name")
-            transform_params = step.get("params", {})
-            
-            if not transform_name:
-                continue
-                
-            # Build and apply transformation
-            transform = build_transform(transform_name, transform_params)
-            df = transform.apply(df)
-            applied_steps.append(f"{transform_name}({transform_params})")
-        
-        # Convert result back to list of dictionaries
-        result_data = df.to_dict(orient="records")
+        df, applied_steps = await run.run(
+            "transform", _transform_frame, df, transformations, owned, run.on_step(0)
+        )
+        await run.progress(n_steps, f"Preparing {output} output")
+        fields, note = await run.run(
+            "transform", _output, df, f"transform_data({handle or 'data'})", store, output,
+            output_options, _tenant(),
+        )
+        await run.progress(n_steps + 1, "Done")
         
-        return TransformResult(
+        return TransformResult.model_construct(
             success=True,
-            data=result_data,
-            row_count=len(result_data),
             steps_applied=applied_steps,
-            message=f"Successfully applied {len(applied_steps)} transformations"
+            message=f"Successfully applied {len(applied_steps)} transformations{note}",
+            **fields
         )
         
     except Exception as e:
@@ -185,13 +412,17 @@ def transform_data(
 
 
 @mcp.tool()
-def query_and_transform(
+async def query_and_transform(
     connector: str,
     connector_config: Dict[str, Any],
     transformations: List[Dict[str, Any]],
     select_columns: Optional[List[str]] = None,
     where_conditions: Optional[Dict[str, Any]] = None,
     limit: Optional[int] = None,
+    store: bool = False,
+    output: str = "rows",
+    output_options: Optional[Dict[str, Any]] = None,
+    ctx: Optional[Context] = None,
 ) -> TransformResult:
     """
     Query data from a connector and apply transformations in one step.
@@ -203,38 +434,158 @@ def query_and_transform(
         select_columns: Columns to select from the source
         where_conditions: Conditions for filtering source data
         limit: Maximum number of rows to process
+        store: Keep the result on the server and return a dataset handle (optional)
+        output: What to return (optional, default 'rows'): 'summary' (per-column
+                statistics), 'series_summary' (aggregates per series) or 'downsample'
+                (each series reduced to N points)
+        output_options: Options for the output mode (optional), e.g.
+                {"group_by": ["series"], "points": 200, "method": "lttb"}
     """
     try:
-        # First query the data
-        query_result = query_data(
-            connector=connector,
-            connector_config=connector_config,
-            select_columns=select_columns,
-            where_conditions=where_conditions,
-            limit=limit
-        )
-        
-        if not query_result.success:
+        query_spec = QuerySpec(select=select_columns, where=where_conditions, limit=limit)
+        n_steps = len(_steps(transformations))
+        run = _ToolRun(ctx, total=n_steps + 2)
+        await run.progress(0, f"Querying {connector}")
+        try:
+            df = await run.query(connector, connector_config, query_spec)
+        except Exception as e:
+            return TransformResult(
+                success=False,
+                message=f"Query failed: Error querying data: {str(e)}"
+            )
+        if df.empty:
             return TransformResult(
                 success=False,
-                message=f"Query failed: {query_result.message}"
+                message="No data provided for transformation"
             )
         
-        # Then apply transformations
-        transform_result = transform_data(
-            data=query_result.data,
-            transformations=transformations
+        # The frame stays columnar from the connector through the pipeline; rows are
+        # built once, for the response. Cached results are shared, so only fresh ones
+        # may be transformed in place.
+        query_rows = len(df)
+        owned = result_cache.ttl_for(connector) <= 0
+        df, applied_steps = await run.run(
+            "transform", _transform_frame, df, transformations, owned, run.on_step(1)
+        )
+        await run.progress(n_steps + 1, f"Preparing {output} output")
+        fields, note = await run.run(
+            "transform", _output, df, f"query_and_transform({connector})", store, output,
+            output_options, _tenant(),
         )
+        await run.progress(n_steps + 2, "Done")
         
-        # Enhance the message to include query info
-        if transform_result.success:
-            transform_result.message = (
-                f"Queried {query_result.row_count} rows from {connector}, "
-                f"applied {len(transform_result.steps_applied)} transformations, "
-                f"result: {transform_result.row_count} rows"
+        return TransformResult.model_construct(
+            success=True,
+            steps_applied=applied_steps,
+            message=(
+                f"Queried {query_rows} rows from {connector}, "
+                f"applied {len(applied_steps)} transformations, "
+                f"result: {len(df)} rows{note}"
+            ),
+            **fields
+        )
+        
+    except Exception as e:
+        return TransformResult(
+            success=False,
+            data=[],
+            row_count=0,
+            steps_applied=[],
+            message=f"Error in query and transform: {str(e)}"
+        )
+
+
+@mcp.tool()
+def get_dataset_rows(
+    handle: str,
+    offset: int = 0,
+    limit: int = 100,
+    columns: Optional[List[str]] = None,
+) -> DatasetPage:
+    """
+    Fetch a page of rows from a stored dataset.
+    
+    Args:
+        handle: Dataset handle returned by a tool called with store=true
+        offset: Index of the first row (default: 0)
+        limit: Maximum number of rows (default: 100)
+        columns: Only return these columns (optional)
+    """
+    try:
+        ds = dataset_store.get(handle, _tenant())
+        data = ds.rows(max(offset, 0), max(limit, 0), columns)
+        total = len(ds.df)
+        return DatasetPage.model_construct(
+            success=True,
+            handle=handle,
+            offset=offset,
+            data=data,
+            row_count=len(data),
+            total_rows=total,
+            message=f"Rows {offset}-{offset + len(data)} of {total}"
+        )
+    except Exception as e:
+        return DatasetPage(
+            success=False,
+            handle=handle,
+            message=f"Error reading dataset: {str(e)}"
+        )
+
+
+@mcp.tool()
+def list_datasets() -> Dict[str, Any]:
+    """List stored datasets with their schema, row count and time left before expiry."""
+    tenant = _tenant()
+    return {"datasets": dataset_store.list(tenant), "stats": dataset_store.stats(tenant)}
+
+
+@mcp.tool()
+def drop_dataset(handle: str) -> Dict[str, Any]:
+    """
+    Release a stored dataset before it expires.
+    
+    Args:
+        handle: Dataset handle to drop
+    """
+    return {"dropped": dataset_store.drop(handle, _tenant())}
+
+
+@mcp.tool()
+async def append_to_stream(
+    stream: str,
+    data: List[Dict[str, Any]],
+    transformations: Optional[List[Dict[str, Any]]] = None,
+) -> TransformResult:
+    """
+    Append rows to a named stream and get transformed values for the new rows only.
+    
+    Args:
+        stream: Name of the stream
+        data: New data records, in arrival order
+        transformations: Steps for a new stream (moving_average, normalize); when given
+                        for an existing stream, it is reset with these steps
+    """
+    try:
+        if transformations is not None:
+            target = streams.create(
+                stream, _steps(transformations), replace=True, tenant=_tenant()
             )
+        else:
+            target = streams.get(stream, _tenant())
         
-        return transform_result
+        df = await work_pool.run("stream", target.append, pd.DataFrame(data))
+        result_data = df.to_dict(orient="records")
+        
+        return TransformResult(
+            success=True,
+            data=result_data,
+            row_count=len(result_data),
+            steps_applied=[f"{name}({params})" for name, params in target.steps],
+            message=(
+                f"Appended {len(result_data)} rows to stream '{stream}' "
+                f"({target.rows_seen} total)"
+            ),
+        )
         
     except Exception as e:
         return TransformResult(
@@ -242,10 +593,16 @@ def query_and_transform(
             data=[],
             row_count=0,
             steps_applied=[],
-            message=f"Error in query and transform: {str(e)}"
+            message=f"Error appending to stream: {str(e)}"
         )
 
 
+@mcp.tool()
+def list_streams() -> Dict[str, Any]:
+    """List named streams with their steps and the number of rows appended so far."""
+    return {"streams": streams.list(_tenant())}
+
+
 @mcp.tool()
 async def get_sample_data(ctx: Context) -> Dict[str, Any]:
     """
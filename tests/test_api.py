@@ -1,9 +1,237 @@
+import asyncio
+import json
+import threading
+
+import pandas as pd
+import pytest
 from fastapi.testclient import TestClient
+
+import ctl_api.main as main
 from ctl_api.main import app
+from ctl_core.executor import Overloaded, WorkPool
+from ctl_core.formats import encode
 
 
 def test_health():
     client = TestClient(app)
     r = client.get("/health")
     assert r.status_code == 200
-    assert r.json()["status"] == "ok"
\ No newline at end of file
+    assert r.json()["status"] == "ok"
+
+def _write_csv(tmp_path):
+    path = tmp_path / "example.csv"
+    path.write_text(
+        "date,series,value\n"
+        "2023-01,GDP,100\n2023-02,GDP,110\n2023-03,CPI,1.5\n2023-04,GDP,120\n"
+    )
+    return str(path)
+
+
+def test_query_runs_on_worker_pool(tmp_path):
+    client = TestClient(app)
+    r = client.post(
+        "/query",
+        json={
+            "connector": "local",
+            "connector_config": {"path": _write_csv(tmp_path)},
+            "query": {"where": {"series": "GDP"}, "limit": 2},
+        },
+    )
+    assert r.status_code == 200
+    assert [row["value"] for row in r.json()] == [100, 110]
+
+
+def test_overloaded_pool_returns_503(tmp_path, monkeypatch):
+    monkeypatch.setattr(main, "work_pool", WorkPool(max_pending=0))
+    client = TestClient(app)
+    r = client.post(
+        "/query",
+        json={"connector": "local", "connector_config": {"path": _write_csv(tmp_path)},
+              "query": {}},
+    )
+    assert r.status_code == 503
+    assert r.headers["Retry-After"] == "1"
+    assert client.get("/health").status_code == 200
+
+
+def test_native_async_query_skips_worker_pool(tmp_path, monkeypatch):
+    import sqlite3
+    import pandas as pd
+
+    pytest.importorskip("aiosqlite")
+    db = tmp_path / "series.db"
+    with sqlite3.connect(db) as conn:
+        pd.DataFrame({"series": ["GDP", "CPI", "GDP"], "value": [1.0, 2.0, 3.0]}).to_sql(
+            "obs", conn, index=False
+        )
+    # No worker slots: only queries awaited on the event loop can succeed
+    monkeypatch.setattr(main, "work_pool", WorkPool(max_pending=0))
+    with TestClient(app) as client:
+        r = client.post(
+            "/query",
+            json={
+                "connector": "mysql",
+                "connector_config": {"url": f"sqlite:///{db}", "table": "obs"},
+                "query": {"where": {"series": "GDP"}},
+                "format": "ndjson",
+            },
+        )
+    assert r.status_code == 200
+    assert [json.loads(line)["value"] for line in r.text.splitlines()] == [1.0, 3.0]
+
+
+def test_full_lane_raises_overloaded():
+    pool = WorkPool(concurrency=1, queue_depth=1)
+    gate = threading.Event()
+    running = [pool.submit("transform", gate.wait), pool.submit("transform", gate.wait)]
+    with pytest.raises(Overloaded) as exc:
+        asyncio.run(pool.run("transform", lambda: None))
+    assert exc.value.scope == "lane"
+    # Other lanes are unaffected
+    assert asyncio.run(pool.run("query", lambda: 42)) == 42
+    gate.set()
+    for fut in running:
+        fut.result(timeout=5)
+    assert pool.stats()["pending"] == 0
+    pool.shutdown()
+
+
+def test_streamed_query_stays_on_its_lane(monkeypatch):
+    pool = WorkPool()
+    seen = []
+
+    class Source:
+        def query_iter(self, spec, chunk_rows):
+            try:
+                for i in range(3):
+                    seen.append((threading.current_thread().name, pool.stats()["pending"]))
+                    yield pd.DataFrame({"value": [i]})
+            finally:
+                seen.append(threading.current_thread().name)
+
+    monkeypatch.setattr(main, "work_pool", pool)
+    monkeypatch.setattr(main, "build_connector", lambda name, cfg: Source())
+    r = TestClient(app).post("/query", json={"connector": "local", "query": {}})
+    assert [row["value"] for row in r.json()] == [0, 1, 2]
+    # Every chunk is read on a query-lane thread while the stream holds its slot
+    assert all(name.startswith("ctl-query") and pending >= 1 for name, pending in seen[:3])
+    assert seen[3].startswith("ctl-query")
+    assert pool.stats()["pending"] == 0
+    pool.shutdown()
+
+
+def test_query_streams_requested_format(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    client = TestClient(app)
+    body = {
+        "connector": "local",
+        "connector_config": {"path": _write_csv(tmp_path)},
+        "query": {"where": {"series": "GDP"}},
+    }
+
+    r = client.post("/query", json=body, headers={"Accept": "application/vnd.apache.arrow.stream"})
+    assert r.status_code == 200
+    assert r.headers["content-type"] == "application/vnd.apache.arrow.stream"
+    table = pa.ipc.open_stream(r.content).read_all()
+    assert table.column("value").to_pylist() == [100, 110, 120]
+
+    r = client.post("/query", json={**body, "format": "ndjson"})
+    rows = [json.loads(line) for line in r.text.splitlines()]
+    assert rows[0] == {"date": "2023-01", "series": "GDP", "value": 100}
+    assert len(rows) == 3
+
+    r = client.post("/query", json={**body, "format": "xml"})
+    assert r.status_code == 406
+
+    r = client.post("/query", json=body, headers={"Accept": "application/vnd.apache.arrow.file"})
+    assert r.status_code == 406
+    r = client.post("/query", json=body, headers={"Accept": "text/html, */*;q=0.1"})
+    assert r.headers["content-type"].startswith("application/json")
+
+
+@pytest.mark.parametrize("fmt", ["json", "ndjson", "csv"])
+def test_encode_streams_before_the_source_is_exhausted(fmt):
+    read = []
+
+    def source():
+        for i in range(50):
+            read.append(i)
+            yield pd.DataFrame({"value": [float(i)]})
+
+    body = encode(source(), fmt)
+    assert next(body)
+    assert len(read) < 50
+
+
+@pytest.mark.parametrize("fmt", ["arrow", "parquet"])
+def test_arrow_formats_cast_chunks_whose_dtypes_drift(tmp_path, fmt):
+    pa = pytest.importorskip("pyarrow")
+    from ctl_core.connectors.base import QuerySpec
+    from ctl_core.registry import build_connector
+
+    path = tmp_path / "codes.csv"
+    path.write_text("code,value\nA1,1.5\nB2,2.5\n3,3\n4,4\n")
+    conn = build_connector("local", {"path": str(path), "use_cache": False})
+    chunks = list(conn.query_iter(QuerySpec(), chunk_rows=2))
+    assert chunks[0]["code"].dtype != chunks[1]["code"].dtype
+    body = b"".join(encode(iter(chunks), fmt))
+    if fmt == "arrow":
+        table = pa.ipc.open_stream(body).read_all()
+    else:
+        import pyarrow.parquet as pq
+        table = pq.read_table(pa.BufferReader(body))
+    assert table.column("code").to_pylist() == ["A1", "B2", "3", "4"]
+    assert table.column("value").to_pylist() == [1.5, 2.5, 3.0, 4.0]
+
+    clash = [pd.DataFrame({"n": [1, 2]}), pd.DataFrame({"n": [1.5]})]
+    with pytest.raises(ValueError, match="schema of earlier chunks"):
+        b"".join(encode(iter(clash), fmt))
+
+
+def test_json_formats_round_trip_floats():
+    values = [3 / 13, 0.1 + 0.2, 1e-300, 123456789.12345679, float("nan")]
+    df = pd.DataFrame({"value": values, "when": pd.to_datetime(["2024-01-01"] * 4 + [None])})
+    rows = json.loads(b"".join(encode([df.iloc[:2], df.iloc[2:]], "json")))
+    assert [r["value"] for r in rows] == values[:4] + [None]
+    assert rows[0]["when"] == "2024-01-01T00:00:00" and rows[-1]["when"] is None
+    lines = b"".join(encode([df], "ndjson")).decode().splitlines()
+    assert [json.loads(line)["value"] for line in lines] == values[:4] + [None]
+
+
+def test_result_cache_endpoints(tmp_path, monkeypatch):
+    monkeypatch.setattr(main.result_cache, "default_ttl", 60.0)
+    client = TestClient(app)
+    body = {"connector": "local", "connector_config": {"path": _write_csv(tmp_path)}, "query": {}}
+    before = client.get("/cache/stats").json()["results"]
+    assert client.post("/query", json=body).json() == client.post("/query", json=body).json()
+    stats = client.get("/cache/stats").json()["results"]
+    assert stats["misses"] == before["misses"] + 1
+    assert stats["memory_hits"] == before["memory_hits"] + 1
+    assert client.post("/cache/invalidate", json={"connector": "local"}).json()["invalidated"] >= 1
+
+
+def test_transform_explain_and_filter_pushdown(tmp_path):
+    client = TestClient(app)
+    body = {
+        "input": {
+            "connector": "local",
+            "connector_config": {"path": _write_csv(tmp_path)},
+            "query": {},
+        },
+        "pipeline": [
+            {"name": "moving_average",
+             "params": {"column": "value", "window": 2, "group_by": "series"}},
+            {"name": "filter", "params": {"where": {"series": "GDP"}}},
+        ],
+        "outputs": ["date", "value_ma2"],
+    }
+    plan = client.post("/transform/explain", json=body).json()["physical"]
+    assert plan["pushed_where"] == {"series": "GDP"}
+    assert [n["op"] for n in plan["nodes"]] == ["moving_average"]
+
+    rows = client.post("/transform", json=body).json()
+    assert rows == [
+        {"date": "2023-01", "value_ma2": 100.0},
+        {"date": "2023-02", "value_ma2": 105.0},
+        {"date": "2023-04", "value_ma2": 115.0},
+    ]
@@ -0,0 +1,115 @@
+"""
+Test Azure AD token validation against a local stand-in JWKS server
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+from ctl_core.auth.azure_ad import AzureADConfig, AzureADVerifier
+
+AUDIENCE = "api://ctl-test"
+
+
+def _make_key(kid):
+    private = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    pem = private.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    )
+    public = jwk.construct(pem, "RS256").public_key().to_dict()
+    public["kid"] = kid
+    return pem, public
+
+
+@pytest.fixture
+def jwks_server():
+    """Serve a mutable JWKS document and count the requests it receives."""
+    state = {"keys": [], "hits": 0}
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            state["hits"] += 1
+            body = json.dumps({"keys": state["keys"]}).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = HTTPServer(("127.0.0.1", 0), Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    state["uri"] = f"http://127.0.0.1:{server.server_port}/keys"
+    yield state
+    server.shutdown()
+
+
+def _token(pem, kid, **claims):
+    payload = {"aud": AUDIENCE, "exp": int(time.time()) + 600, **claims}
+    return jwt.encode(payload, pem, algorithm="RS256", headers={"kid": kid})
+
+
+def test_warm_keys_and_tokens_skip_fetches(jwks_server):
+    pem, public = _make_key("k1")
+    jwks_server["keys"] = [public]
+    verifier = AzureADVerifier(
+        AzureADConfig(tenant_id="t", audience=AUDIENCE, jwks_uri=jwks_server["uri"])
+    )
+
+    async def run():
+        await verifier.validate(_token(pem, "k1", sub="warmup"))
+        hits_after_warmup = jwks_server["hits"]
+        for i in range(5):
+            claims = await verifier.validate(_token(pem, "k1", sub=f"user{i}"))
+            assert claims["sub"] == f"user{i}"
+        token = _token(pem, "k1", sub="repeat")
+        assert await verifier.validate(token) is await verifier.validate(token)
+        return hits_after_warmup
+
+    assert asyncio.run(run()) == 1
+    assert jwks_server["hits"] == 1
+
+
+def test_unknown_kid_refetches_once(jwks_server):
+    pem1, public1 = _make_key("k1")
+    pem2, public2 = _make_key("k2")
+    jwks_server["keys"] = [public1]
+    verifier = AzureADVerifier(
+        AzureADConfig(tenant_id="t", audience=AUDIENCE, jwks_uri=jwks_server["uri"])
+    )
+
+    async def run():
+        await verifier.validate(_token(pem1, "k1"))
+        # Rotated key: the verifier refetches and finds it
+        jwks_server["keys"] = [public1, public2]
+        await verifier.validate(_token(pem2, "k2"))
+        assert jwks_server["hits"] == 2
+        # Unknown kid right after a refetch is rejected without another fetch
+        with pytest.raises(ValueError, match="Key not found"):
+            await verifier.validate(_token(pem2, "k3"))
+        assert jwks_server["hits"] == 2
+
+    asyncio.run(run())
+
+
+def test_expired_token_rejected(jwks_server):
+    pem, public = _make_key("k1")
+    jwks_server["keys"] = [public]
+    verifier = AzureADVerifier(
+        AzureADConfig(tenant_id="t", audience=AUDIENCE, jwks_uri=jwks_server["uri"])
+    )
+    token = _token(pem, "k1", exp=int(time.time()) - 10)
+    with pytest.raises(ValueError, match="expired"):
+        asyncio.run(verifier.validate(token))
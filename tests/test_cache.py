@@ -0,0 +1,92 @@
+"""
+Test the connector result cache
+"""
+
+import pandas as pd
+import pytest
+
+from ctl_core.cache import ResultCache, _redact, cache_key
+from ctl_core.connectors.base import QuerySpec
+
+
+def test_cache_key_separates_credentials_and_tenants(monkeypatch):
+    spec = QuerySpec(where={"series": "GDP"})
+    a = {"url": "mysql+pymysql://etl:s3cret@db:3306/econ", "table": "obs"}
+    b = {"url": "mysql+pymysql://etl:rotated@db:3306/econ", "table": "obs"}
+    assert cache_key("mysql", a, spec) == cache_key("mysql", dict(a), spec)
+    assert cache_key("mysql", a, spec) != cache_key("mysql", b, spec)
+    assert cache_key("databricks", {"access_token": "x", "table": "t"}, spec) != cache_key(
+        "databricks", {"access_token": "y", "table": "t"}, spec
+    )
+    # Credentials are keyed only through a salted HMAC, never in plain text
+    config, creds = _redact(a)
+    assert config == {"url": "mysql+pymysql://etl@db:3306/econ", "table": "obs"}
+    assert creds == {"url": ["s3cret"]}
+    key = cache_key("mysql", a, spec)
+    monkeypatch.setattr("ctl_core.cache._KEY_SALT", b"another process")
+    assert cache_key("mysql", a, spec) != key
+    assert cache_key("mysql", a, spec, tenant="t1") != cache_key("mysql", a, spec, tenant="t2")
+    assert cache_key("mysql", a, spec) != cache_key("mysql", a, QuerySpec(limit=5))
+
+
+def test_result_cache_tiers_ttl_and_invalidation(tmp_path):
+    pytest.importorskip("pyarrow")
+    calls = []
+
+    def run():
+        calls.append(1)
+        return pd.DataFrame({"series": ["GDP"], "value": [1.0]})
+
+    cache = ResultCache(ttls={"local": 60}, disk_dir=str(tmp_path))
+    spec = QuerySpec()
+    first = cache.get_or_query("local", {"path": "a.csv"}, spec, run)
+    first["value"] = 99.0  # callers may modify what they get back
+    again = cache.get_or_query("local", {"path": "a.csv"}, spec, run)
+    assert again["value"].tolist() == [1.0]
+    assert len(calls) == 1
+
+    # A fresh process-level memory tier still finds the result on disk
+    cold = ResultCache(ttls={"local": 60}, disk_dir=str(tmp_path))
+    cold.get_or_query("local", {"path": "a.csv"}, spec, run)
+    assert cold.stats()["disk_hits"] == 1 and len(calls) == 1
+
+    # Connectors without a TTL are never cached
+    cache.get_or_query("mysql", {}, spec, run)
+    cache.get_or_query("mysql", {}, spec, run)
+    assert len(calls) == 3
+
+    assert cache.invalidate("local") == 2  # memory + disk
+    cache.get_or_query("local", {"path": "a.csv"}, spec, run)
+    assert len(calls) == 4
+    assert cache.stats()["memory_hits"] == 1
+
+
+def test_disk_tier_io_runs_outside_the_cache_lock(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    import threading
+
+    blocked = []
+
+    def watched(cache):
+        # Disk reads and writes check that another thread can use the cache meanwhile
+        def wrap(real):
+            def io(*args):
+                t = threading.Thread(target=cache.stats)
+                t.start()
+                t.join(timeout=2)
+                blocked.append(t.is_alive())
+                return real(*args)
+            return io
+        monkeypatch.setattr(cache, "_disk_get", wrap(cache._disk_get))
+        monkeypatch.setattr(cache, "_disk_put", wrap(cache._disk_put))
+        return cache
+
+    def run():
+        return pd.DataFrame({"value": [1.0]})
+
+    writer = watched(ResultCache(ttls={"local": 60}, disk_dir=str(tmp_path)))
+    writer.get_or_query("local", {"path": "a.csv"}, QuerySpec(), run)
+    reader = watched(ResultCache(ttls={"local": 60}, disk_dir=str(tmp_path)))
+    df = reader.get_or_query("local", {"path": "a.csv"}, QuerySpec(), run)
+    assert df["value"].tolist() == [1.0] and reader.stats()["disk_hits"] == 1
+    assert blocked == [False, False, False]
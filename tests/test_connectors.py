@@ -0,0 +1,303 @@
+"""
+Test connector behaviour against local stand-ins (files, SQLite)
+"""
+
+import sqlite3
+
+import pandas as pd
+import pytest
+
+import ctl_core.connectors.local as local
+from ctl_core.connectors.base import QuerySpec
+from ctl_core.connectors.csv_cache import CsvColumnarCache
+from ctl_core.connectors.engines import dispose_engines, get_engine, pool_stats
+from ctl_core.registry import build_connector
+
+
+@pytest.fixture
+def sqlite_url(tmp_path):
+    pytest.importorskip("sqlalchemy")
+    db = tmp_path / "series.db"
+    with sqlite3.connect(db) as conn:
+        pd.DataFrame(
+            {
+                "date": ["2023-01", "2023-02", "2023-03", "2023-04"],
+                "series": ["GDP", "GDP", "CPI", "CPI"],
+                "value": [100.0, 110.0, 1.5, 1.7],
+            }
+        ).to_sql("obs", conn, index=False)
+    yield f"sqlite:///{db}"
+    dispose_engines()
+
+
+def test_sql_connectors_share_pooled_engine(sqlite_url):
+    """Engines are created once per URL and reused across connector instances."""
+    for _ in range(3):
+        conn = build_connector("mysql", {"url": sqlite_url, "table": "obs"})
+        df = conn.query(QuerySpec(select=["date", "value"], where={"series": "GDP"}))
+        assert list(df["value"]) == [100.0, 110.0]
+
+    assert get_engine(sqlite_url) is get_engine(sqlite_url)
+    stats = [s for s in pool_stats() if s["url"] == sqlite_url]
+    assert len(stats) == 1
+    assert stats[0]["checkedout"] == 0
+    assert stats[0]["checkedin"] == 1
+
+
+@pytest.fixture
+def series_frame():
+    n = 10_000
+    return pd.DataFrame(
+        {
+            "date": pd.date_range("2000-01-01", periods=n, freq="D").strftime("%Y-%m-%d"),
+            "series": ["GDP", "CPI", "UNEMP", "M2"] * (n // 4),
+            "value": range(n),
+            "note": ["x"] * n,
+        }
+    )
+
+
+def test_parquet_pushdown_matches_pandas(tmp_path, series_frame):
+    pytest.importorskip("pyarrow")
+    path = tmp_path / "series.parquet"
+    series_frame.to_parquet(path, row_group_size=1000)
+    conn = build_connector("local", {"path": str(path)})
+
+    df = conn.query(QuerySpec(select=["date", "value"], where={"series": "CPI"}, limit=5))
+    expected = series_frame[series_frame["series"] == "CPI"][["date", "value"]].head(5)
+    pd.testing.assert_frame_equal(df, expected.reset_index(drop=True))
+
+    # Filter values are coerced to the column type; uncoercible values match nothing
+    assert conn.query(QuerySpec(where={"value": "42"}))["series"].tolist() == ["UNEMP"]
+    assert conn.query(QuerySpec(where={"value": "abc"})).empty
+
+
+def test_chunked_csv_scan_matches_full_read(tmp_path, series_frame):
+    path = tmp_path / "series.csv"
+    series_frame.to_csv(path, index=False)
+    chunked = build_connector("local", {"path": str(path), "chunk_rows": 333})
+    full = build_connector("local", {"path": str(path), "chunk_rows": None})
+
+    for spec in [
+        QuerySpec(select=["value", "series", "date"], where={"series": "GDP"}, limit=10),
+        QuerySpec(where={"series": "M2"}),
+        QuerySpec(select=["date"], limit=1000),
+        QuerySpec(where={"value": "42"}),
+        QuerySpec(select=["date"], where={"series": "CPI"}),
+    ]:
+        pd.testing.assert_frame_equal(chunked.query(spec), full.query(spec))
+
+    assert full.query(QuerySpec(where={"value": "42"}))["series"].tolist() == ["UNEMP"]
+
+
+def test_csv_columnar_cache(tmp_path, series_frame, monkeypatch):
+    pytest.importorskip("pyarrow")
+    cache = CsvColumnarCache(str(tmp_path / "cache"), max_bytes=10**9)
+    monkeypatch.setattr(local, "csv_cache", cache)
+    path = tmp_path / "series.csv"
+    series_frame.to_csv(path, index=False)
+    cached = build_connector("local", {"path": str(path)})
+    uncached = build_connector("local", {"path": str(path), "use_cache": False})
+
+    spec = QuerySpec(select=["date", "series", "value"], where={"series": "GDP"}, limit=50)
+    pd.testing.assert_frame_equal(cached.query(spec), uncached.query(spec))
+    entries = list((tmp_path / "cache").glob("*.arrow"))
+    assert len(entries) == 1
+
+    # Served from the cached file on repeat; a changed source gets a new entry
+    cached.query(spec)
+    assert list((tmp_path / "cache").glob("*.arrow")) == entries
+    series_frame.head(10).to_csv(path, index=False)
+    assert len(cached.query(QuerySpec())) == 10
+
+    # The size cap evicts the least recently used entry
+    cache.max_bytes = 1
+    cache.evict()
+    assert list((tmp_path / "cache").glob("*.arrow")) == []
+
+
+@pytest.mark.parametrize("select", [["date", "series", "value"], None])
+def test_sql_pushdown_matches_pandas(sqlite_url, select):
+    from ctl_core.pipeline import StageCache, run_pipeline
+
+    steps = [
+        ("filter", {"where": {"series": ["GDP", "CPI"]}}),
+        ("moving_average",
+         {"column": "value", "window": 2, "group_by": "series", "order_by": "date"}),
+        ("normalize", {"columns": ["value"], "group_by": "series"}),
+        ("seasonal_adjustment", {"column": "value", "period": 12}),
+    ]
+    conn = build_connector("mysql", {"url": sqlite_url, "table": "obs"})
+    spec = QuerySpec(select=select)
+    df, pushed = conn.query_pushdown(spec, steps)
+    # normalize needs an explicit column list to be replaced in SQL
+    assert pushed == (3 if select else 2)
+
+    expected = run_pipeline(conn.query(spec), steps[:pushed], cache=StageCache(max_bytes=0))
+    pd.testing.assert_frame_equal(
+        df.sort_values("date").reset_index(drop=True),
+        expected.sort_values("date").reset_index(drop=True),
+    )
+
+
+class _FakeCursor:
+    def __init__(self, table, log):
+        self.table, self.log, self.offset = table, log, 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def execute(self, sql, params):
+        self.log.append(("execute", sql, params))
+        self.offset = 0
+
+    def fetchmany_arrow(self, size):
+        batch = self.table.slice(self.offset, size)
+        self.offset += batch.num_rows
+        self.log.append(("fetchmany_arrow", batch.num_rows))
+        return batch
+
+    def fetchall(self):  # pragma: no cover - the Arrow path must not use it
+        raise AssertionError("fetchall called")
+
+
+class _FakeConnection:
+    open = True
+
+    def __init__(self, table, log):
+        self.table, self.log = table, log
+
+    def cursor(self):
+        return _FakeCursor(self.table, self.log)
+
+    def close(self):
+        self.open = False
+
+
+def test_databricks_fetches_arrow_batches_over_pooled_connection(monkeypatch):
+    pa = pytest.importorskip("pyarrow")
+    import types
+    import ctl_core.connectors.databricks as databricks
+
+    table = pa.table({"series": ["GDP"] * 5, "value": [1.0, 2.0, 3.0, 4.0, 5.0]})
+    log, connects = [], []
+
+    def connect(**kwargs):
+        connects.append(kwargs)
+        return _FakeConnection(table, log)
+
+    monkeypatch.setattr(databricks, "dbsql", types.SimpleNamespace(connect=connect))
+    cfg = {"server_hostname": "h", "http_path": "/sql/1", "access_token": "secret",
+           "table": "main.obs", "fetch_rows": 2}
+    try:
+        for _ in range(2):
+            df = build_connector("databricks", cfg).query(QuerySpec(where={"series": "GDP"}))
+            pd.testing.assert_frame_equal(df, table.to_pandas())
+        assert len(connects) == 1
+        assert [n for kind, *n in log if kind == "fetchmany_arrow"][:4] == [[2], [2], [1], [0]]
+        assert log[0][1:] == (
+            "SELECT * FROM `main`.`obs` WHERE `series` = :p0", {"p0": "GDP"}
+        )
+        assert all("secret" not in s["url"] for s in pool_stats())
+    finally:
+        dispose_engines()
+
+
+def test_query_iter_streams_chunks(sqlite_url, tmp_path, series_frame, monkeypatch):
+    conn = build_connector("mysql", {"url": sqlite_url, "table": "obs"})
+    chunks = list(conn.query_iter(QuerySpec(), chunk_rows=3))
+    assert [len(c) for c in chunks] == [3, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), conn.query(QuerySpec()))
+    empty = list(conn.query_iter(QuerySpec(where={"series": "none"}), chunk_rows=3))
+    assert len(empty) == 1 and list(empty[0].columns) == ["date", "series", "value"]
+
+    path = tmp_path / "series.csv"
+    series_frame.to_csv(path, index=False)
+    monkeypatch.setattr(local, "csv_cache", None)
+    spec = QuerySpec(select=["value"], where={"series": "CPI"}, limit=2400)
+    csv = build_connector("local", {"path": str(path)})
+    chunks = list(csv.query_iter(spec, chunk_rows=1000))
+    assert len(chunks) > 1 and max(len(c) for c in chunks) <= 1000
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), csv.query(spec))
+
+
+def test_split_range_types():
+    import datetime as dt
+    from ctl_core.connectors.partitioned import split_range
+
+    assert split_range(0, 100, 4) == [25, 50, 75]
+    assert split_range("2023-01-01", "2023-01-05", 4) == [
+        "2023-01-02", "2023-01-03", "2023-01-04"
+    ]
+    assert split_range(dt.date(2023, 1, 1), dt.date(2023, 1, 3), 2) == [dt.date(2023, 1, 2)]
+    assert split_range(5, 5, 4) == []
+
+
+@pytest.mark.parametrize(
+    "partition",
+    [
+        {"column": "date", "num_partitions": 3},
+        {"column": "value", "num_partitions": 4, "lower": 1.0, "upper": 50.0},
+    ],
+)
+def test_partitioned_read_matches_single_query(sqlite_url, partition):
+    from ctl_core.connectors.base import Partition
+
+    with sqlite3.connect(sqlite_url.removeprefix("sqlite:///")) as conn:
+        conn.execute("INSERT INTO obs VALUES (NULL, 'GDP', 120.0)")
+    conn = build_connector("mysql", {"url": sqlite_url, "table": "obs"})
+    plain = conn.query(QuerySpec(select=["date", "value"], where={"series": "GDP"}))
+    spec = QuerySpec(
+        select=["date", "value"], where={"series": "GDP"}, partition=Partition(**partition)
+    )
+    parts = conn.query(spec)
+    pd.testing.assert_frame_equal(
+        parts.sort_values("value").reset_index(drop=True),
+        plain.sort_values("value").reset_index(drop=True),
+    )
+    spec.limit = 2
+    assert len(conn.query(spec)) == 2
+
+
+def test_async_queries_match_sync(sqlite_url, tmp_path, series_frame, monkeypatch):
+    import asyncio
+    from ctl_core.connectors.engines import dispose_async_engines
+
+    pytest.importorskip("aiosqlite")
+    conn = build_connector("mysql", {"url": sqlite_url, "table": "obs"})
+    assert conn.native_async
+    spec = QuerySpec(select=["date", "value"], where={"series": "GDP"})
+
+    async def run():
+        try:
+            # Many queries share the event loop and the async engine's pool
+            frames = await asyncio.gather(*(conn.aquery(spec) for _ in range(8)))
+            chunks = [c async for c in conn.aquery_iter(QuerySpec(), chunk_rows=3)]
+            empty = [c async for c in conn.aquery_iter(QuerySpec(where={"series": "x"}))]
+            return frames, chunks, empty
+        finally:
+            await dispose_async_engines()
+
+    frames, chunks, empty = asyncio.run(run())
+    for df in frames:
+        pd.testing.assert_frame_equal(df, conn.query(spec))
+    assert [len(c) for c in chunks] == [3, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), conn.query(QuerySpec()))
+    assert len(empty) == 1 and list(empty[0].columns) == ["date", "series", "value"]
+
+    # Local files fall back to scanning in worker threads
+    path = tmp_path / "series.csv"
+    series_frame.to_csv(path, index=False)
+    monkeypatch.setattr(local, "csv_cache", None)
+    csv = build_connector("local", {"path": str(path)})
+    assert not csv.native_async
+
+    async def scan():
+        return [c async for c in csv.aquery_iter(QuerySpec(limit=2400), chunk_rows=1000)]
+
+    pd.testing.assert_frame_equal(
+        pd.concat(asyncio.run(scan()), ignore_index=True), csv.query(QuerySpec(limit=2400))
+    )
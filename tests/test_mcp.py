@@ -2,6 +2,8 @@
 Test MCP functionality
 """
 
+import asyncio
+
 import pytest
 from ctl_mcp.server import (
     query_data,
@@ -44,7 +46,7 @@ def test_transform_data():
         {"name": "normalize", "params": {"columns": ["value"]}}
     ]
     
-    result = transform_data(sample_data, transformations)
+    result = asyncio.run(transform_data(sample_data, transformations))
     
     assert result.success is True
     assert len(result.data) == 5
@@ -72,7 +74,7 @@ def test_transform_data_moving_average():
         {"name": "moving_average", "params": {"column": "value", "window": 3}}
     ]
     
-    result = transform_data(sample_data, transformations)
+    result = asyncio.run(transform_data(sample_data, transformations))
     
     assert result.success is True
     assert len(result.data) == 5
@@ -83,7 +85,7 @@ def test_transform_data_moving_average():
 
 def test_empty_data_transform():
     """Test transformation with empty data."""
-    result = transform_data([], [])
+    result = asyncio.run(transform_data([], []))
     assert result.success is False
     assert "No data provided" in result.message
 
@@ -93,22 +95,249 @@ def test_invalid_transform():
     sample_data = [{"value": 100}]
     transformations = [{"name": "invalid_transform", "params": {}}]
     
-    result = transform_data(sample_data, transformations)
+    result = asyncio.run(transform_data(sample_data, transformations))
     # Should handle gracefully and return error
     assert result.success is False or len(result.steps_applied) == 0
 
 
 def test_query_local_connector_invalid_path():
     """Test querying with invalid file path."""
-    result = query_data(
+    result = asyncio.run(query_data(
         connector="local",
         connector_config={"path": "nonexistent.csv"},
         select_columns=["date", "value"]
-    )
+    ))
     
     assert result.success is False
     assert "Error querying data" in result.message
 
 
+def test_query_and_transform_matches_chained_tools(tmp_path):
+    """Test the fused tool against query_data followed by transform_data."""
+    import json
+    from ctl_mcp.server import mcp, query_and_transform
+
+    path = tmp_path / "series.csv"
+    path.write_text(
+        "date,series,value\n"
+        + "".join(f"2023-{m:02d},{s},{m * (2 if s == 'CPI' else 1)}\n"
+                  for m in range(1, 13) for s in ("GDP", "CPI"))
+    )
+    config = {"path": str(path)}
+    steps = [
+        {"name": "moving_average",
+         "params": {"column": "value", "window": 3, "group_by": ["series"]}},
+        {"name": "normalize", "params": {"columns": ["value"], "group_by": ["series"]}},
+    ]
+    queried = asyncio.run(query_data("local", config))
+    chained = asyncio.run(transform_data(queried.data, steps))
+    fused = asyncio.run(query_and_transform("local", config, steps))
+    assert fused.success and fused.data == chained.data
+    assert fused.steps_applied == chained.steps_applied
+    assert fused.message.startswith("Queried 24 rows from local")
+
+    # Results built without per-row validation still serialize through the server
+    _, structured = asyncio.run(
+        mcp.call_tool("query_and_transform", {
+            "connector": "local", "connector_config": config, "transformations": steps,
+        })
+    )
+    assert structured["row_count"] == 24
+    assert json.dumps(structured["data"][0])
+
+
+def test_query_tools_cache_under_a_tenant(tmp_path, monkeypatch):
+    """Test MCP queries reach the result cache with the caller's tenant."""
+    import ctl_mcp.server as server
+
+    tenants = []
+    real = server.result_cache.get_or_query
+
+    def spy(*args, tenant=None, **kwargs):
+        tenants.append(tenant)
+        return real(*args, tenant=tenant, **kwargs)
+
+    monkeypatch.setattr(server.result_cache, "get_or_query", spy)
+    path = tmp_path / "series.csv"
+    path.write_text("date,value\n2023-01,1\n")
+    asyncio.run(query_data("local", {"path": str(path)}))
+    asyncio.run(server.query_and_transform("local", {"path": str(path)}, []))
+    assert tenants == [server.settings.mcp_tenant] * 2
+
+
+def test_dataset_handles(tmp_path):
+    """Test storing results server-side and chaining/paging them by handle."""
+    from ctl_mcp.server import get_dataset_rows, drop_dataset
+
+    path = tmp_path / "series.csv"
+    path.write_text("date,value\n" + "".join(f"2023-{m:02d},{m}\n" for m in range(1, 13)))
+    stored = asyncio.run(query_data("local", {"path": str(path)}, store=True))
+    assert stored.success and stored.data == [] and stored.row_count == 12
+    ds = stored.dataset
+    assert [c["name"] for c in ds.columns] == ["date", "value"]
+    assert len(ds.preview) == min(12, 10)
+
+    result = asyncio.run(transform_data(
+        handle=ds.handle,
+        transformations=[{"name": "normalize", "params": {"columns": ["value"]}}],
+        store=True,
+    ))
+    assert result.success and result.dataset.handle != ds.handle
+    page = get_dataset_rows(result.dataset.handle, offset=10, limit=5, columns=["value"])
+    assert page.total_rows == 12 and page.data == [{"value": 10 / 11}, {"value": 1.0}]
+    # The stored query result is untouched by the transform
+    assert get_dataset_rows(ds.handle, limit=1).data[0]["value"] == 1
+
+    assert drop_dataset(ds.handle)["dropped"]
+    missing = get_dataset_rows(ds.handle)
+    assert missing.success is False and "Unknown or expired" in missing.message
+
+
+def test_dataset_handles_are_scoped_to_the_tenant(tmp_path, monkeypatch):
+    """Test a tenant cannot list, read, transform or drop another tenant's dataset."""
+    import ctl_mcp.server as server
+
+    path = tmp_path / "series.csv"
+    path.write_text("date,value\n2023-01,1\n2023-02,2\n")
+    monkeypatch.setattr(server, "_tenant", lambda: "tenant-a")
+    handle = asyncio.run(query_data("local", {"path": str(path)}, store=True)).dataset.handle
+    assert handle in [d["handle"] for d in server.list_datasets()["datasets"]]
+
+    monkeypatch.setattr(server, "_tenant", lambda: "tenant-b")
+    assert handle not in [d["handle"] for d in server.list_datasets()["datasets"]]
+    assert "Unknown or expired" in server.get_dataset_rows(handle).message
+    steps = [{"name": "normalize", "params": {"columns": ["value"]}}]
+    assert not asyncio.run(transform_data(handle=handle, transformations=steps)).success
+    assert server.drop_dataset(handle)["dropped"] is False
+
+    monkeypatch.setattr(server, "_tenant", lambda: "tenant-a")
+    assert server.get_dataset_rows(handle).total_rows == 2
+    assert server.drop_dataset(handle)["dropped"] is True
+
+
+def test_output_modes(tmp_path):
+    """Test returning summaries or downsampled series instead of all rows."""
+    path = tmp_path / "series.csv"
+    path.write_text("date,value\n" + "".join(f"2023-01-{d:02d},{d}\n" for d in range(1, 31)))
+    config = {"path": str(path)}
+
+    summary = asyncio.run(query_data("local", config, output="summary"))
+    assert summary.success and summary.data == [] and summary.row_count == 30
+    assert summary.summary["columns"]["value"]["mean"] == 15.5
+
+    steps = [{"name": "normalize", "params": {"columns": ["value"]}}]
+    rows = asyncio.run(query_data("local", config)).data
+    trend = asyncio.run(transform_data(rows, steps, output="series_summary"))
+    assert trend.summary["series"][0]["change"] == 1.0
+
+    from ctl_mcp.server import query_and_transform
+    down = asyncio.run(query_and_transform("local", config, steps, output="downsample",
+                                           output_options={"points": 5}, store=True))
+    assert down.success and down.row_count == 5 and len(down.data) == 5
+    assert down.dataset.row_count == 30 and "downsampled to 5 rows" in down.message
+
+    bad = asyncio.run(query_data("local", config, output="everything"))
+    assert bad.success is False and "Unknown output mode" in bad.message
+
+
+class _Ctx:
+    """Collects progress notifications like an MCP Context."""
+
+    def __init__(self):
+        self.events = []
+
+    async def report_progress(self, progress, total=None, message=None):
+        self.events.append((progress, total, message))
+
+
+def test_tools_report_progress_on_connector_lanes(tmp_path, monkeypatch):
+    """Test per-step progress and the per-connector worker lane."""
+    import ctl_mcp.server as server
+    from ctl_core.executor import WorkPool
+
+    pool = WorkPool(limits={"local": 1})
+    monkeypatch.setattr(server, "work_pool", pool)
+    path = tmp_path / "series.csv"
+    path.write_text("date,value\n" + "".join(f"2024-02-{d:02d},{d * 3}\n" for d in range(1, 29)))
+    steps = [
+        {"name": "moving_average", "params": {"column": "value", "window": 2}},
+        {"name": "normalize", "params": {"columns": ["value"]}},
+    ]
+    ctx = _Ctx()
+    result = asyncio.run(server.query_and_transform("local", {"path": str(path)}, steps, ctx=ctx))
+    assert result.success
+    assert sorted(p for p, _, _ in ctx.events) == [0, 1, 2, 3, 4]
+    assert {t for _, t, _ in ctx.events} == {4}
+    assert any("Applying normalize (2/2)" in m for _, _, m in ctx.events)
+    assert pool.stats()["lanes"]["local"]["concurrency"] == 1
+    # Unknown connector names are rejected before they can open a lane
+    result = asyncio.run(server.query_data("no-such-connector", {}))
+    assert not result.success and "Unknown connector" in result.message
+    assert set(pool.stats()["lanes"]) == {"local", "transform"}
+    pool.shutdown()
+
+
+def test_cancelled_tool_stops_between_steps(monkeypatch):
+    """Test that a cancelled call does not run the remaining pipeline steps."""
+    import threading
+    import time
+    import ctl_core.registry as registry
+    import ctl_mcp.server as server
+    from ctl_core.executor import WorkPool
+
+    pool = WorkPool()
+    monkeypatch.setattr(server, "work_pool", pool)
+    gate, applied = threading.Event(), []
+
+    class Gate:
+        def __init__(self, tag):
+            self.tag = tag
+
+        def apply(self, df, inplace=False):
+            applied.append(self.tag)
+            gate.wait(5)
+            return df
+
+    monkeypatch.setitem(registry.transforms, "gate", lambda cfg: Gate(**cfg))
+    steps = [{"name": "gate", "params": {"tag": t}} for t in ("a", "b")]
+
+    async def cancel_mid_pipeline():
+        task = asyncio.create_task(server.transform_data([{"x": 1.5}], steps))
+        while not applied:
+            await asyncio.sleep(0.01)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(cancel_mid_pipeline())
+    gate.set()
+    deadline = time.monotonic() + 5
+    while pool.stats()["pending"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert applied == ["a"]
+    pool.shutdown()
+
+
+def test_dataset_store_evicts_by_ttl_and_size():
+    """Test TTL expiry and least-recently-used eviction in the dataset store."""
+    import pandas as pd
+    from ctl_mcp.datasets import DatasetStore
+
+    now = [0.0]
+    store = DatasetStore(max_datasets=2, ttl=10, clock=lambda: now[0])
+    a = store.put(pd.DataFrame({"x": [1]}))
+    b = store.put(pd.DataFrame({"x": [2]}))
+    store.get(a.handle)
+    store.put(pd.DataFrame({"x": [3]}))
+    with pytest.raises(KeyError):
+        store.get(b.handle)
+    now[0] = 11
+    with pytest.raises(KeyError):
+        store.get(a.handle)
+    assert store.stats()["datasets"] == 0
+    with pytest.raises(ValueError):
+        DatasetStore(max_bytes=10).put(pd.DataFrame({"x": range(100)}))
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
\ No newline at end of file
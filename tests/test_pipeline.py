@@ -0,0 +1,174 @@
+"""
+Test pipeline execution: memoized stages
+"""
+
+import pandas as pd
+import pytest
+
+from ctl_core import pipeline, registry
+from ctl_core.pipeline import StageCache, run_pipeline
+from ctl_core.transforms.normalize import Normalize
+
+
+def _frame():
+    return pd.DataFrame({"date": [f"2023-{m:02d}" for m in range(1, 13)],
+                         "value": [float(v) for v in range(100, 112)]})
+
+
+def test_repeated_prefix_is_served_from_cache(monkeypatch):
+    calls = []
+
+    def counting_normalize(cfg):
+        calls.append(cfg)
+        return Normalize(**cfg)
+
+    monkeypatch.setitem(registry.transforms, "normalize", counting_normalize)
+    cache = StageCache()
+    df = _frame()
+    first = run_pipeline(
+        df, [("normalize", {"columns": ["value"]}), ("moving_average", {"column": "value"})], cache
+    )
+    tweaked = run_pipeline(
+        df,
+        [("normalize", {"columns": ["value"]}),
+         ("moving_average", {"column": "value", "window": 5})],
+        cache,
+    )
+    assert len(calls) == 1
+    assert cache.stats()["steps_skipped"] == 1
+    assert "value_ma3" in first.columns and "value_ma5" in tweaked.columns
+    pd.testing.assert_series_equal(first["value"], tweaked["value"])
+
+    # Same content in a different frame object hits the full pipeline
+    again = run_pipeline(
+        _frame(), [("normalize", {"columns": ["value"]}), ("moving_average", {"column": "value"})],
+        cache,
+    )
+    pd.testing.assert_frame_equal(again, first)
+    assert len(calls) == 1
+
+    # Results handed out are independent of the cached stages
+    again["value"] = 0.0
+    assert run_pipeline(df, [("normalize", {"columns": ["value"]})], cache)["value"].max() == 1.0
+
+
+@pytest.mark.parametrize("cache", [StageCache(max_bytes=0), None], ids=["uncached", "default"])
+def test_steps_run_in_place_without_copying_the_frame(cache):
+    wide = pd.DataFrame({f"c{i}": [float(v) for v in range(20_000)] for i in range(20)})
+    original = wide.copy()
+    steps = [("normalize", {"columns": ["c0"]})] + [
+        ("moving_average", {"column": f"c{i}", "window": 3}) for i in range(3)
+    ]
+    report = []
+    out = run_pipeline(wide, steps, cache=cache, report=report)
+
+    pd.testing.assert_frame_equal(wide, original)
+    assert [r.name for r in report] == [name for name, _ in steps]
+    assert [r.inplace for r in report] == [False, True, True, True]
+    # Each step allocates about one new column, never a copy of the whole frame
+    column_bytes = wide["c0"].nbytes
+    assert max(r.bytes_allocated for r in report) < 5 * column_bytes < wide.memory_usage().sum()
+    assert out["c0"].max() == 1.0 and "c2_ma3" in out.columns
+
+
+def test_concurrent_reports_do_not_disturb_each_other():
+    import tracemalloc
+    from concurrent.futures import ThreadPoolExecutor
+
+    wide = pd.DataFrame({f"c{i}": [float(v) for v in range(20_000)] for i in range(4)})
+    steps = [("moving_average", {"column": f"c{i}", "window": 3}) for i in range(4)] * 3
+
+    def reported(_):
+        report = []
+        run_pipeline(wide, steps, cache=StageCache(max_bytes=0), report=report)
+        return report
+
+    with ThreadPoolExecutor(4) as pool:
+        reports = list(pool.map(reported, range(8)))
+    # Each step allocates at least its output column
+    assert all(r.bytes_allocated >= wide["c0"].nbytes for rep in reports for r in rep)
+    assert not tracemalloc.is_tracing()
+
+
+def test_without_copy_on_write_only_the_final_stage_is_cached(monkeypatch):
+    monkeypatch.setattr(pipeline, "copy_on_write", lambda: False)
+    cache = StageCache()
+    steps = [("normalize", {"columns": ["value"]}),
+             ("moving_average", {"column": "value"}),
+             ("moving_average", {"column": "value", "window": 5})]
+    report = []
+    out = run_pipeline(_frame(), steps, cache, report=report)
+    assert [r.inplace for r in report] == [False, True, True]
+    assert cache.stats()["entries"] == 1
+
+    again = run_pipeline(_frame(), steps, cache, report=report)
+    assert len(report) == 3 and cache.stats()["steps_skipped"] == 3
+    pd.testing.assert_frame_equal(again, out)
+    again["value"] = 0.0
+    assert run_pipeline(_frame(), steps, cache)["value"].max() == 1.0
+
+
+@pytest.mark.parametrize("cow", [True, False], ids=["cow", "no-cow"])
+def test_changed_tail_resumes_after_expensive_prefix(monkeypatch, cow):
+    pytest.importorskip("statsmodels")
+    monkeypatch.setattr(pipeline, "copy_on_write", lambda: cow)
+    fits = []
+    real = registry.transforms["seasonal_adjustment"]
+
+    def counting_seasonal(cfg):
+        fits.append(cfg)
+        return real(cfg)
+
+    monkeypatch.setitem(registry.transforms, "seasonal_adjustment", counting_seasonal)
+    df = pd.DataFrame({"value": [float(i % 12 + i) for i in range(48)]})
+    seasonal = ("seasonal_adjustment", {"column": "value", "period": 12})
+    cache = StageCache()
+    first = run_pipeline(df, [seasonal, ("moving_average", {"column": "value_sa"})], cache)
+    tweaked = run_pipeline(
+        df, [seasonal, ("moving_average", {"column": "value_sa", "window": 5})], cache
+    )
+    assert len(fits) == 1 and cache.stats()["steps_skipped"] == 1
+    pd.testing.assert_series_equal(first["value_sa"], tweaked["value_sa"])
+    assert "value_sa_ma3" not in tweaked.columns
+
+
+def test_planner_fuses_pushes_filters_and_drops_dead_steps():
+    from ctl_core.planner import compile_plan, run_plan
+
+    df = pd.DataFrame({
+        "series": ["A", "B"] * 30,
+        "x": [float(v) for v in range(60)],
+        "y": [float(v % 7) for v in range(60)],
+    })
+    steps = [
+        ("normalize", {"columns": ["x"], "group_by": "series"}),
+        ("moving_average", {"column": "x", "window": 2}),   # overwritten below
+        ("normalize", {"columns": ["y"], "group_by": "series"}),
+        ("moving_average", {"column": "x", "window": 2, "group_by": "series"}),
+        ("moving_average", {"column": "y", "window": 2, "group_by": "series"}),
+        ("filter", {"where": {"series": "A"}}),
+    ]
+    plan = compile_plan(steps)
+    assert [(n.name, n.sources) for n in plan.nodes] == [
+        ("filter", [5]),
+        ("normalize", [0, 2]),
+        ("moving_average", [3, 4]),
+    ]
+    assert plan.eliminated == [{"steps": [1], "op": "moving_average", "reason": "output unused"}]
+
+    naive = run_pipeline(df, steps, cache=StageCache(max_bytes=0))
+    planned = run_plan(plan, df, cache=StageCache(max_bytes=0))
+    pd.testing.assert_frame_equal(planned, naive)
+
+    # With a connector input, the leading filter joins its where clause
+    plan = compile_plan(steps, outputs=["x_ma2"], where={})
+    assert plan.where == {"series": "A"}
+    assert [n.sources for n in plan.nodes] == [[0], [3]]
+
+
+def test_planner_keeps_filters_behind_whole_frame_steps():
+    from ctl_core.planner import compile_plan
+
+    steps = [("normalize", {"columns": ["x"]}), ("filter", {"where": {"series": "A"}})]
+    plan = compile_plan(steps, where={})
+    assert [n.name for n in plan.nodes] == ["normalize", "filter"] and plan.where == {}
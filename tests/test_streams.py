@@ -0,0 +1,166 @@
+"""
+Test incremental (streaming) transforms
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi.testclient import TestClient
+
+from ctl_api.main import app
+from ctl_core.registry import build_transform
+from ctl_core.streams import StreamRegistry
+
+
+def _frame(n_obs=30, seed=0):
+    rng = np.random.default_rng(seed)
+    frames = [
+        pd.DataFrame({"t": np.arange(n_obs), "series": f"S{i}", "value": rng.random(n_obs) * 10})
+        for i in range(3)
+    ]
+    return pd.concat(frames).sort_values(["t", "series"]).reset_index(drop=True)
+
+
+def test_stream_matches_full_recompute():
+    df = _frame()
+    registry = StreamRegistry()
+    stream = registry.create(
+        "feed",
+        [("moving_average", {"column": "value", "window": 4, "group_by": "series"})],
+    )
+    parts = [stream.append(df.iloc[a:b]) for a, b in [(0, 7), (7, 8), (8, 50), (50, 90)]]
+    streamed = pd.concat(parts)
+    full = build_transform(
+        "moving_average", {"column": "value", "window": 4, "group_by": "series"}
+    ).apply(df)
+    np.testing.assert_allclose(streamed["value_ma4"], full["value_ma4"])
+    assert stream.rows_seen == len(df)
+
+
+def test_stream_normalize_uses_running_bounds():
+    registry = StreamRegistry()
+    stream = registry.create("n", [("normalize", {"columns": ["value"]})])
+    first = stream.append(pd.DataFrame({"value": [2.0, 4.0]}))
+    assert first["value"].tolist() == [0.0, 1.0]
+    # Bounds carry over: 3 sits inside [2, 4]; 6 widens the range
+    second = stream.append(pd.DataFrame({"value": [3.0, 6.0]}))
+    assert second["value"].tolist() == [0.5, 1.0]
+
+
+def test_stream_append_is_atomic():
+    client = TestClient(app)
+    pipeline = [
+        {"name": "moving_average", "params": {"column": "value", "window": 2}},
+        {"name": "normalize", "params": {"columns": ["value"], "group_by": "g"}},
+    ]
+    assert client.post("/streams/atomic", json={"pipeline": pipeline}).status_code == 200
+    url = "/streams/atomic/append"
+    r = client.post(url, json={"data": [{"g": "a", "value": 1}, {"g": "a", "value": 3}]})
+    assert [row["value_ma2"] for row in r.json()] == [1.0, 2.0]
+    # The moving average ran before normalize rejected the batch; its tail must not move
+    assert client.post(url, json={"data": [{"value": 100}]}).status_code == 400
+    r = client.post(url, json={"data": [{"g": "a", "value": 5}]})
+    assert [(row["value_ma2"], row["value"]) for row in r.json()] == [(4.0, 1.0)]
+    described = {s["stream"]: s for s in client.get("/streams").json()["streams"]}
+    assert described["atomic"]["rows_seen"] == 3
+    client.delete("/streams/atomic")
+
+
+def test_streams_are_scoped_to_the_tenant():
+    from fastapi import Header
+
+    from ctl_api.deps import get_auth_user
+
+    async def tenant_user(x_tenant: str = Header()):
+        return {"tid": x_tenant}
+
+    app.dependency_overrides[get_auth_user] = tenant_user
+    try:
+        client = TestClient(app)
+        a, b = {"X-Tenant": "a"}, {"X-Tenant": "b"}
+        pipeline = [{"name": "moving_average", "params": {"column": "value", "window": 2}}]
+        assert client.post("/streams/shared", json={"pipeline": pipeline}, headers=a).is_success
+        assert client.post("/streams/shared/append", json={"data": [{"value": 1}]}, headers=a)
+
+        assert client.get("/streams", headers=b).json()["streams"] == []
+        r = client.post("/streams/shared/append", json={"data": [{"value": 3}]}, headers=b)
+        assert r.status_code == 404
+        assert client.delete("/streams/shared", headers=b).status_code == 404
+        # b may use the same name without replacing a's stream
+        assert client.post("/streams/shared", json={"pipeline": pipeline}, headers=b).is_success
+        r = client.post("/streams/shared/append", json={"data": [{"value": 3}]}, headers=a)
+        assert [row["value_ma2"] for row in r.json()] == [2.0]
+        assert client.delete("/streams/shared", headers=a).status_code == 200
+        assert client.delete("/streams/shared", headers=b).status_code == 200
+    finally:
+        app.dependency_overrides.pop(get_auth_user)
+
+
+def test_stream_rejects_non_incremental_steps():
+    with pytest.raises(ValueError):
+        StreamRegistry().create("s", [("seasonal_adjustment", {"column": "value", "period": 12})])
+
+
+def test_stream_endpoints():
+    client = TestClient(app)
+    r = client.post(
+        "/streams/api-feed",
+        json={"pipeline": [{"name": "moving_average", "params": {"column": "value", "window": 2}}]},
+    )
+    assert r.status_code == 200
+    assert client.post("/streams/api-feed", json={"pipeline": []}).status_code == 400
+
+    r = client.post("/streams/api-feed/append", json={"data": [{"value": 1}, {"value": 3}]})
+    assert [row["value_ma2"] for row in r.json()] == [1.0, 2.0]
+    r = client.post("/streams/api-feed/append", json={"data": [{"value": 5}]})
+    assert [row["value_ma2"] for row in r.json()] == [4.0]
+
+    assert client.post("/streams/missing/append", json={"data": []}).status_code == 404
+    assert client.delete("/streams/api-feed").status_code == 200
+
+
+def test_transform_chunks_matches_full_run():
+    from ctl_core.pipeline import StageCache, run_pipeline
+    from ctl_core.streams import transform_chunks
+
+    df = _frame(n_obs=40)
+    df["other"] = df["value"] * 2
+    df.loc[5, "value"] = np.nan
+    steps = [
+        ("filter", {"where": {"series": ["S0", "S2"]}}),
+        ("moving_average", {"column": ["value", "other"], "window": 5, "group_by": "series"}),
+        ("normalize", {"columns": ["value_ma5"], "group_by": "series"}),
+        ("normalize", {"columns": ["value_ma5", "other"]}),
+    ]
+    opened = []
+
+    def open_chunks():
+        opened.append(1)
+        return (df.iloc[a:a + 7] for a in range(0, len(df), 7))
+
+    streamed = pd.concat(transform_chunks(open_chunks, steps), ignore_index=True)
+    full = run_pipeline(df, steps, cache=StageCache(max_bytes=0)).reset_index(drop=True)
+    pd.testing.assert_frame_equal(streamed, full)
+    # One pass per normalize step, plus the output pass
+    assert len(opened) == 3
+
+
+def test_transform_chunks_rejects_whole_series_steps():
+    from ctl_core.streams import transform_chunks
+
+    with pytest.raises(ValueError, match="cannot run in chunks"):
+        transform_chunks(list, [("seasonal_adjustment", {"column": "value"})])
+    with pytest.raises(ValueError, match="order_by"):
+        transform_chunks(list, [("moving_average", {"column": "value", "order_by": "t"})])
+
+
+def test_transform_chunks_shapes_an_empty_source():
+    from ctl_core.streams import transform_chunks
+
+    steps = [
+        ("moving_average", {"column": "value", "window": 3, "group_by": "series"}),
+        ("normalize", {"columns": ["value_ma3"], "group_by": "series"}),
+    ]
+    [out] = transform_chunks(list, steps, columns=["t", "series", "value"])
+    assert len(out) == 0
+    assert list(out.columns) == ["t", "series", "value", "value_ma3"]
@@ -0,0 +1,61 @@
+"""
+Test summarizing and downsampling output modes
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ctl_core.summarize import describe, downsample, lttb_indices, series_summary, summarize
+
+
+@pytest.fixture
+def frame():
+    n = 500
+    return pd.DataFrame(
+        {
+            "date": np.tile(pd.date_range("2020-01-01", periods=n).strftime("%Y-%m-%d"), 2),
+            "series": np.repeat(["A", "B"], n),
+            "value": np.r_[np.sin(np.arange(n) / 20.0), np.arange(n, dtype=float)],
+        }
+    )
+
+
+def test_describe_and_series_summary(frame):
+    stats = describe(frame)
+    assert stats["row_count"] == 1000
+    assert stats["columns"]["value"]["max"] == 499.0
+    assert stats["columns"]["series"]["unique"] == 2
+
+    rows = series_summary(frame.iloc[::-1], group_by=["series"])
+    b = next(r for r in rows if r["series"] == "B")
+    # First/last follow date order, not row order
+    assert (b["first"], b["last"], b["change"]) == (0.0, 499.0, 499.0)
+    assert (b["start"], b["end"]) == ("2020-01-01", "2021-05-14")
+    assert b["pct_change"] is None
+
+
+def test_lttb_keeps_extremes_and_endpoints():
+    x = np.arange(1000, dtype=float)
+    y = np.zeros(1000)
+    y[[137, 612]] = [5.0, -5.0]
+    idx = lttb_indices(x, y, 20)
+    assert len(idx) == 20 and idx[0] == 0 and idx[-1] == 999
+    assert {137, 612} <= set(idx) and np.all(np.diff(idx) > 0)
+    assert len(lttb_indices(x[:10], y[:10], 20)) == 10
+
+
+def test_downsample_per_series(frame):
+    out = downsample(frame, points=50, group_by=["series"])
+    assert out.groupby("series").size().tolist() == [50, 50]
+    assert list(out.columns) == ["date", "series", "value"]
+
+    buckets = downsample(frame, points=10, group_by=["series"], method="bucket")
+    b = buckets[buckets["series"] == "B"]
+    assert b["value"].tolist() == [24.5 + 50 * i for i in range(10)]
+    assert b["count"].tolist() == [50] * 10
+
+    with pytest.raises(ValueError):
+        summarize(frame, "histogram")
+    rows, summary = summarize(frame, "downsample", {"points": 10, "group_by": ["series"]})
+    assert len(rows) == 20 and summary["row_count"] == 1000
@@ -0,0 +1,147 @@
+"""
+Test transforms: grouped (multi-series) execution
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ctl_core.registry import build_transform
+from ctl_core.transforms import seasonal_state
+
+
+def _long_frame(n_series=3, n_obs=48, seed=0):
+    rng = np.random.default_rng(seed)
+    t = np.arange(n_obs)
+    frames = [
+        pd.DataFrame(
+            {
+                "date": pd.date_range("2020-01-01", periods=n_obs, freq="MS"),
+                "series": f"S{i}",
+                "value": 10 * i + rng.random(n_obs) + 5 * np.sin(t * 2 * np.pi / 12),
+            }
+        )
+        for i in range(n_series)
+    ]
+    # Interleave series rows, as long-format extracts usually are
+    return pd.concat(frames).sort_values(["date", "series"]).reset_index(drop=True)
+
+
+@pytest.mark.parametrize(
+    "name,params",
+    [
+        ("moving_average", {"column": "value", "window": 4}),
+        ("normalize", {"columns": ["value"]}),
+        ("seasonal_adjustment", {"column": "value", "period": 12}),
+    ],
+)
+def test_group_by_matches_per_series_loop(name, params):
+    if name == "seasonal_adjustment":
+        pytest.importorskip("statsmodels")
+    df = _long_frame()
+    grouped = build_transform(name, {**params, "group_by": "series"}).apply(df)
+    looped = pd.concat(
+        build_transform(name, params).apply(part) for _, part in df.groupby("series")
+    ).sort_index()
+    pd.testing.assert_frame_equal(grouped, looped)
+
+
+def test_group_by_unknown_column():
+    with pytest.raises(ValueError, match="group_by"):
+        build_transform("normalize", {"columns": ["value"], "group_by": "region"}).apply(
+            _long_frame()
+        )
+
+
+def test_seasonal_adjustment_process_pool_reports_failures():
+    pytest.importorskip("statsmodels")
+    df = _long_frame(n_series=4)
+    short = pd.DataFrame({"date": df["date"].iloc[:5], "series": "SHORT", "value": 1.0})
+    df = pd.concat([df, short], ignore_index=True)
+
+    serial = build_transform(
+        "seasonal_adjustment",
+        {"column": "value", "period": 12, "group_by": "series", "on_error": "nan"},
+    )
+    parallel = build_transform(
+        "seasonal_adjustment",
+        {"column": "value", "period": 12, "group_by": "series", "on_error": "nan", "workers": 2},
+    )
+    expected = serial.apply(df)
+    pd.testing.assert_frame_equal(parallel.apply(df), expected)
+    assert list(parallel.failures) == ["SHORT"]
+    assert expected.loc[expected["series"] == "SHORT", "value_sa"].isna().all()
+
+    with pytest.raises(ValueError, match="failed for 1 series"):
+        build_transform(
+            "seasonal_adjustment", {"column": "value", "period": 12, "group_by": "series"}
+        ).apply(df)
+
+
+@pytest.mark.parametrize("group_by", [None, "series"])
+def test_normalize_empty_frame(group_by):
+    empty = _long_frame().iloc[:0]
+    out = build_transform("normalize", {"columns": ["value"], "group_by": group_by}).apply(empty)
+    pd.testing.assert_frame_equal(out, empty)
+
+
+def test_seasonal_adjustment_clamps_workers(monkeypatch):
+    pytest.importorskip("statsmodels")
+    from ctl_core.config import settings
+    from ctl_core.transforms import seasonal_batch
+
+    pools = []
+
+    def fake_pool(*args, max_workers, **kwargs):
+        pools.append(max_workers)
+        raise RuntimeError("no pool in this test")
+
+    monkeypatch.setattr(seasonal_batch, "ProcessPoolExecutor", fake_pool)
+    monkeypatch.setattr(settings, "seasonal_max_workers", 1)
+    params = {"column": "value", "period": 12, "group_by": "series", "workers": 10_000}
+    build_transform("seasonal_adjustment", params).apply(_long_frame())
+    assert pools == []
+
+    monkeypatch.setattr(settings, "seasonal_max_workers", 2)
+    with pytest.raises(RuntimeError, match="no pool"):
+        build_transform("seasonal_adjustment", params).apply(_long_frame())
+    assert pools == [2]
+
+
+def test_incremental_seasonal_adjustment_reuses_fits(monkeypatch):
+    pytest.importorskip("statsmodels")
+    fitted_lengths = []
+    real = seasonal_state.seasonal_component
+
+    def counting(values, period, engine):
+        fitted_lengths.append(len(values))
+        return real(values, period, engine)
+
+    monkeypatch.setattr(seasonal_state, "seasonal_component", counting)
+    monkeypatch.setattr(
+        "ctl_core.transforms.seasonal_adjustment.seasonal_state",
+        seasonal_state.SeasonalStateStore(),
+    )
+    full = _long_frame(n_series=2, n_obs=122)
+    dates = sorted(full["date"].unique())
+    history = full[full["date"] <= dates[119]].reset_index(drop=True)
+    params = {"column": "value", "period": 12, "group_by": "series", "incremental": True,
+              "engine": "stl", "state_key": "test"}
+
+    first = build_transform("seasonal_adjustment", params).apply(history)
+    assert fitted_lengths == [120, 120]
+
+    # One new observation per series: seasonal factors come from the stored fit
+    grown = full[full["date"] <= dates[120]].reset_index(drop=True)
+    second = build_transform("seasonal_adjustment", params).apply(grown)
+    assert fitted_lengths == [120, 120]
+    old = second[second["date"] <= dates[119]].reset_index(drop=True)
+    pd.testing.assert_series_equal(old["value_sa"], first["value_sa"])
+
+    # A revision window refits only a recent tail
+    build_transform("seasonal_adjustment", {**params, "revision_window": 24}).apply(full)
+    assert fitted_lengths[2:] == [48, 48]
+
+    # Another engine (or a revised history) falls back to a full fit
+    build_transform("seasonal_adjustment", {**params, "engine": "classical"}).apply(full)
+    assert fitted_lengths[4:] == [122, 122]